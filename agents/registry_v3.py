@@ -1,13 +1,36 @@
-from typing import List, Any
+from typing import Dict, List, Any, Optional
 from autogen_agentchat.agents import AssistantAgent
 from autogen_ext.models.openai import OpenAIChatCompletionClient
+from core.compacting_context import CompactingChatCompletionContext
 
 class AgentRegistry:
-    def create_manager(self, model_client: OpenAIChatCompletionClient, tools: List[Any]) -> AssistantAgent:
+    def __init__(
+        self,
+        summarizer_client: Optional[Any] = None,
+        compact_context: bool = True,
+        budgets: Optional[Dict[str, int]] = None
+    ):
+        # Cheap model for summaries of older conversation; budgets per role in ROLE_BUDGETS
+        self.summarizer_client = summarizer_client
+        self.compact_context = compact_context
+        # Role -> budget overrides from config
+        self.budgets = budgets
+
+    def _context(self, role: str, workspace: Optional[Any] = None) -> Optional[CompactingChatCompletionContext]:
+        if not self.compact_context:
+            return None
+        # Workspace behind the agent's tools: file reads that compaction elides are forgotten there
+        forget_reads = workspace.forget_reads if workspace is not None else None
+        return CompactingChatCompletionContext.for_role(
+            role, self.summarizer_client, budgets=self.budgets, forget_reads=forget_reads
+        )
+
+    def create_manager(self, model_client: OpenAIChatCompletionClient, tools: List[Any], workspace: Optional[Any] = None) -> AssistantAgent:
         return AssistantAgent(
             name="project_manager",
             model_client=model_client,
             tools=tools,
+            model_context=self._context("manager", workspace),
             system_message="""You are a Project Manager.
 Your goal: Orchestrate the development process.
 1. Look at the workspace and tasks.
@@ -16,11 +39,12 @@ Your goal: Orchestrate the development process.
 4. You are responsible for the final project delivery."""
         )
 
-    def create_architect(self, model_client: OpenAIChatCompletionClient, tools: List[Any]) -> AssistantAgent:
+    def create_architect(self, model_client: OpenAIChatCompletionClient, tools: List[Any], workspace: Optional[Any] = None) -> AssistantAgent:
         return AssistantAgent(
             name="architect",
             model_client=model_client,
             tools=tools,
+            model_context=self._context("architect", workspace),
             system_message="""You are a Lead Architect.
 Your goal: Design the system architecture.
 1. Create 'docs/architecture.md' and 'docs/interfaces.md'.
@@ -28,23 +52,36 @@ Your goal: Design the system architecture.
 3. Make sure Coders follow your design."""
         )
 
-    def create_coder(self, name: str, role: str, model_client: OpenAIChatCompletionClient, tools: List[Any]) -> AssistantAgent:
+    def create_planner(self, model_client: OpenAIChatCompletionClient) -> AssistantAgent:
+        # No tools: one reply with the JSON plan; only coders write files, through FileOwnership
+        return AssistantAgent(
+            name="planner",
+            model_client=model_client,
+            system_message="""You are a Lead Architect planning work for parallel coders.
+Your goal: Split the task into independent work items.
+1. Give each file to exactly one work item.
+2. Respond with the JSON plan only; do not write any files."""
+        )
+
+    def create_coder(self, name: str, role: str, model_client: OpenAIChatCompletionClient, tools: List[Any], workspace: Optional[Any] = None) -> AssistantAgent:
         return AssistantAgent(
             name=name,
             model_client=model_client,
             tools=tools,
+            model_context=self._context("coder", workspace),
             system_message=f"""You are a Senior {role} Developer.
 Your goal: Implement the features according to the architecture.
 1. Read docs/architecture.md before coding.
-2. Use write_file to implement logic.
+2. Use write_file for new files and apply_edit/multi_edit to change existing ones.
 3. Wait for Reviewer approval."""
         )
 
-    def create_reviewer(self, model_client: OpenAIChatCompletionClient, tools: List[Any]) -> AssistantAgent:
+    def create_reviewer(self, model_client: OpenAIChatCompletionClient, tools: List[Any], workspace: Optional[Any] = None) -> AssistantAgent:
         return AssistantAgent(
             name="senior_reviewer",
             model_client=model_client,
             tools=tools,
+            model_context=self._context("reviewer", workspace),
             system_message="""You are a Senior QA/Code Reviewer.
 Your goal: Zero-bug policy.
 1. Read files and check for logic errors, security holes, and style.
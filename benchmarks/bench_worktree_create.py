@@ -0,0 +1,132 @@
+"""
+Benchmark worktree creation strategies.
+
+Creates a throwaway repository with many files and creates N task
+worktrees with each strategy, reporting wall time per worktree and the
+disk space actually consumed (free-space delta, so shared reflinked
+extents are not counted twice).
+
+Usage:
+    python benchmarks/bench_worktree_create.py [--files 2000] [--worktrees 20] [--dir /path]
+
+Run with --dir on a btrfs/XFS volume to see reflink savings; elsewhere the
+reflink strategy falls back to checkout.
+"""
+
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.worktree_manager import WorktreeManager, STRATEGIES, reflink_supported
+
+
+def git(repo: Path, *args: str):
+    """Run git in repo."""
+    subprocess.run(["git"] + list(args), cwd=repo, check=True, capture_output=True, text=True)
+
+
+def make_repo(path: Path, files: int, file_size: int):
+    """Create repository with `files` files of `file_size` bytes."""
+    path.mkdir(parents=True)
+    git(path, "init", "-q", "-b", "main")
+    git(path, "config", "user.name", "bench")
+    git(path, "config", "user.email", "bench@example.com")
+
+    for i in range(files):
+        target = path / f"pkg{i % 50}" / f"module_{i}.py"
+        target.parent.mkdir(exist_ok=True)
+        target.write_bytes(os.urandom(file_size // 2).hex().encode())
+
+    git(path, "add", "-A")
+    git(path, "commit", "-q", "-m", "init")
+
+
+def used_bytes(path: Path) -> int:
+    """Bytes in use on the filesystem holding path."""
+    st = os.statvfs(path)
+    return (st.f_blocks - st.f_bfree) * st.f_frsize
+
+
+def bench_strategy(repo: Path, work_dir: Path, strategy: str, count: int) -> dict:
+    """Create count worktrees with strategy and measure time and disk use."""
+    base_dir = work_dir / f"worktrees-{strategy}"
+    manager = WorktreeManager(base_dir=str(base_dir), strategy=strategy, defer_gc=True)
+
+    # Pristine checkout is a one-off cost, keep it out of the per-task numbers
+    setup_start = time.perf_counter()
+    if strategy != "checkout" and (strategy == "copy" or manager.reflink_supported):
+        manager._pristine_checkout("main")
+    setup_time = time.perf_counter() - setup_start
+
+    os.sync()
+    before = used_bytes(work_dir)
+    start = time.perf_counter()
+
+    for i in range(count):
+        manager.create_worktree(f"{strategy}-{i}", "main")
+
+    elapsed = time.perf_counter() - start
+    os.sync()
+    used = used_bytes(work_dir) - before
+
+    for i in range(count):
+        manager.cleanup(f"{strategy}-{i}", delete_branch=True)
+    if (base_dir / ".pristine").exists():
+        for pristine in (base_dir / ".pristine").iterdir():
+            git(repo, "worktree", "remove", "--force", str(pristine))
+
+    return {
+        "strategy": strategy,
+        "setup_time": setup_time,
+        "per_worktree": elapsed / count,
+        "total_time": elapsed,
+        "disk_used": used
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark worktree creation strategies")
+    parser.add_argument("--files", type=int, default=2000, help="Files in the test repository")
+    parser.add_argument("--file-size", type=int, default=4096, help="Bytes per file")
+    parser.add_argument("--worktrees", type=int, default=20, help="Worktrees per strategy")
+    parser.add_argument("--dir", help="Directory to run in (default: system temp)")
+    args = parser.parse_args()
+
+    work_dir = Path(tempfile.mkdtemp(prefix="wt-bench-", dir=args.dir))
+    repo = work_dir / "repo"
+    old_cwd = os.getcwd()
+
+    try:
+        make_repo(repo, args.files, args.file_size)
+        os.chdir(repo)
+
+        print(f"Repository: {args.files} files x {args.file_size} bytes, {args.worktrees} worktrees per strategy")
+        print(f"Reflink supported in {work_dir}: {reflink_supported(work_dir)}\n")
+        print(f"{'Strategy':<10} {'Setup':>8} {'Per worktree':>13} {'Total':>8} {'Disk used':>12}")
+
+        results = [bench_strategy(repo, work_dir, strategy, args.worktrees) for strategy in STRATEGIES]
+        for r in results:
+            print(
+                f"{r['strategy']:<10} {r['setup_time']:>7.2f}s {r['per_worktree'] * 1000:>11.1f}ms "
+                f"{r['total_time']:>7.2f}s {r['disk_used'] / 1024 / 1024:>10.1f}MB"
+            )
+
+        baseline = results[0]["disk_used"]
+        if baseline > 0:
+            print()
+            for r in results[1:]:
+                print(f"{r['strategy']}: {100 * (1 - r['disk_used'] / baseline):.0f}% disk saved vs checkout")
+    finally:
+        os.chdir(old_cwd)
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
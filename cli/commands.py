@@ -5,6 +5,11 @@ import os
 from pathlib import Path
 from datetime import datetime
 
+from core.command_profile import CommandProfile
+from core.config_loader import get_config
+from core.state_store import StateStore
+from core.worktree_registry import WorktreeRegistry
+
 
 def get_project_root():
     """Get project root directory."""
@@ -52,7 +57,15 @@ def cmd_init(args):
             "tester": ["gemini-2.5-pro", "gpt-5.1", "gpt-5.2"]
         },
         "max_iterations": 50,
-        "worktree_base": ".multiagent/worktrees"
+        "worktree_base": ".multiagent/worktrees",
+        "worktree_pool": {
+            "size": 0,
+            "low_watermark": 1,
+            "refill_interval": 30,
+            "base_branch": "main"
+        },
+        # Overrides of ROLE_BUDGETS (core.context_compaction), e.g. {"coder": 32000}
+        "context_budgets": {}
     }
     
     # Save config
@@ -111,6 +124,11 @@ files_to_modify:
 files_to_create:
   - path/to/new_file.py
 
+# Optional: directories the task may touch. The task worktree is a sparse
+# checkout of these (derived from files_to_modify/files_to_create if omitted).
+# scope:
+#   - services/api/
+
 tests_required:
   - Unit tests for new functionality
   - Integration tests if needed
@@ -260,18 +278,81 @@ def cmd_logs(args):
     return 0
 
 
+def _worktree_registry():
+    """Create worktree registry for the current repository."""
+    multiagent_dir = get_multiagent_dir()
+    try:
+        # Same worktree root as WorktreeManager.from_config
+        worktree_base = Path(get_config().get_worktree_base())
+    except FileNotFoundError:
+        # Not initialized yet
+        worktree_base = multiagent_dir / "worktrees"
+    return WorktreeRegistry(
+        state_store=StateStore(str(multiagent_dir / "tasks")),
+        cache_file=str(worktree_base / ".registry.json")
+    )
+
+
+def _format_size(size):
+    """Format byte count for display."""
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            return f"{size:.0f}{unit}" if unit == "B" else f"{size:.1f}{unit}"
+        size /= 1024
+
+
 def cmd_worktree_list(args):
     """List all worktrees."""
+    entries = _worktree_registry().list(with_disk_usage=args.disk)
+    
+    if args.json:
+        print(json.dumps(entries, indent=2))
+        return 0
+    
     print("🌳 Git Worktrees:")
-    print()
-    print("⚠️  NOT IMPLEMENTED YET")
-    print("   This will be implemented in TASK-002 (Worktree Manager)")
-    print()
-    print("   Expected output:")
-    print("   - task-123: .multiagent/worktrees/task-123 (branch: task/123)")
-    print("   - task-456: .multiagent/worktrees/task-456 (branch: task/456)")
     
-    return 1
+    for entry in entries:
+        branch = entry["branch"] or ""
+        if branch.startswith("refs/heads/"):
+            branch = branch[len("refs/heads/"):]
+        elif entry["detached"]:
+            branch = f"detached at {(entry['head'] or '')[:8]}"
+        
+        name = entry["task_id"] or Path(entry["path"]).name
+        line = f"   - {name}: {entry['path']} (branch: {branch})"
+        
+        if entry["phase"] or entry["status"]:
+            line += f" [{entry['phase'] or 'unknown'}/{entry['status'] or 'unknown'}]"
+        if entry["last_activity"]:
+            line += f" active {entry['last_activity']}"
+        if entry["disk_usage"] is not None:
+            line += f" {_format_size(entry['disk_usage'])}"
+        if entry["locked"]:
+            line += " 🔒"
+        if entry["prunable"]:
+            line += " (prunable)"
+        
+        print(line)
+    
+    return 0
+
+
+def cmd_worktree_prune(args):
+    """Remove stale worktree metadata and finished task worktrees."""
+    print("🧹 Pruning worktrees" + (" (dry run)" if args.dry_run else ""))
+    
+    result = _worktree_registry().prune(dry_run=args.dry_run, finished=args.finished)
+    
+    if not result["prunable"] and not result["finished"]:
+        print("   (nothing to prune)")
+        return 0
+    
+    for path in result["prunable"]:
+        print(f"   - stale: {path}")
+    for task_id in result["finished"]:
+        print(f"   - finished: {task_id}")
+    
+    return 0
 
 
 def cmd_resume(args):
@@ -287,3 +368,50 @@ def cmd_resume(args):
     print("   3. Continue from last phase")
     
     return 1
+
+
+def cmd_profile(args):
+    """Show slowest commands, per-phase totals and repeated-command waste."""
+    print(f"⏱️  Command Profile: {args.task_id}")
+    
+    profile = CommandProfile.load(get_multiagent_dir() / "logs", task_id=args.task_id)
+    
+    if not profile.records:
+        print("   (no commands recorded)")
+        return 0
+    
+    print(f"   Commands: {len(profile.records)}")
+    print(f"   Total wall time: {profile.total_wall_time:.2f}s")
+    
+    print(f"\n   Top {args.top} by wall time:")
+    for record in profile.top_commands(args.top):
+        rss = record.get("max_rss_kb")
+        rss_str = f"{rss / 1024:.0f}MB" if rss else "n/a"
+        user = record.get("user_time") or 0.0
+        sys_time = record.get("sys_time") or 0.0
+        print(
+            f"   - {record.get('wall_time', 0.0):8.2f}s  "
+            f"cpu {user + sys_time:7.2f}s  rss {rss_str:>6}  "
+            f"rc={record.get('returncode')}  {record.get('command')}"
+        )
+    
+    print("\n   Per-phase totals:")
+    for phase, totals in sorted(profile.phase_totals().items(), key=lambda kv: -kv[1]["wall_time"]):
+        print(
+            f"   - {phase}: {totals['count']} commands, "
+            f"{totals['wall_time']:.2f}s wall, "
+            f"{totals['user_time'] + totals['sys_time']:.2f}s cpu, "
+            f"{totals['failures']} failed"
+        )
+    
+    repeated = profile.repeated_commands()
+    if repeated:
+        wasted = sum(r["wasted_time"] for r in repeated)
+        print(f"\n   Repeated commands ({wasted:.2f}s after first run):")
+        for entry in repeated[:args.top]:
+            print(
+                f"   - x{entry['count']}  {entry['wasted_time']:.2f}s wasted  "
+                f"{entry['command']}"
+            )
+    
+    return 0
@@ -9,8 +9,10 @@ Usage:
     multiagent run <spec-name>
     multiagent status [<task-id>]
     multiagent logs [<task-id>]
-    multiagent worktree list
+    multiagent worktree list [--disk] [--json]
+    multiagent worktree prune [--finished] [--dry-run]
     multiagent resume <task-id>
+    multiagent profile <task-id>
 """
 
 import argparse
@@ -28,7 +30,9 @@ from cli.commands import (
     cmd_status,
     cmd_logs,
     cmd_worktree_list,
+    cmd_worktree_prune,
     cmd_resume,
+    cmd_profile,
 )
 
 
@@ -132,6 +136,31 @@ def main():
         "list",
         help="List all worktrees"
     )
+    worktree_list_parser.add_argument(
+        "--disk",
+        action="store_true",
+        help="Show disk usage (measured in parallel, cached)"
+    )
+    worktree_list_parser.add_argument(
+        "--json",
+        action="store_true",
+        help="Print machine-readable JSON"
+    )
+    
+    worktree_prune_parser = worktree_subparsers.add_parser(
+        "prune",
+        help="Remove stale worktree metadata"
+    )
+    worktree_prune_parser.add_argument(
+        "--finished",
+        action="store_true",
+        help="Also remove worktrees of completed/merged/failed/cancelled tasks"
+    )
+    worktree_prune_parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Only show what would be removed"
+    )
     
     # resume command
     resume_parser = subparsers.add_parser(
@@ -140,6 +169,19 @@ def main():
     )
     resume_parser.add_argument("task_id", help="Task ID to resume")
     
+    # profile command
+    profile_parser = subparsers.add_parser(
+        "profile",
+        help="Show slowest shell commands of a task"
+    )
+    profile_parser.add_argument("task_id", help="Task ID to profile")
+    profile_parser.add_argument(
+        "--top",
+        type=int,
+        default=10,
+        help="Number of commands to show (default: 10)"
+    )
+    
     # Parse arguments
     args = parser.parse_args()
     
@@ -168,11 +210,15 @@ def main():
         elif args.command == "worktree":
             if args.worktree_command == "list":
                 return cmd_worktree_list(args)
+            elif args.worktree_command == "prune":
+                return cmd_worktree_prune(args)
             else:
                 worktree_parser.print_help()
                 return 1
         elif args.command == "resume":
             return cmd_resume(args)
+        elif args.command == "profile":
+            return cmd_profile(args)
         else:
             parser.print_help()
             return 1
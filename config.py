@@ -13,6 +13,9 @@ MODELS = {
     "tester": "gemini-2.5-pro"
 }
 
+# Бюджеты контекста по ролям (токены), перекрывают ROLE_BUDGETS, например {"coder": 32000}
+CONTEXT_BUDGETS = {}
+
 # Fallback цепочки для каждой роли (ТОЛЬКО РАБОТАЮЩИЕ МОДЕЛИ!)
 FALLBACK_CHAINS = {
     "architect": [
@@ -0,0 +1,125 @@
+"""Profiling report over the structured shell command log."""
+
+import json
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+
+class CommandProfile:
+    """Aggregate per-command resource records written by ShellRunner."""
+    
+    def __init__(self, records: List[Dict[str, Any]]):
+        """
+        Initialize profile.
+        
+        Args:
+            records: Command records (one dict per ShellRunner invocation)
+        """
+        self.records = records
+    
+    @classmethod
+    def load(cls, log_dir: Path, task_id: Optional[str] = None) -> "CommandProfile":
+        """
+        Load command records from log directory.
+        
+        Args:
+            log_dir: Directory containing shell_commands.jsonl
+            task_id: Only keep records of this task (default: all)
+        
+        Returns:
+            CommandProfile instance
+        """
+        log_file = Path(log_dir) / "shell_commands.jsonl"
+        records = []
+        
+        if log_file.exists():
+            with open(log_file) as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        # Tolerate a partially written trailing line
+                        continue
+                    if task_id is None or record.get("task_id") == task_id:
+                        records.append(record)
+        
+        return cls(records)
+    
+    @property
+    def total_wall_time(self) -> float:
+        """Total wall time of all commands in seconds."""
+        return sum(r.get("wall_time") or 0.0 for r in self.records)
+    
+    def top_commands(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Get slowest individual command invocations.
+        
+        Args:
+            limit: Maximum number of records
+        
+        Returns:
+            Records sorted by wall time, slowest first
+        """
+        ranked = sorted(self.records, key=lambda r: r.get("wall_time") or 0.0, reverse=True)
+        return ranked[:limit]
+    
+    def phase_totals(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get totals per task phase.
+        
+        Returns:
+            Dict phase -> {count, wall_time, user_time, sys_time, failures}
+        """
+        totals: Dict[str, Dict[str, Any]] = {}
+        
+        for record in self.records:
+            phase = record.get("phase") or "unknown"
+            entry = totals.setdefault(phase, {
+                "count": 0,
+                "wall_time": 0.0,
+                "user_time": 0.0,
+                "sys_time": 0.0,
+                "failures": 0
+            })
+            entry["count"] += 1
+            entry["wall_time"] += record.get("wall_time") or 0.0
+            entry["user_time"] += record.get("user_time") or 0.0
+            entry["sys_time"] += record.get("sys_time") or 0.0
+            if record.get("returncode") != 0:
+                entry["failures"] += 1
+        
+        return totals
+    
+    def repeated_commands(self) -> List[Dict[str, Any]]:
+        """
+        Find commands run more than once in the same directory.
+        
+        Wasted time is everything spent after the first run.
+        
+        Returns:
+            List of {command, cwd, count, total_time, wasted_time},
+            largest waste first
+        """
+        groups: Dict[tuple, List[Dict[str, Any]]] = {}
+        for record in self.records:
+            key = (record.get("command"), record.get("cwd"))
+            groups.setdefault(key, []).append(record)
+        
+        repeated = []
+        for (command, cwd), runs in groups.items():
+            if len(runs) < 2:
+                continue
+            total = sum(r.get("wall_time") or 0.0 for r in runs)
+            repeated.append({
+                "command": command,
+                "cwd": cwd,
+                "count": len(runs),
+                "total_time": total,
+                "wasted_time": total - (runs[0].get("wall_time") or 0.0)
+            })
+        
+        repeated.sort(key=lambda r: r["wasted_time"], reverse=True)
+        return repeated
@@ -0,0 +1,82 @@
+"""autogen model context backed by ContextCompactor."""
+
+from typing import Any, List, Optional
+
+from autogen_core.model_context import ChatCompletionContext
+from autogen_core.models import ChatCompletionClient, LLMMessage, SystemMessage, UserMessage
+
+from core.context_compaction import ContextCompactor
+
+SUMMARY_PROMPT = (
+    "You maintain a running summary of a multi-agent software project conversation. "
+    "Merge the new messages into the summary. Keep decisions, file names, interfaces, "
+    "open issues and who is working on what; drop file contents and logs. "
+    "Answer with the updated summary only, at most 300 words."
+)
+
+
+class CompactingChatCompletionContext(ChatCompletionContext):
+    """
+    Model context that sends a compacted view of the conversation.
+    
+    All messages are stored; get_messages() returns them compacted by a
+    ContextCompactor (sliding window, elided tool output, rolling summary
+    by summarizer_client), so an agent's turn costs about the same at
+    message 150 as at message 15.
+    """
+    
+    def __init__(
+        self,
+        compactor: ContextCompactor,
+        summarizer_client: Optional[ChatCompletionClient] = None,
+        initial_messages: Optional[List[LLMMessage]] = None
+    ):
+        """
+        Initialize context.
+        
+        Args:
+            compactor: Compaction policy (e.g. ContextCompactor.for_role("coder"))
+            summarizer_client: Cheap model for rolling summaries (None: no summaries)
+            initial_messages: Messages to start with
+        """
+        super().__init__(initial_messages)
+        self.compactor = compactor
+        self.summarizer_client = summarizer_client
+        if summarizer_client is not None:
+            compactor.summarizer = self._summarize
+            compactor.summary_message = self._summary_message
+    
+    @classmethod
+    def for_role(
+        cls,
+        role: str,
+        summarizer_client: Optional[ChatCompletionClient] = None,
+        **kwargs: Any
+    ) -> "CompactingChatCompletionContext":
+        """Context with the role's token budget (see ROLE_BUDGETS); kwargs go to ContextCompactor."""
+        return cls(ContextCompactor.for_role(role, **kwargs), summarizer_client)
+    
+    async def _summarize(self, previous: str, new_messages: str) -> str:
+        """Merge new messages into the summary with the cheap model."""
+        result = await self.summarizer_client.create([
+            SystemMessage(content=SUMMARY_PROMPT),
+            UserMessage(
+                content=f"Current summary:\n{previous or '(none)'}\n\nNew messages:\n{new_messages}",
+                source="context"
+            )
+        ])
+        return result.content if isinstance(result.content, str) else str(result.content)
+    
+    @staticmethod
+    def _summary_message(summary: str) -> LLMMessage:
+        """Message carrying the summary of earlier conversation."""
+        return UserMessage(content=f"Summary of the earlier conversation:\n{summary}", source="context_summary")
+    
+    async def get_messages(self) -> List[LLMMessage]:
+        """Compacted view of the conversation."""
+        return await self.compactor.compact_async(self._messages)
+    
+    async def clear(self) -> None:
+        """Clear messages and summary."""
+        await super().clear()
+        self.compactor.reset()
@@ -110,6 +110,27 @@ class ConfigLoader:
         """Get worktree base directory."""
         return self.get("worktree_base", ".multiagent/worktrees")
     
+    def get_worktree_pool(self) -> Dict[str, Any]:
+        """
+        Get warm worktree pool settings.
+        
+        Returns:
+            Dict with size, low_watermark, refill_interval and base_branch
+            (size 0 disables the pool)
+        """
+        pool = {"size": 0, "low_watermark": 1, "refill_interval": 30.0, "base_branch": "main"}
+        pool.update(self.get("worktree_pool", {}))
+        return pool
+    
+    def get_context_budgets(self) -> Dict[str, int]:
+        """
+        Get per-role context token budgets.
+        
+        Returns:
+            Dict role -> budget overriding ROLE_BUDGETS in core.context_compaction
+        """
+        return dict(self.get("context_budgets", {}))
+    
     def save(self, config: Dict[str, Any]):
         """
         Save configuration to file.
@@ -0,0 +1,282 @@
+"""Bounded agent context: sliding window, elided tool output, rolling summary."""
+
+import copy
+import json
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Context token budget per agent role
+ROLE_BUDGETS = {
+    "manager": 8000,
+    "architect": 24000,
+    "coder": 16000,
+    "reviewer": 24000,
+    "default": 16000,
+}
+
+# Tool whose output may be answered with "unchanged since your last read"
+READ_TOOL = "read_file"
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about 4 characters per token)."""
+    return len(text) // 4 + 1
+
+
+def _kind(message: Any) -> str:
+    """Message type name (SystemMessage, UserMessage, AssistantMessage, ...)."""
+    return type(message).__name__
+
+
+def _is_tool_result(message: Any) -> bool:
+    """Whether message carries tool results."""
+    return _kind(message) == "FunctionExecutionResultMessage"
+
+
+def message_text(message: Any) -> str:
+    """Text of a message, including tool calls and tool results."""
+    content = getattr(message, "content", "")
+    if isinstance(content, str):
+        return content
+    return "\n".join(str(getattr(item, "content", None) or getattr(item, "arguments", None) or item) for item in content)
+
+
+def _with_content(message: Any, content: Any) -> Any:
+    """Copy of message with new content (pydantic models or plain objects)."""
+    if hasattr(message, "model_copy"):
+        return message.model_copy(update={"content": content})
+    message = copy.copy(message)
+    message.content = content
+    return message
+
+
+class ContextCompactor:
+    """
+    Keep the context sent to the model within a token budget.
+    
+    The system messages and the first message (the task) are always kept.
+    The last `window` messages are sent as they are. Older messages are
+    shrunk: tool outputs (file dumps, test logs) become one-line
+    references and long texts are cut. With a summarizer, once the
+    aged-out messages exceed summarize_tokens they are folded into a
+    rolling summary by a (cheap) model and dropped, so each turn costs
+    about the same however long the conversation gets. If the result is
+    still over budget, the oldest shrunk messages are dropped.
+    
+    Messages are handled by type name and attributes, so both autogen
+    LLMMessages and simple stand-ins work. Tool results are never
+    separated from the call that produced them.
+    
+    Once a read_file call ages out of the window its output is no longer
+    (fully) in front of the model, so its path is passed to forget_reads;
+    a workspace that remembers reads then sends the file again instead of
+    answering "unchanged".
+    """
+    
+    def __init__(
+        self,
+        budget: int = ROLE_BUDGETS["default"],
+        window: int = 12,
+        max_chars: int = 600,
+        summarizer: Optional[Callable[[str, str], Awaitable[str]]] = None,
+        summarize_tokens: Optional[int] = None,
+        summary_message: Optional[Callable[[str], Any]] = None,
+        forget_reads: Optional[Callable[[List[str]], None]] = None
+    ):
+        """
+        Initialize compactor.
+        
+        Args:
+            budget: Token budget for the whole context
+            window: Most recent messages kept verbatim
+            max_chars: Older message texts are cut to this length
+            summarizer: async fn(previous_summary, new_messages_text) ->
+                summary, typically a cheap model
+            summarize_tokens: Aged-out tokens that trigger a summary
+                (default: a quarter of the budget)
+            summary_message: Build the message carrying the summary
+                (required with summarizer)
+            forget_reads: fn(paths) called with the paths of read_file calls
+                that aged out (e.g. Workspace.forget_reads)
+        """
+        self.budget = budget
+        self.window = window
+        self.max_chars = max_chars
+        self.summarizer = summarizer
+        self.summarize_tokens = summarize_tokens or budget // 4
+        self.summary_message = summary_message
+        self.forget_reads = forget_reads
+        self.summary = ""
+        # Number of body messages (after system messages and task) summarized
+        self.summarized = 0
+        # summaries: total; elided, dropped, tokens: of the last compaction
+        self.stats = {"summaries": 0, "elided": 0, "dropped": 0, "tokens": 0}
+        # Ids of aged-out read_file calls already passed to forget_reads
+        self._forgotten = set()
+    
+    @classmethod
+    def for_role(cls, role: str, budgets: Optional[Dict[str, int]] = None, **kwargs) -> "ContextCompactor":
+        """
+        Compactor with the role's budget.
+        
+        Args:
+            role: Agent role (key of ROLE_BUDGETS)
+            budgets: Role -> budget overrides of ROLE_BUDGETS (e.g. from
+                ConfigLoader.get_context_budgets())
+            **kwargs: Further ContextCompactor arguments; an explicit budget
+                wins over the role's
+        
+        Returns:
+            Configured compactor
+        """
+        role_budgets = {**ROLE_BUDGETS, **(budgets or {})}
+        kwargs.setdefault("budget", role_budgets.get(role, role_budgets["default"]))
+        return cls(**kwargs)
+    
+    def reset(self):
+        """Forget the summary (context was cleared)."""
+        self.summary = ""
+        self.summarized = 0
+        self._forgotten.clear()
+    
+    def _split(self, messages: List[Any]):
+        """Split into head (system messages and task), body and window start in body."""
+        head = 0
+        while head < len(messages) and _kind(messages[head]) == "SystemMessage":
+            head += 1
+        head = min(head + 1, len(messages))
+        body = messages[head:]
+        
+        start = max(len(body) - self.window, 0)
+        # Keep a tool result together with its call
+        while 0 < start < len(body) and _is_tool_result(body[start]):
+            start -= 1
+        return messages[:head], body, start
+    
+    def _shrink(self, message: Any) -> Any:
+        """Shrink an aged-out message."""
+        content = getattr(message, "content", "")
+        
+        if _is_tool_result(message) and isinstance(content, list):
+            results = []
+            for result in content:
+                text = str(getattr(result, "content", ""))
+                if len(text) <= 200:
+                    results.append(result)
+                    continue
+                name = getattr(result, "name", None) or "tool"
+                first_line = text.strip().split("\n", 1)[0][:120]
+                reference = f"[{name} output elided: {len(text)} chars; began: {first_line}]"
+                results.append(_with_content(result, reference))
+                self.stats["elided"] += 1
+            return _with_content(message, results)
+        
+        if isinstance(content, str) and len(content) > self.max_chars:
+            self.stats["elided"] += 1
+            return _with_content(
+                message, content[:self.max_chars] + f"\n[... {len(content) - self.max_chars} chars elided]"
+            )
+        
+        return message
+    
+    def _forget_aged_reads(self, aged: List[Any]):
+        """Pass the paths of newly aged-out read_file calls to forget_reads."""
+        paths = []
+        for message in aged:
+            content = getattr(message, "content", "")
+            if _kind(message) != "AssistantMessage" or isinstance(content, str):
+                continue
+            for call in content:
+                call_id = getattr(call, "id", None)
+                if getattr(call, "name", None) != READ_TOOL or call_id in self._forgotten:
+                    continue
+                self._forgotten.add(call_id)
+                try:
+                    path = json.loads(call.arguments).get("filepath")
+                except (ValueError, AttributeError):
+                    continue
+                if path:
+                    paths.append(path)
+        
+        if paths:
+            self.forget_reads(paths)
+    
+    def _tokens(self, messages: List[Any]) -> int:
+        """Estimated tokens of messages."""
+        return sum(estimate_tokens(message_text(m)) for m in messages)
+    
+    async def update_summary(self, messages: List[Any]):
+        """Fold aged-out messages into the summary once there are enough of them."""
+        if not self.summarizer or not self.summary_message:
+            return
+        
+        _, body, start = self._split(messages)
+        if self.summarized > start:
+            return
+        # Measured as they would be sent, with tool output already elided
+        aged = [self._shrink(m) for m in body[self.summarized:start]]
+        if self._tokens(aged) < self.summarize_tokens:
+            return
+        
+        text = "\n".join(f"{getattr(m, 'source', None) or _kind(m)}: {message_text(m)}" for m in aged)
+        try:
+            self.summary = await self.summarizer(self.summary, text)
+        except Exception as e:
+            logger.warning(f"Context summary failed, keeping messages: {e}")
+            return
+        
+        self.summarized = start
+        self.stats["summaries"] += 1
+    
+    def compact(self, messages: List[Any]) -> List[Any]:
+        """
+        Build the context to send.
+        
+        Args:
+            messages: Full conversation
+        
+        Returns:
+            Messages within the budget where possible
+        """
+        self.stats["elided"] = self.stats["dropped"] = 0
+        head, body, start = self._split(messages)
+        recent = body[start:]
+        if self.forget_reads:
+            self._forget_aged_reads(body[:start])
+        
+        skip = min(self.summarized, start)
+        while skip < start and _is_tool_result(body[skip]):
+            skip += 1
+        older = [self._shrink(m) for m in body[skip:start]]
+        
+        prefix = list(head)
+        if self.summary and self.summary_message:
+            prefix.append(self.summary_message(self.summary))
+        
+        fixed = self._tokens(prefix + recent)
+        total = fixed + self._tokens(older)
+        dropped = 0
+        while dropped < len(older) and total > self.budget:
+            total -= self._tokens([older[dropped]])
+            dropped += 1
+            while dropped < len(older) and _is_tool_result(older[dropped]):
+                total -= self._tokens([older[dropped]])
+                dropped += 1
+        older = older[dropped:]
+        self.stats["dropped"] = dropped
+        
+        if fixed > self.budget:
+            # Still too big: shrink the window too, except the latest turns
+            keep = min(4, len(recent))
+            recent = [self._shrink(m) for m in recent[:len(recent) - keep]] + recent[len(recent) - keep:]
+        
+        result = prefix + older + recent
+        self.stats["tokens"] = self._tokens(result)
+        return result
+    
+    async def compact_async(self, messages: List[Any]) -> List[Any]:
+        """Update the summary if due, then compact."""
+        await self.update_summary(messages)
+        return self.compact(messages)
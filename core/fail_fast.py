@@ -0,0 +1,117 @@
+"""Fail-fast test stage for the QA loop."""
+
+import re
+import shlex
+import subprocess
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from core.shell_runner import ShellRunner
+
+
+class FailFastRunner:
+    """
+    Run a worktree's tests, previously failing tests first, stopping at the
+    first failure.
+    
+    Failing test ids are parsed from pytest's short summary (-rfE) and
+    remembered between runs. The next run tries just those tests first; only
+    when they pass is the whole suite run (with -x, and --ff so pytest's own
+    cache orders the rest). Other test commands are run as given and
+    their output is reported without the reordering.
+    """
+    
+    # Short test summary lines: "FAILED tests/test_a.py::test_b - AssertionError"
+    SUMMARY_LINE = re.compile(r"^(FAILED|ERROR) (\S+)(?: - (.*))?$", re.MULTILINE)
+    
+    def __init__(
+        self,
+        runner: ShellRunner,
+        cwd: Optional[Path] = None,
+        command: str = "python -m pytest",
+        timeout: int = 300,
+        output_lines: int = 60
+    ):
+        """
+        Initialize fail-fast runner.
+        
+        Args:
+            runner: Shell runner the tests are run through
+            cwd: Worktree to run the tests in
+            command: Test command (pytest options are appended)
+            timeout: Timeout per test command in seconds
+            output_lines: Lines of test output passed on with failures
+        """
+        self.runner = runner
+        self.cwd = cwd
+        self.command = command
+        self.timeout = timeout
+        self.output_lines = output_lines
+        self.failed: List[str] = []
+    
+    @property
+    def is_pytest(self) -> bool:
+        """Whether the command runs pytest."""
+        return "pytest" in self.command
+    
+    def _run(self, test_ids: List[str]) -> Dict[str, Any]:
+        """Run the command on test_ids (all tests if empty) and parse failures."""
+        command = self.command
+        if self.is_pytest:
+            command += " -x -q -rfE"
+            if test_ids:
+                command += " " + " ".join(shlex.quote(t) for t in test_ids)
+            else:
+                command += " --ff"
+        
+        try:
+            result = self.runner.run(command, cwd=self.cwd, timeout=self.timeout, phase="test")
+        except subprocess.TimeoutExpired:
+            return {
+                "passed": False,
+                "returncode": None,
+                "failures": [],
+                "issues": [f"Tests timed out after {self.timeout}s: {command}"]
+            }
+        
+        output = (result.stdout or "") + (result.stderr or "")
+        failures = [m.group(2) for m in self.SUMMARY_LINE.finditer(output)]
+        # pytest: 5 = no tests collected
+        passed = result.returncode == 0 or (self.is_pytest and result.returncode == 5)
+        
+        issues = []
+        if not passed:
+            issues = [
+                f"Test {kind.lower()}: {test_id}" + (f" - {message}" if message else "")
+                for kind, test_id, message in self.SUMMARY_LINE.findall(output)
+            ]
+            tail = "\n".join(output.rstrip().splitlines()[-self.output_lines:])
+            issues.append(f"Test output (exit code {result.returncode}):\n{tail}")
+        
+        return {
+            "passed": passed,
+            "returncode": result.returncode,
+            "failures": failures,
+            "issues": issues
+        }
+    
+    def run(self) -> Dict[str, Any]:
+        """
+        Run the tests.
+        
+        Returns:
+            Dict with passed, returncode, failures (test ids) and issues
+            (failure descriptions for the fixer; empty when passed)
+        """
+        if self.failed and self.is_pytest:
+            result = self._run(self.failed)
+            # Any other failure (e.g. the ids no longer exist) falls through
+            # to the full run
+            if not result["passed"] and result["failures"]:
+                # -x stopped early: tests after the failure are still suspect
+                self.failed = result["failures"] + [t for t in self.failed if t not in result["failures"]]
+                return result
+        
+        result = self._run([])
+        self.failed = result["failures"]
+        return result
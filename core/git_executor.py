@@ -0,0 +1,157 @@
+"""Async git executor with per-repository locking and lock-contention retry."""
+
+import asyncio
+import os
+import random
+import subprocess
+import weakref
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+class GitExecutor:
+    """
+    Run git commands concurrently.
+    
+    Commands that update shared repository state (ref creation/deletion,
+    worktree registration, merges in the main checkout) are run with
+    exclusive=True and serialized per repository. Everything else runs in
+    parallel, bounded by max_parallel. Failures caused by another git
+    process holding a lock file are retried with exponential backoff.
+    """
+    
+    # stderr fragments git prints when another process holds a lock
+    LOCK_ERRORS = (
+        "index.lock",
+        ".lock': File exists",
+        "cannot lock ref",
+        "Unable to create",
+        "could not lock",
+        "is locked",
+    )
+    
+    # Shared across executors so two managers on one repo still serialize.
+    # asyncio primitives belong to one event loop, so locks are kept per loop.
+    _repo_locks: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Lock]]" = (
+        weakref.WeakKeyDictionary()
+    )
+    
+    def __init__(
+        self,
+        repo_dir: Optional[str] = None,
+        max_parallel: int = 8,
+        max_retries: int = 5,
+        retry_delay: float = 0.05,
+        env: Optional[Dict[str, str]] = None
+    ):
+        """
+        Initialize git executor.
+        
+        Args:
+            repo_dir: Repository to run git in (default: current directory)
+            max_parallel: Maximum concurrent git processes
+            max_retries: Retries on lock contention
+            retry_delay: Initial backoff delay in seconds
+            env: Environment for git processes (default: inherit)
+        """
+        self.repo_dir = repo_dir
+        self.max_parallel = max_parallel
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.env = env
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+            weakref.WeakKeyDictionary()
+        )
+    
+    @property
+    def repo_lock(self) -> asyncio.Lock:
+        """Lock guarding shared state of this repository (current event loop)."""
+        locks = self._repo_locks.setdefault(asyncio.get_running_loop(), {})
+        key = os.path.realpath(self.repo_dir or os.getcwd())
+        lock = locks.get(key)
+        if lock is None:
+            lock = locks[key] = asyncio.Lock()
+        return lock
+    
+    @property
+    def _semaphore(self) -> asyncio.Semaphore:
+        """Process limit for the current event loop."""
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self.max_parallel)
+        return semaphore
+    
+    def _is_lock_error(self, stderr: str) -> bool:
+        """Check whether git failed because a lock file was held."""
+        return any(fragment in stderr for fragment in self.LOCK_ERRORS)
+    
+    async def run(
+        self,
+        args: List[str],
+        cwd: Optional[Path] = None,
+        exclusive: bool = False,
+        check: bool = True
+    ) -> subprocess.CompletedProcess:
+        """
+        Run git command.
+        
+        Args:
+            args: Arguments after "git"
+            cwd: Working directory (default: repo_dir)
+            exclusive: Hold the repository lock while running
+            check: Raise CalledProcessError on non-zero exit
+        
+        Returns:
+            CompletedProcess with text stdout/stderr
+        
+        Raises:
+            subprocess.CalledProcessError: If check and git failed
+        """
+        if exclusive:
+            async with self.repo_lock:
+                return await self._run_with_retry(args, cwd, check)
+        return await self._run_with_retry(args, cwd, check)
+    
+    async def _run_with_retry(
+        self,
+        args: List[str],
+        cwd: Optional[Path],
+        check: bool
+    ) -> subprocess.CompletedProcess:
+        """Run git, retrying while another process holds a lock."""
+        cmd = ["git"] + args
+        workdir = str(cwd) if cwd else self.repo_dir
+        
+        for attempt in range(self.max_retries + 1):
+            async with self._semaphore:
+                process = await asyncio.create_subprocess_exec(
+                    *cmd,
+                    cwd=workdir,
+                    env=self.env,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE
+                )
+                stdout, stderr = await process.communicate()
+            
+            result = subprocess.CompletedProcess(
+                cmd,
+                process.returncode,
+                stdout.decode("utf-8", "replace"),
+                stderr.decode("utf-8", "replace")
+            )
+            
+            if result.returncode == 0 or not self._is_lock_error(result.stderr):
+                break
+            
+            if attempt < self.max_retries:
+                # Jitter keeps a crowd of retrying tasks from colliding again
+                delay = self.retry_delay * (2 ** attempt)
+                await asyncio.sleep(delay + random.uniform(0, delay))
+        
+        if check and result.returncode != 0:
+            raise subprocess.CalledProcessError(
+                result.returncode, cmd, result.stdout, result.stderr
+            )
+        
+        return result
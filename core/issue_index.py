@@ -0,0 +1,310 @@
+"""Near-duplicate index over reviewer issues for recurring issue detection."""
+
+import hashlib
+import logging
+import math
+import random
+import re
+from typing import Callable, Dict, List, Optional, Sequence
+
+try:
+    import httpx
+except ImportError:  # optional: only needed for proxy embeddings
+    httpx = None
+
+logger = logging.getLogger(__name__)
+
+# Words that carry no meaning for comparing issues
+STOPWORDS = frozenset(
+    "a an the is are was be been this that these those it its of in on at to for "
+    "from by with and or as should must please there here".split()
+)
+
+# Identifiers; the first non-empty group is the name
+_IDENTIFIER = re.compile(
+    r"`([^`]+)`"
+    r"|([A-Za-z_][\w.]*)\s*\("
+    r"|([\w.-]*/[\w./-]+)"
+    r"|\b([A-Za-z]\w*(?:[_.]\w+)+|[a-z]+[A-Z]\w*|[A-Z][a-z0-9]+[A-Z]\w*)\b"
+    r"|(?<![\w.])(\d+)(?![\w.])"
+)
+_LINE_REF = re.compile(r"\blines?\s+\d+(?:\s*[-\u2013]\s*\d+)?", re.IGNORECASE)
+_FILE_LINE = re.compile(r"(\S+\.\w+):\d+\b")
+
+# Mersenne prime for the MinHash permutations
+_PRIME = (1 << 61) - 1
+
+
+def issue_tokens(text: str) -> List[str]:
+    """
+    Normalize issue text into comparable tokens.
+    
+    Args:
+        text: Issue text
+    
+    Returns:
+        Lowercase word tokens without punctuation and stopwords
+    """
+    return [t for t in re.findall(r"[a-z0-9_]+", str(text).lower()) if t not in STOPWORDS]
+
+
+def issue_identifiers(text: str) -> frozenset:
+    """
+    Names an issue is about: calls, CamelCase, snake_case or dotted names,
+    paths, backticked code and numbers (line numbers excluded).
+    
+    Two issues naming different identifiers are different issues however
+    similar the rest of their wording is.
+    
+    Args:
+        text: Issue text
+    
+    Returns:
+        Lowercase identifiers
+    """
+    found = set()
+    for match in _IDENTIFIER.finditer(_strip_line_refs(str(text))):
+        name = next(group for group in match.groups() if group)
+        found.add(name.strip().rstrip("()").lower())
+    return frozenset(found)
+
+
+def _strip_line_refs(text: str) -> str:
+    """Remove line references, which shift as the code is fixed."""
+    return _FILE_LINE.sub(r"\1", _LINE_REF.sub("", text))
+
+
+def _stem(token: str) -> str:
+    """Drop a plural s ("passwords" -> "password")."""
+    return token[:-1] if len(token) > 3 and token.endswith("s") and not token.endswith("ss") else token
+
+
+def issue_shingles(text: str, size: int = 4) -> set:
+    """
+    Character n-grams of the normalized issue with spaces removed.
+    
+    Joining the tokens makes "plain text" and "plaintext" compare equal
+    and is insensitive to word order apart from the joins.
+    """
+    joined = "".join(_stem(t) for t in issue_tokens(_strip_line_refs(str(text))))
+    return {joined[i:i + size] for i in range(max(len(joined) - size + 1, 1))} if joined else set()
+
+
+def proxy_embedder(
+    base_url: str,
+    api_key: str,
+    model: str = "text-embedding-3-small",
+    timeout: float = 5.0
+) -> Optional[Callable[[List[str]], List[List[float]]]]:
+    """
+    Build an embedding function backed by the proxy's /embeddings endpoint.
+    
+    Args:
+        base_url: OpenAI-compatible API base (e.g. config.BASE_URL)
+        api_key: API key
+        model: Embedding model
+        timeout: Request timeout in seconds
+    
+    Returns:
+        Function mapping texts to vectors, or None if httpx is unavailable
+    """
+    if httpx is None:
+        return None
+    
+    def embed(texts: List[str]) -> List[List[float]]:
+        response = httpx.post(
+            f"{base_url.rstrip('/')}/embeddings",
+            headers={"Authorization": f"Bearer {api_key}"},
+            json={"model": model, "input": texts},
+            timeout=timeout
+        )
+        response.raise_for_status()
+        data = sorted(response.json()["data"], key=lambda item: item["index"])
+        return [item["embedding"] for item in data]
+    
+    return embed
+
+
+def _cosine(a: Sequence[float], b: Sequence[float]) -> float:
+    """Cosine similarity of two vectors."""
+    dot = sum(x * y for x, y in zip(a, b))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return dot / norm if norm else 0.0
+
+
+class IssueIndex:
+    """
+    Cluster reworded issues incrementally.
+    
+    Each issue is reduced to character shingles and a MinHash signature.
+    LSH buckets (bands of the signature) find candidate clusters in roughly
+    constant time, so adding an issue stays cheap with hundreds of issues
+    in the index. Candidates are confirmed by estimated Jaccard similarity
+    and must name the same identifiers (see issue_identifiers), so
+    "login() lacks validation" and "register() lacks validation" stay
+    apart. Issues MinHash can't place are optionally compared by embedding
+    cosine similarity under the same identifier rule; if the embedder
+    fails it is disabled and MinHash alone is used.
+    """
+    
+    def __init__(
+        self,
+        num_perm: int = 128,
+        bands: int = 32,
+        threshold: float = 0.6,
+        embedder: Optional[Callable[[List[str]], List[List[float]]]] = None,
+        embedding_threshold: float = 0.88
+    ):
+        """
+        Initialize issue index.
+        
+        Args:
+            num_perm: MinHash signature length
+            bands: LSH bands (num_perm must be divisible by bands)
+            threshold: Minimum estimated Jaccard similarity to join a cluster
+            embedder: Optional function mapping texts to vectors
+                (e.g. proxy_embedder(BASE_URL, API_KEY))
+            embedding_threshold: Minimum cosine similarity to join a cluster
+        """
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self.embedder = embedder
+        self.embedding_threshold = embedding_threshold
+        
+        rng = random.Random(0)
+        self._perms = [(rng.randrange(1, _PRIME), rng.randrange(0, _PRIME)) for _ in range(num_perm)]
+        self._buckets: Dict[tuple, List[int]] = {}
+        # Per indexed wording: MinHash signature, identifiers and cluster id
+        self._signatures: List[List[int]] = []
+        self._member_identifiers: List[frozenset] = []
+        self._member_cluster: List[int] = []
+        # Embedding and identifiers of each cluster's first wording
+        self._embeddings: Dict[int, List[float]] = {}
+        self._cluster_identifiers: List[frozenset] = []
+        # Normalized text -> cluster id
+        self._known: Dict[str, int] = {}
+        # Per cluster: first wording and number of times reported
+        self.clusters: List[Dict[str, object]] = []
+    
+    def signature(self, text: str) -> List[int]:
+        """MinHash signature of the issue's shingles."""
+        hashes = [
+            int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=8).digest(), "big")
+            for s in issue_shingles(text)
+        ] or [0]
+        return [min((a * h + b) % _PRIME for h in hashes) for a, b in self._perms]
+    
+    @staticmethod
+    def _similarity(sig_a: List[int], sig_b: List[int]) -> float:
+        """Estimated Jaccard similarity from two signatures."""
+        return sum(1 for x, y in zip(sig_a, sig_b) if x == y) / len(sig_a)
+    
+    def _band_keys(self, sig: List[int]) -> List[tuple]:
+        """LSH bucket keys of a signature."""
+        return [(band, tuple(sig[band * self.rows:(band + 1) * self.rows])) for band in range(self.bands)]
+    
+    def _match(self, sig: List[int], identifiers: frozenset) -> Optional[int]:
+        """Find the cluster of the most similar indexed issue above threshold."""
+        best_cluster, best_score = None, self.threshold
+        seen = set()
+        
+        for key in self._band_keys(sig):
+            for member in self._buckets.get(key, ()):
+                if member in seen:
+                    continue
+                seen.add(member)
+                if self._member_identifiers[member] != identifiers:
+                    continue
+                score = self._similarity(sig, self._signatures[member])
+                if score >= best_score:
+                    best_cluster, best_score = self._member_cluster[member], score
+        
+        return best_cluster
+    
+    def _embed(self, texts: List[str]) -> Optional[List[List[float]]]:
+        """Embed texts, disabling the embedder on failure."""
+        if not self.embedder or not texts:
+            return None
+        try:
+            return self.embedder(texts)
+        except Exception as e:
+            logger.warning(f"Issue embeddings unavailable, using MinHash only: {e}")
+            self.embedder = None
+            return None
+    
+    def add_many(self, issues: List[str]) -> List[int]:
+        """
+        Add issues and return their cluster ids.
+        
+        Args:
+            issues: Issue texts
+        
+        Returns:
+            Cluster id per issue (same id = same issue, possibly reworded)
+        """
+        keys = [" ".join(issue_tokens(issue)) for issue in issues]
+        sigs: Dict[str, List[int]] = {}
+        identifiers: Dict[str, frozenset] = {}
+        unmatched = []
+        
+        for issue, key in zip(issues, keys):
+            if key in self._known or key in sigs:
+                continue
+            sigs[key] = self.signature(issue)
+            identifiers[key] = issue_identifiers(issue)
+            if self._match(sigs[key], identifiers[key]) is None:
+                unmatched.append((issue, key))
+        
+        # One batched request for every wording MinHash couldn't place
+        vectors = self._embed([issue for issue, _ in unmatched])
+        embedded = dict(zip([key for _, key in unmatched], vectors or []))
+        
+        result = []
+        for issue, key in zip(issues, keys):
+            if key not in self._known:
+                self._known[key] = self._insert(issue, sigs[key], identifiers[key], embedded.get(key))
+            cluster = self._known[key]
+            self.clusters[cluster]["count"] += 1
+            result.append(cluster)
+        
+        return result
+    
+    def _insert(
+        self,
+        issue: str,
+        sig: List[int],
+        identifiers: frozenset,
+        vector: Optional[List[float]]
+    ) -> int:
+        """Index a new issue wording, joining or creating a cluster."""
+        cluster = self._match(sig, identifiers)
+        
+        if cluster is None and vector is not None:
+            best_score = self.embedding_threshold
+            for candidate, other in self._embeddings.items():
+                if self._cluster_identifiers[candidate] != identifiers:
+                    continue
+                score = _cosine(vector, other)
+                if score >= best_score:
+                    cluster, best_score = candidate, score
+        
+        if cluster is None:
+            cluster = len(self.clusters)
+            self.clusters.append({"text": issue, "count": 0})
+            self._cluster_identifiers.append(identifiers)
+            if vector is not None:
+                self._embeddings[cluster] = vector
+        
+        member = len(self._signatures)
+        self._signatures.append(sig)
+        self._member_identifiers.append(identifiers)
+        self._member_cluster.append(cluster)
+        for key in self._band_keys(sig):
+            self._buckets.setdefault(key, []).append(member)
+        
+        return cluster
@@ -0,0 +1,287 @@
+"""Incremental extraction of JSON review objects from (streamed) model output."""
+
+import bisect
+import json
+import logging
+import re
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# JSON schema of a review, requested from models with structured output
+REVIEW_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "approved": {"type": "boolean"},
+        "issues": {"type": "array", "items": {"type": "string"}}
+    },
+    "required": ["approved", "issues"],
+    "additionalProperties": True
+}
+
+# OpenAI response_format asking for a schema-conforming review
+REVIEW_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {"name": "review", "schema": REVIEW_SCHEMA}
+}
+
+# A verdict for reviewers that answer in plain text: "approved" (any case)
+# ending its line, e.g. "Looks good. APPROVED" or "Verdict: Approved."
+_VERDICT = re.compile(r"\bapproved\b(?=[^\w\n]*$)", re.IGNORECASE | re.MULTILINE)
+
+# Where the clause of a verdict starts: after a sentence end or a blank line
+_CLAUSE_END = re.compile(r"[.!?;]|\n\s*\n")
+
+# Negation anywhere in that clause ("not yet approved", "NOT\nAPPROVED")
+_NEGATION = re.compile(r"\b(?:not|never|cannot|rejected)\b|n't\b", re.IGNORECASE)
+
+
+def is_review(obj: Any) -> bool:
+    """
+    Check an object against REVIEW_SCHEMA.
+    
+    "issues" may be missing (treated as no issues); if present it must be
+    a list. Issues that are not strings are accepted and stringified later.
+    
+    Args:
+        obj: Decoded JSON value
+    
+    Returns:
+        True if obj is a review
+    """
+    return (
+        isinstance(obj, dict)
+        and isinstance(obj.get("approved"), bool)
+        and isinstance(obj.get("issues", []), list)
+    )
+
+
+class JsonObjectExtractor:
+    """
+    Find the first top-level JSON object matching a predicate in a text stream.
+    
+    Text is fed in chunks as it arrives. The scanner tracks brace depth and
+    string state, so it only tries to decode once a candidate object is
+    closed, and each chunk continues where the previous one stopped. A
+    candidate that isn't valid JSON (prose with braces) is abandoned and
+    the text after its opening brace is scanned again; a valid object that
+    doesn't match is skipped as a whole.
+    """
+    
+    def __init__(self, predicate: Callable[[Any], bool] = is_review):
+        """
+        Initialize extractor.
+        
+        Args:
+            predicate: Test a decoded object must pass
+        """
+        self.predicate = predicate
+        self.buffer = ""
+        self.result: Optional[Dict[str, Any]] = None
+        self._pos = 0           # next character to scan
+        self._start = -1        # opening brace of the current candidate
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+    
+    def _reset(self, pos: int):
+        """Drop the current candidate and continue scanning at pos."""
+        self._pos = pos
+        self._start = -1
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+    
+    def feed(self, chunk: str) -> Optional[Dict[str, Any]]:
+        """
+        Add text and scan it.
+        
+        Args:
+            chunk: Next piece of output
+        
+        Returns:
+            The first matching object once complete, else None
+        """
+        if self.result is not None:
+            return self.result
+        self.buffer += chunk
+        buffer = self.buffer
+        
+        while self._pos < len(buffer):
+            if self._start < 0:
+                self._start = buffer.find("{", self._pos)
+                if self._start < 0:
+                    self._pos = len(buffer)
+                    break
+                self._pos = self._start + 1
+                self._depth = 1
+                continue
+            
+            char = buffer[self._pos]
+            self._pos += 1
+            
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char == "{":
+                self._depth += 1
+            elif char == "}":
+                self._depth -= 1
+                if self._depth == 0:
+                    try:
+                        obj = json.loads(buffer[self._start:self._pos])
+                    except json.JSONDecodeError:
+                        self._reset(self._start + 1)
+                        continue
+                    if self.predicate(obj):
+                        self.result = obj
+                        return obj
+                    self._reset(self._pos)
+        
+        return None
+    
+    def close(self) -> Optional[Dict[str, Any]]:
+        """
+        Finish the stream.
+        
+        An unbalanced brace in prose keeps the scanner inside a candidate
+        forever, so at the end every later opening brace is tried as well.
+        
+        Returns:
+            The first matching object, or None
+        """
+        while self.result is None and self._start >= 0:
+            self._reset(self._start + 1)
+            self.feed("")
+        return self.result
+
+
+def extract_review(text: str) -> Optional[Dict[str, Any]]:
+    """
+    Extract the first review object from complete output.
+    
+    Args:
+        text: Reviewer output
+    
+    Returns:
+        Review dict, or None if the output contains none
+    """
+    extractor = JsonObjectExtractor()
+    return extractor.feed(text) or extractor.close()
+
+
+def plain_text_review(text: str) -> Dict[str, Any]:
+    """
+    Interpret output without a review object.
+    
+    Only "approved" (in any case) ending a line counts as a verdict, unless
+    its clause is negated ("not yet approved", "NOT\nAPPROVED", "cannot be
+    approved", "Rejected - will not be approved") or the output mentions
+    an "approved" key (broken JSON), so a rejection or a truncated
+    {"approved": false ...} is never read as approval. A clause runs from
+    the previous sentence end (.!?;) or blank line.
+    
+    Args:
+        text: Reviewer output
+    
+    Returns:
+        Review dict with raw_output
+    """
+    if '"approved"' in text.lower():
+        return {"approved": False, "issues": [], "raw_output": text}
+    
+    ends = [m.end() for m in _CLAUSE_END.finditer(text)]
+    approved = False
+    for match in _VERDICT.finditer(text):
+        # Last clause boundary before the verdict
+        i = bisect.bisect_right(ends, match.start()) - 1
+        clause = text[ends[i] if i >= 0 else 0:match.start()]
+        if not _NEGATION.search(clause):
+            approved = True
+            break
+    return {"approved": approved, "issues": [], "raw_output": text}
+
+
+async def stream_review(chunks: AsyncIterator[Any]) -> Dict[str, Any]:
+    """
+    Consume streamed reviewer output until a review object is complete.
+    
+    The stream is closed as soon as the object arrives, which stops the
+    model's generation instead of paying for trailing prose.
+    
+    Args:
+        chunks: Text chunks; non-str items (e.g. a final CreateResult) are
+            ignored
+    
+    Returns:
+        Review dict (plain_text_review of the whole output if none found)
+    """
+    extractor = JsonObjectExtractor()
+    review = None
+    
+    try:
+        async for chunk in chunks:
+            if isinstance(chunk, str) and extractor.feed(chunk) is not None:
+                review = extractor.result
+                break
+    finally:
+        aclose = getattr(chunks, "aclose", None)
+        if aclose is not None:
+            await aclose()
+    
+    review = review or extractor.close()
+    return review if review is not None else plain_text_review(extractor.buffer)
+
+
+async def stream_client_review(client: Any, messages: List[Any]) -> Dict[str, Any]:
+    """
+    Review with a streaming chat client, preferring structured output.
+    
+    Tries a schema-constrained response_format, then plain JSON mode, then
+    free text; a mode the model rejects fails before any output, so the
+    next one is tried. All modes go through stream_review.
+    
+    Args:
+        client: Client with create_stream() (e.g. ResilientClient)
+        messages: Chat messages for the review
+    
+    Returns:
+        Review dict
+    """
+    modes = [
+        {"json_output": True, "extra_create_args": {"response_format": REVIEW_RESPONSE_FORMAT}},
+        {"json_output": True},
+        {}
+    ]
+    
+    for i, kwargs in enumerate(modes):
+        stream = client.create_stream(messages, **kwargs)
+        try:
+            first = await stream.__anext__()
+        except StopAsyncIteration:
+            return plain_text_review("")
+        except Exception as e:
+            if i == len(modes) - 1:
+                raise
+            logger.info(f"Review output mode {sorted(kwargs)} unsupported, falling back: {e}")
+            continue
+        
+        return await stream_review(_prepend(first, stream))
+
+
+async def _prepend(first: Any, rest: AsyncIterator[Any]) -> AsyncIterator[Any]:
+    """Yield first, then the rest of the stream (closing it when done)."""
+    try:
+        yield first
+        async for item in rest:
+            yield item
+    finally:
+        aclose = getattr(rest, "aclose", None)
+        if aclose is not None:
+            await aclose()
@@ -0,0 +1,211 @@
+"""In-memory conflict detection and batch merge-back of task branches."""
+
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional
+
+
+class MergeService:
+    """
+    Merge many task branches without touching any working tree.
+    
+    Conflicts are detected with `git merge-tree --write-tree`, which merges
+    in memory and writes only objects. Clean merges are turned into merge
+    commits with `git commit-tree` and the target ref is moved once at the
+    end.
+    """
+    
+    def __init__(
+        self,
+        repo_dir: Optional[str] = None,
+        max_workers: int = 8,
+        env: Optional[Dict[str, str]] = None
+    ):
+        """
+        Initialize merge service.
+        
+        Args:
+            repo_dir: Repository to run git in (default: current directory)
+            max_workers: Parallel git processes for conflict checks
+            env: Environment for git processes (default: inherit)
+        """
+        self.repo_dir = repo_dir
+        self.max_workers = max_workers
+        self.env = env
+    
+    def _git(self, args: List[str], check: bool = True) -> subprocess.CompletedProcess:
+        """Run git command in repo."""
+        return subprocess.run(
+            ["git"] + args,
+            cwd=self.repo_dir,
+            env=self.env,
+            check=check, capture_output=True, text=True
+        )
+    
+    def _merge_tree(self, ours: str, theirs: str) -> Dict[str, Any]:
+        """
+        Merge two commits in memory.
+        
+        Returns:
+            Dict with clean flag, resulting tree and conflicted paths
+        """
+        result = self._git(
+            ["merge-tree", "--write-tree", "--name-only", "--no-messages", ours, theirs],
+            check=False
+        )
+        
+        # Exit 0 = clean, 1 = conflicts; anything else is a real error
+        if result.returncode not in (0, 1):
+            raise subprocess.CalledProcessError(
+                result.returncode, result.args, result.stdout, result.stderr
+            )
+        
+        lines = [line for line in result.stdout.splitlines() if line]
+        return {
+            "clean": result.returncode == 0,
+            "tree": lines[0] if lines else None,
+            "conflicts": lines[1:]
+        }
+    
+    def _check_branch(self, branch: str, target: str) -> Dict[str, Any]:
+        """Check one branch against target and collect its changed files."""
+        check = self._merge_tree(target, branch)
+        # NUL-separated and unquoted, so paths with spaces stay whole
+        output = self._git(["diff", "--name-only", "-z", f"{target}...{branch}"]).stdout
+        check["changed_files"] = [path for path in output.split("\0") if path]
+        return check
+    
+    def check_conflicts(self, branches: List[str], target: str = "main") -> Dict[str, Dict[str, Any]]:
+        """
+        Check every branch against target in parallel.
+        
+        Args:
+            branches: Branch names to check
+            target: Branch they would be merged into
+        
+        Returns:
+            Dict branch -> {clean, tree, conflicts, changed_files}
+        """
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            results = pool.map(lambda branch: self._check_branch(branch, target), branches)
+            return dict(zip(branches, results))
+    
+    def plan(self, branches: List[str], target: str = "main") -> Dict[str, Any]:
+        """
+        Build a merge-order plan.
+        
+        Branches that conflict with target are excluded. The rest are
+        ordered so that branches whose files overlap no other branch go
+        first, then overlapping ones by number of changed files, which
+        keeps the largest number of merges conflict-free.
+        
+        Args:
+            branches: Branch names to merge
+            target: Target branch
+        
+        Returns:
+            Dict with order, conflicting {branch: paths}, overlaps
+            {branch: [other branches sharing files]} and checks
+        """
+        checks = self.check_conflicts(branches, target)
+        
+        conflicting = {b: c["conflicts"] for b, c in checks.items() if not c["clean"]}
+        candidates = [b for b in branches if checks[b]["clean"]]
+        
+        owners: Dict[str, List[str]] = {}
+        for branch in candidates:
+            for path in checks[branch]["changed_files"]:
+                owners.setdefault(path, []).append(branch)
+        
+        overlaps = {}
+        for branch in candidates:
+            others = set()
+            for path in checks[branch]["changed_files"]:
+                others.update(owners[path])
+            others.discard(branch)
+            if others:
+                overlaps[branch] = sorted(others)
+        
+        order = sorted(
+            candidates,
+            key=lambda b: (b in overlaps, len(checks[b]["changed_files"]), candidates.index(b))
+        )
+        
+        return {
+            "order": order,
+            "conflicting": conflicting,
+            "overlaps": overlaps,
+            "checks": checks
+        }
+    
+    def _checked_out_path(self, branch: str) -> Optional[str]:
+        """Return path of the worktree that has branch checked out, if any."""
+        output = self._git(["worktree", "list", "--porcelain"]).stdout
+        path = None
+        for line in output.splitlines():
+            if line.startswith("worktree "):
+                path = line.split(" ", 1)[1]
+            elif line == f"branch refs/heads/{branch}":
+                return path
+        return None
+    
+    def merge_all(
+        self,
+        branches: List[str],
+        target: str = "main",
+        dry_run: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Merge all clean branches into target.
+        
+        Each branch is merged in memory on top of the previous result; a
+        branch that conflicts with an earlier one is skipped. The target
+        ref is updated once (fast-forwarding its checkout if it has one).
+        
+        Args:
+            branches: Branch names to merge
+            target: Target branch
+            dry_run: If True, compute the result without updating target
+        
+        Returns:
+            Dict with merged branches, skipped {branch: paths}, plan and
+            resulting commit (None if nothing merged)
+        """
+        plan = self.plan(branches, target)
+        skipped = dict(plan["conflicting"])
+        
+        start = self._git(["rev-parse", target]).stdout.strip()
+        current = start
+        merged = []
+        
+        for branch in plan["order"]:
+            result = self._merge_tree(current, branch)
+            if not result["clean"]:
+                skipped[branch] = result["conflicts"]
+                continue
+            
+            branch_tip = self._git(["rev-parse", branch]).stdout.strip()
+            current = self._git([
+                "commit-tree", result["tree"],
+                "-p", current, "-p", branch_tip,
+                "-m", f"Merge branch '{branch}'"
+            ]).stdout.strip()
+            merged.append(branch)
+        
+        if merged and not dry_run:
+            checkout = self._checked_out_path(target)
+            if checkout:
+                # Fast-forward keeps the checkout's index and files in sync
+                subprocess.run(
+                    ["git", "-C", checkout, "merge", "--ff-only", "-q", current],
+                    check=True, capture_output=True, text=True, env=self.env
+                )
+            else:
+                self._git(["update-ref", f"refs/heads/{target}", current, start])
+        
+        return {
+            "merged": merged,
+            "skipped": skipped,
+            "plan": plan,
+            "commit": current if merged else None
+        }
@@ -0,0 +1,277 @@
+"""Parallel coder execution: work items, per-file ownership and a join."""
+
+import asyncio
+import functools
+import posixpath
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from core.json_stream import JsonObjectExtractor
+
+# Asks the architect for a plan the scheduler can dispatch
+PLAN_PROMPT = """Split this task into independent work items for {coders} coders working in parallel:
+
+{task}
+
+Respond with JSON only:
+{{"items": [{{"id": "short-id", "title": "...", "description": "what to build, interfaces to follow",
+"files": ["paths this item creates or changes"], "depends_on": ["ids that must finish first"]}}]}}
+
+Give each file to exactly one item. Only add depends_on where an item really needs another's output."""
+
+# Task given to a coder for one work item
+ITEM_PROMPT = """Overall task: {task}
+
+Your work item ({id}): {title}
+{description}
+
+You own these files: {files}
+Other coders are working on other files at the same time; writes to files owned by
+another work item are rejected. Finish by summarizing what you built and anything
+another item still needs to change."""
+
+
+def is_plan(obj: Any) -> bool:
+    """Check for {"items": [{...}, ...]}."""
+    return (
+        isinstance(obj, dict)
+        and isinstance(obj.get("items"), list)
+        and all(isinstance(item, dict) for item in obj["items"])
+    )
+
+
+def parse_work_items(text: str) -> List[Dict[str, Any]]:
+    """
+    Extract work items from a plan.
+    
+    Args:
+        text: Architect/manager output containing a plan object
+    
+    Returns:
+        Items with id, title, description, files and depends_on (unknown
+        dependencies dropped); empty if there is no plan
+    """
+    extractor = JsonObjectExtractor(is_plan)
+    plan = extractor.feed(text) or extractor.close()
+    if plan is None:
+        return []
+    
+    items = []
+    for i, raw in enumerate(plan["items"], 1):
+        items.append({
+            "id": str(raw.get("id") or f"item-{i}"),
+            "title": str(raw.get("title", "")),
+            "description": str(raw.get("description", "")),
+            # Same form as Workspace-relative paths, so planned and written paths match
+            "files": [posixpath.normpath(str(f).replace("\\", "/")).lstrip("/") for f in raw.get("files") or []],
+            "depends_on": [str(d) for d in raw.get("depends_on") or []],
+        })
+    
+    ids = {item["id"] for item in items}
+    for item in items:
+        item["depends_on"] = [d for d in item["depends_on"] if d in ids and d != item["id"]]
+    return items
+
+
+class FileOwnership:
+    """
+    Which work item owns which file.
+    
+    Tools run in worker threads, so claims are guarded by a lock. Claims
+    are all-or-nothing and released when the item finishes.
+    """
+    
+    def __init__(self):
+        """Initialize with no owners."""
+        self._owners: Dict[str, str] = {}
+        self._lock = threading.Lock()
+    
+    def claim(self, owner: str, paths: List[str]) -> List[str]:
+        """
+        Claim paths for owner unless another owner holds any of them.
+        
+        Args:
+            owner: Work item id
+            paths: Workspace-relative paths
+        
+        Returns:
+            Paths held by other owners (nothing was claimed if non-empty)
+        """
+        with self._lock:
+            conflicts = [p for p in paths if self._owners.get(p, owner) != owner]
+            if not conflicts:
+                for path in paths:
+                    self._owners[path] = owner
+            return conflicts
+    
+    def release(self, owner: str):
+        """Release all paths held by owner."""
+        with self._lock:
+            self._owners = {p: o for p, o in self._owners.items() if o != owner}
+    
+    def owner_of(self, path: str) -> Optional[str]:
+        """Current owner of path, or None."""
+        with self._lock:
+            return self._owners.get(path)
+
+
+def owned_tools(workspace: Any, ownership: FileOwnership, owner: str) -> list:
+    """
+    Workspace tools whose writes are restricted to files owner can claim.
+    
+    Reads pass through. A write to an unowned file claims it; a write to a
+    file owned by another item returns an error and changes nothing.
+    
+    Args:
+        workspace: tools.file_ops.Workspace
+        ownership: Shared ownership table
+        owner: Work item id
+    
+    Returns:
+        Tool list like Workspace.tools()
+    """
+    def guarded(tool: Callable, paths_of: Callable[..., List[str]]) -> Callable:
+        @functools.wraps(tool)
+        def wrapper(*args, **kwargs):
+            try:
+                paths = [workspace._relative(p) for p in paths_of(*args, **kwargs)]
+            except Exception as e:
+                return f"Error: {str(e)}"
+            conflicts = ownership.claim(owner, paths)
+            if conflicts:
+                holders = ", ".join(f"{p} ({ownership.owner_of(p)})" for p in conflicts)
+                return (
+                    f"Error: owned by another work item: {holders}. No files were changed. "
+                    f"Leave these files alone and mention the change they need in your summary."
+                )
+            return tool(*args, **kwargs)
+        return wrapper
+    
+    def filepath(filepath, *args, **kwargs):
+        return [filepath]
+    
+    def files(files, *args, **kwargs):
+        return list(files)
+    
+    def edits(edits, *args, **kwargs):
+        return [e.get("filepath", "") for e in edits]
+    
+    guards = {
+        "write_file": filepath,
+        "apply_edit": filepath,
+        "write_files": files,
+        "multi_edit": edits,
+    }
+    return [
+        guarded(tool, guards[tool.__name__]) if tool.__name__ in guards else tool
+        for tool in workspace.tools()
+    ]
+
+
+class ParallelCoders:
+    """
+    Dispatch work items to coders concurrently and join the results.
+    
+    An item starts once its dependencies have finished, a coder is free and
+    it can claim all its planned files; items with overlapping files
+    therefore run one after the other, disjoint ones in parallel. Items
+    whose dependencies failed are skipped.
+    """
+    
+    def __init__(
+        self,
+        coders: List[str],
+        execute: Callable[[Dict[str, Any], str], Awaitable[str]],
+        ownership: Optional[FileOwnership] = None
+    ):
+        """
+        Initialize dispatcher.
+        
+        Args:
+            coders: Coder names; one item runs per coder at a time
+            execute: async fn(item, coder) -> summary of the work done
+            ownership: Ownership table shared with the coders' tools
+        """
+        if not coders:
+            raise ValueError("At least one coder is required")
+        self.coders = list(coders)
+        self.execute = execute
+        self.ownership = ownership or FileOwnership()
+    
+    async def run(self, items: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """
+        Run all items and wait for them (the join before review).
+        
+        Args:
+            items: Work items (see parse_work_items)
+        
+        Returns:
+            Item id -> {"status": done/failed/skipped/blocked, "coder",
+            "output" or "error", "seconds"}
+        """
+        results: Dict[str, Dict[str, Any]] = {}
+        pending = list(items)
+        idle = list(self.coders)
+        running: Dict[asyncio.Task, tuple] = {}
+        
+        while pending or running:
+            for item in list(pending):
+                deps = [results.get(d) for d in item["depends_on"]]
+                if any(r is not None and r["status"] != "done" for r in deps):
+                    pending.remove(item)
+                    results[item["id"]] = {"status": "skipped", "coder": None, "error": "dependency failed"}
+                    continue
+                if not idle or any(r is None for r in deps):
+                    continue
+                if self.ownership.claim(item["id"], item["files"]):
+                    continue
+                
+                coder = idle.pop(0)
+                pending.remove(item)
+                task = asyncio.ensure_future(self.execute(item, coder))
+                running[task] = (item, coder, time.monotonic())
+            
+            if not running:
+                # Unsatisfiable dependencies (cycle) or claims that never free up
+                for item in pending:
+                    results[item["id"]] = {"status": "blocked", "coder": None, "error": "dependencies never finished"}
+                break
+            
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                item, coder, started = running.pop(task)
+                result = {"coder": coder, "seconds": round(time.monotonic() - started, 3)}
+                if task.exception() is not None:
+                    result.update(status="failed", error=str(task.exception()))
+                else:
+                    result.update(status="done", output=task.result())
+                results[item["id"]] = result
+                self.ownership.release(item["id"])
+                idle.append(coder)
+        
+        return results
+
+
+def join_report(items: List[Dict[str, Any]], results: Dict[str, Dict[str, Any]]) -> str:
+    """
+    Summarize parallel work for the review phase.
+    
+    Args:
+        items: Work items
+        results: ParallelCoders.run() output
+    
+    Returns:
+        Text listing each item, who did it, its outcome and summary
+    """
+    lines = ["Parallel implementation finished:"]
+    for item in items:
+        result = results.get(item["id"], {"status": "unknown"})
+        line = f"- [{result['status']}] {item['id']}: {item['title']}"
+        if result.get("coder"):
+            line += f" (by {result['coder']}, files: {', '.join(item['files']) or 'none planned'})"
+        lines.append(line)
+        detail = result.get("output") or result.get("error")
+        if detail:
+            lines.append("  " + str(detail).strip().replace("\n", "\n  ")[:1500])
+    return "\n".join(lines)
@@ -1,164 +1,646 @@
 """QA loop with structured JSON validation."""
 
-import json
+import asyncio
+import difflib
+import hashlib
+import inspect
+import re
 from typing import Dict, Any, List, Optional, Callable
 
+from core.issue_index import IssueIndex
+from core.json_stream import extract_review, plain_text_review, stream_review
+
 
 class QALoop:
     """Structured QA validation loop."""
     
-    def __init__(self, max_iterations: int = 50):
+    # Issues kept per list in history_summary
+    SUMMARY_ISSUES = 20
+    
+    # Issue text kept per history entry (the full review is only kept for the latest)
+    ISSUE_CHARS = 200
+    
+    def __init__(
+        self,
+        max_iterations: int = 50,
+        incremental: bool = False,
+        recurring_window: int = 3,
+        embedder: Optional[Callable[[List[str]], List[List[float]]]] = None,
+        history_limit: Optional[int] = 20,
+        event_log: Optional[Callable[[Dict[str, Any]], None]] = None
+    ):
         """
         Initialize QA loop.
         
         Args:
             max_iterations: Maximum fix iterations
+            incremental: After the first review, send reviewers the diff
+                since the last reviewed version and the still-open issues
+                (see generate_review_request) instead of the full code, and
+                pass the fixer an excerpt-only fix request
+                (generate_fix_request(incremental=True)) as third argument
+            recurring_window: Stop once an issue (or a rewording of it) is
+                reported in this many consecutive iterations
+            embedder: Optional embedding function for matching reworded
+                issues (see core.issue_index.proxy_embedder); MinHash
+                matching is always used
+            history_limit: Iterations kept in full in history; older ones
+                are folded into history_summary and their memoized reviews
+                dropped (None keeps everything)
+            event_log: Called with every history entry as it is recorded,
+                e.g. lambda event: store.append_event(task_id, event)
         """
         self.max_iterations = max_iterations
+        self.incremental = incremental
+        self.recurring_window = recurring_window
+        self.embedder = embedder
+        self.issue_index = IssueIndex(embedder=embedder)
+        # Cluster id -> iterations of the current run it was reported in
+        self._issue_iterations: Dict[int, List[int]] = {}
+        self.history_limit = history_limit
+        self.event_log = event_log
         self.history: List[Dict[str, Any]] = []
+        self.history_summary = self._empty_summary()
+        self._last_reviewed: Optional[str] = None
+        # Version reviewed before _last_reviewed (its changes are shown to the fixer)
+        self._previous_reviewed: Optional[str] = None
+        self._open_issues: List[str] = []
+        # Parsed reviews by code hash, reused when a version comes back
+        # (dropped with the history entry, see _record)
+        self._reviews: Dict[str, Dict[str, Any]] = {}
+        # Code hash -> first iteration of the current run it was reviewed in
+        self._hash_iterations: Dict[str, int] = {}
+        self._last_hash: Optional[str] = None
     
     def run(
         self,
         reviewer_fn: Callable[[str], str],
         fixer_fn: Callable[[str, List[str]], str],
-        initial_code: str
+        initial_code: str,
+        test_fn: Optional[Callable[[str], Dict[str, Any]]] = None
     ) -> Dict[str, Any]:
         """
         Run QA loop until approved or max iterations.
         
         Args:
             reviewer_fn: Function that reviews code and returns JSON
-            fixer_fn: Function that fixes issues
+            fixer_fn: fn(code, issues) returning fixed code; with
+                incremental, fn(code, issues, fix_request)
             initial_code: Code to review
+            test_fn: Optional test stage run before the reviewer, returning
+                a dict with "passed" and "issues" (e.g. FailFastRunner.run
+                wrapped as lambda code: runner.run()); failures go straight
+                to the fixer and the reviewer only sees code whose tests pass
         
         Returns:
             Result dict with status, iterations, final_code
         """
         current_code = initial_code
         iteration = 0
+        self._start_run()
         
         while iteration < self.max_iterations:
             iteration += 1
             
-            # Get review
-            review_output = reviewer_fn(current_code)
-            review = self._parse_review(review_output)
+            # Get review (memoized: an already reviewed version is not sent again)
+            code_hash = self.code_hash(current_code)
+            review = self._reviews.get(code_hash)
+            cached = review is not None
+            if not cached and test_fn:
+                review = self._test_review(test_fn(current_code))
+            if review is None:
+                review = self._parse_review(reviewer_fn(self._review_input(current_code)))
+            self._reviews[code_hash] = review
             
-            # Log iteration
-            self.history.append({
-                "iteration": iteration,
-                "review": review,
-                "code_length": len(current_code)
-            })
+            result = self._evaluate(iteration, review, current_code, code_hash, cached)
+            if result:
+                return result
             
-            # Check if approved
-            if review.get("approved", False):
-                return {
-                    "status": "approved",
-                    "iterations": iteration,
-                    "final_code": current_code,
-                    "history": self.history
-                }
+            # Fix issues
+            current_code = fixer_fn(*self._fix_args(current_code, review.get("issues", [])))
+        
+        # Max iterations reached
+        return self._result("max_iterations", iteration, current_code)
+    
+    async def run_async(
+        self,
+        reviewers: Dict[str, Callable[[str], Any]],
+        fixer_fn: Callable[[str, List[str]], Any],
+        initial_code: str,
+        quorum: Optional[int] = None,
+        early_exit: bool = False,
+        test_fn: Optional[Callable[[str], Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Run QA loop with several reviewers working concurrently.
+        
+        Each iteration sends the code to all reviewers at once, so it takes
+        as long as the slowest reviewer. Their issue lists are merged and
+        deduplicated. Reviewer and fixer functions may be sync (run in a
+        thread) or async. A reviewer may also return an async iterator of
+        text chunks (streamed model output); it is read only until the
+        first complete review object and then closed.
+        
+        Args:
+            reviewers: Reviewer name -> function returning review JSON
+                (e.g. security, correctness, style; possibly different models)
+            fixer_fn: Function that fixes issues (called as in run)
+            initial_code: Code to review
+            quorum: Approvals needed to approve (default: all reviewers);
+                once reached, reviewers still running are cancelled (a sync
+                reviewer's thread runs to completion, its result is dropped)
+            early_exit: Stop waiting as soon as the quorum can no longer be
+                reached and fix the issues reported so far
+            test_fn: Optional test stage run before the reviewers (see run)
+        
+        Returns:
+            Result dict with status, iterations, final_code; the latest
+            history entry (and every event_log event) also holds the
+            individual reviews under review["reviews"]
+        """
+        quorum = len(reviewers) if quorum is None else quorum
+        current_code = initial_code
+        iteration = 0
+        self._start_run()
+        
+        while iteration < self.max_iterations:
+            iteration += 1
             
-            # Get issues
-            issues = review.get("issues", [])
-            if not issues:
-                # No issues but not approved - treat as approved
-                return {
-                    "status": "approved",
-                    "iterations": iteration,
-                    "final_code": current_code,
-                    "history": self.history
-                }
+            code_hash = self.code_hash(current_code)
+            review = self._reviews.get(code_hash)
+            cached = review is not None
+            if not cached and test_fn:
+                review = self._test_review(await self._call(test_fn, current_code))
+            if review is None:
+                review = await self._review_parallel(
+                    reviewers, self._review_input(current_code), quorum, early_exit
+                )
+            self._reviews[code_hash] = review
             
-            # Check for recurring issues
-            recurring = self._detect_recurring_issues(issues)
-            if recurring:
-                return {
-                    "status": "recurring_issues",
-                    "iterations": iteration,
-                    "final_code": current_code,
-                    "recurring_issues": recurring,
-                    "history": self.history
-                }
+            # The embedder makes blocking requests; keep them off the event loop
+            clusters = await asyncio.to_thread(self._index_issues, iteration, review.get("issues", []))
+            result = self._evaluate(iteration, review, current_code, code_hash, cached, clusters)
+            if result:
+                return result
             
-            # Fix issues
-            current_code = fixer_fn(current_code, issues)
+            current_code = await self._call(fixer_fn, *self._fix_args(current_code, review["issues"]))
         
-        # Max iterations reached
+        return self._result("max_iterations", iteration, current_code)
+    
+    @staticmethod
+    def code_hash(code: str) -> str:
+        """SHA-256 of a code version (key for memoized reviews)."""
+        return hashlib.sha256(code.encode("utf-8")).hexdigest()
+    
+    def _start_run(self):
+        """Reset per-run state (history is kept across runs)."""
+        self._last_reviewed = None
+        self._previous_reviewed = None
+        self._open_issues = []
+        self._reviews = {}
+        self._hash_iterations = {}
+        self._last_hash = None
+        self.issue_index = IssueIndex(embedder=self.embedder)
+        self._issue_iterations = {}
+    
+    @staticmethod
+    def _test_review(test_result: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Turn failed tests into a review for the fixer (None if they passed)."""
+        if test_result.get("passed"):
+            return None
         return {
-            "status": "max_iterations",
+            "approved": False,
+            "issues": test_result.get("issues") or ["Tests failed"],
+            "stage": "tests",
+            "tests": test_result
+        }
+    
+    @staticmethod
+    async def _call(fn: Callable, *args) -> Any:
+        """Await fn if it is async, otherwise run it in a worker thread."""
+        if inspect.iscoroutinefunction(fn):
+            return await fn(*args)
+        result = await asyncio.to_thread(fn, *args)
+        if inspect.isawaitable(result):
+            result = await result
+        return result
+    
+    async def _review_parallel(
+        self,
+        reviewers: Dict[str, Callable[[str], Any]],
+        code: str,
+        quorum: int,
+        early_exit: bool
+    ) -> Dict[str, Any]:
+        """
+        Run all reviewers concurrently and merge their reviews.
+        
+        A reviewer that raises doesn't abort the iteration: it counts as
+        not approving, with the error as its issue.
+        
+        Returns:
+            Merged review: approved, deduplicated issues, per-reviewer
+            reviews and the names of reviewers cancelled by an early decision
+        """
+        tasks = {
+            asyncio.ensure_future(self._review_one(fn, code)): name
+            for name, fn in reviewers.items()
+        }
+        reviews: Dict[str, Dict[str, Any]] = {}
+        approvals = rejections = 0
+        pending = set(tasks)
+        
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    error = task.exception()
+                    review = self._failed_review(tasks[task], error) if error else task.result()
+                    reviews[tasks[task]] = review
+                    if review.get("approved", False) or not review.get("issues"):
+                        approvals += 1
+                    else:
+                        rejections += 1
+                
+                if approvals >= quorum:
+                    break
+                if early_exit and rejections > len(reviewers) - quorum:
+                    break
+        finally:
+            for task in pending:
+                task.cancel()
+        
+        issues = self._merge_issues([
+            reviews[name].get("issues", [])
+            for name in reviewers if name in reviews and not reviews[name].get("approved", False)
+        ])
+        return {
+            "approved": approvals >= quorum,
+            "issues": issues,
+            "reviews": reviews,
+            "cancelled": [tasks[task] for task in pending]
+        }
+    
+    @staticmethod
+    def _failed_review(name: str, error: BaseException) -> Dict[str, Any]:
+        """Non-approving review standing in for a reviewer that raised."""
+        return {
+            "approved": False,
+            "issues": [f"Reviewer {name} failed: {type(error).__name__}: {error}"],
+            "error": str(error)
+        }
+    
+    async def _review_one(self, fn: Callable[[str], Any], code: str) -> Dict[str, Any]:
+        """Run one reviewer and parse its (possibly streamed) output."""
+        output = await self._call(fn, code)
+        if hasattr(output, "__aiter__"):
+            return await stream_review(output)
+        return self._parse_review(output)
+    
+    @staticmethod
+    def _merge_issues(issue_lists: List[List[str]]) -> List[str]:
+        """
+        Merge issue lists, dropping duplicates.
+        
+        Issues are compared case-insensitively, ignoring whitespace and
+        trailing punctuation; the first wording is kept.
+        
+        Args:
+            issue_lists: One list of issues per reviewer
+        
+        Returns:
+            Merged issues in first-seen order
+        """
+        merged = {}
+        for issues in issue_lists:
+            for issue in issues:
+                key = re.sub(r"\s+", " ", str(issue)).strip().rstrip(".!;:").lower()
+                merged.setdefault(key, issue)
+        return list(merged.values())
+    
+    def _evaluate(
+        self,
+        iteration: int,
+        review: Dict[str, Any],
+        code: str,
+        code_hash: str,
+        cached: bool = False,
+        clusters: Optional[List[int]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Log review and decide whether the loop ends.
+        
+        Args:
+            iteration: Iteration number
+            review: Parsed review
+            code: Reviewed code
+            code_hash: Hash of code
+            cached: Review was memoized from an earlier identical version
+            clusters: Issue cluster ids from _index_issues, if already
+                indexed (default: index the review's issues here)
+        
+        Returns:
+            Final result dict, or None to continue with a fix
+        """
+        # A -> B -> A: the fixer went back to a version already reviewed
+        # (an unchanged version, A -> A, is left to recurring issue detection)
+        cycle_to = self._hash_iterations.get(code_hash) if self._last_hash != code_hash else None
+        self._hash_iterations.setdefault(code_hash, iteration)
+        self._last_hash = code_hash
+        
+        if clusters is None:
+            clusters = self._index_issues(iteration, review.get("issues", []))
+        
+        self._record({
+            "iteration": iteration,
+            "code_hash": code_hash,
+            "approved": bool(review.get("approved", False)),
+            "stage": review.get("stage", "review"),
+            "issues": [str(issue)[:self.ISSUE_CHARS] for issue in review.get("issues", [])],
+            "review": review,
+            "cached": cached,
+            "code_length": len(code),
+            # Issues (possibly reworded) already reported last iteration:
+            # an early sign the fixer is stuck on them
+            "repeated_issues": [
+                issue for issue, cluster in zip(review.get("issues", []), clusters)
+                if iteration - 1 in self._issue_iterations[cluster]
+            ]
+        })
+        if review.get("stage") != "tests":
+            # Incremental reviews diff against what the reviewer last saw
+            self._previous_reviewed = self._last_reviewed
+            self._last_reviewed = code
+            self._open_issues = review.get("issues", [])
+        
+        if cycle_to is not None and not review.get("approved", False) and review.get("issues"):
+            return self._result("oscillating", iteration, code, cycle_start=cycle_to)
+        
+        # Check if approved
+        if review.get("approved", False):
+            return self._result("approved", iteration, code)
+        
+        # Get issues
+        issues = review.get("issues", [])
+        if not issues:
+            # No issues but not approved - treat as approved
+            return self._result("approved", iteration, code)
+        
+        # Check for recurring issues
+        recurring = self._detect_recurring_issues(issues, clusters, iteration)
+        if recurring:
+            return self._result("recurring_issues", iteration, code, recurring_issues=recurring)
+        
+        return None
+    
+    @staticmethod
+    def _empty_summary() -> Dict[str, Any]:
+        """Roll-up of iterations dropped from history."""
+        return {
+            "iterations": 0,
+            "first_iteration": None,
+            "last_iteration": None,
+            "test_failures": 0,
+            "cached_reviews": 0,
+            "issues_reported": 0,
+            "issue_counts": {},
+            "open_issues": [],
+            "resolved_issues": [],
+            "resolved_total": 0
+        }
+    
+    def _record(self, entry: Dict[str, Any]):
+        """
+        Append a history entry, spill it to the event log and compact.
+        
+        Entries hold the code hash and a short issue summary; the full
+        review (raw output, per-reviewer reviews, test output) is kept
+        only on the latest entry and in the event log.
+        """
+        if self.history:
+            self.history[-1].pop("review", None)
+        self.history.append(entry)
+        if self.event_log:
+            self.event_log({"type": "qa_iteration", **entry})
+        
+        if self.history_limit is not None and len(self.history) > self.history_limit:
+            overflow = len(self.history) - self.history_limit
+            kept = {h["code_hash"] for h in self.history[overflow:]}
+            for old in self.history[:overflow]:
+                self._summarize(old)
+                # Memoized reviews live as long as their entries; cycle detection
+                # only needs _hash_iterations
+                if old["code_hash"] not in kept:
+                    self._reviews.pop(old["code_hash"], None)
+            del self.history[:overflow]
+    
+    def _summarize(self, entry: Dict[str, Any]):
+        """
+        Fold a history entry into history_summary.
+        
+        The summary has a fixed size: issue lists keep the SUMMARY_ISSUES
+        most frequent (counts) or most recent (resolved) issues.
+        """
+        summary = self.history_summary
+        issues = entry["issues"]
+        
+        summary["iterations"] += 1
+        if summary["first_iteration"] is None:
+            summary["first_iteration"] = entry["iteration"]
+        summary["last_iteration"] = entry["iteration"]
+        summary["test_failures"] += entry["stage"] == "tests"
+        summary["cached_reviews"] += bool(entry.get("cached"))
+        summary["issues_reported"] += len(issues)
+        
+        counts = summary["issue_counts"]
+        for issue in issues:
+            counts[issue] = counts.get(issue, 0) + 1
+        if len(counts) > self.SUMMARY_ISSUES:
+            # Keep the most frequent, most recent first on ties
+            ranked = sorted(counts.items(), key=lambda item: (-item[1], item[0] not in issues))
+            summary["issue_counts"] = dict(ranked[:self.SUMMARY_ISSUES])
+        
+        resolved = [issue for issue in summary["open_issues"] if issue not in issues]
+        summary["resolved_total"] += len(resolved)
+        summary["resolved_issues"] = (
+            [issue for issue in summary["resolved_issues"] if issue not in issues] + resolved
+        )[-self.SUMMARY_ISSUES:]
+        summary["open_issues"] = issues[:self.SUMMARY_ISSUES]
+    
+    def _result(self, status: str, iteration: int, code: str, **extra) -> Dict[str, Any]:
+        """Build result dict."""
+        result = {
+            "status": status,
             "iterations": iteration,
-            "final_code": current_code,
-            "history": self.history
+            "final_code": code,
+            "history": self.history,
+            "history_summary": self.history_summary
         }
+        result.update(extra)
+        return result
     
     def _parse_review(self, review_output: str) -> Dict[str, Any]:
         """
         Parse reviewer output as JSON.
         
+        The first top-level object matching the review schema is used, so
+        braces in surrounding prose don't break parsing. Output without one
+        only counts as approved for an un-negated "approved" verdict.
+        
         Args:
             review_output: Raw reviewer output
         
         Returns:
             Parsed review dict
         """
-        try:
-            # Try to extract JSON from output
-            start = review_output.find("{")
-            end = review_output.rfind("}") + 1
-            
-            if start >= 0 and end > start:
-                json_str = review_output[start:end]
-                return json.loads(json_str)
-            
-            # Fallback: treat as plain text
-            return {
-                "approved": "APPROVED" in review_output.upper(),
-                "issues": [],
-                "raw_output": review_output
-            }
-        except json.JSONDecodeError:
-            # Fallback for invalid JSON
-            return {
-                "approved": "APPROVED" in review_output.upper(),
-                "issues": [],
-                "raw_output": review_output
-            }
-    
-    def _detect_recurring_issues(self, current_issues: List[str]) -> Optional[List[str]]:
-        """
-        Detect recurring issues (exact match).
+        review = extract_review(review_output)
+        if review is None:
+            return plain_text_review(review_output)
+        return review
+    
+    def _index_issues(self, iteration: int, issues: List[str]) -> List[int]:
+        """Add an iteration's issues to the index and return their cluster ids."""
+        clusters = self.issue_index.add_many([str(issue) for issue in issues])
+        keep = max(self.recurring_window, 2)
+        for cluster in set(clusters):
+            iterations = self._issue_iterations.setdefault(cluster, [])
+            iterations.append(iteration)
+            del iterations[:-keep]
+        return clusters
+    
+    def _detect_recurring_issues(
+        self,
+        current_issues: List[str],
+        clusters: List[int],
+        iteration: int
+    ) -> Optional[List[str]]:
+        """
+        Detect recurring issues (normalized/near-duplicate match).
+        
+        Each issue's cluster records the iterations it was reported in, so
+        the check costs one lookup per current issue however long the
+        history is.
         
         Args:
             current_issues: Current iteration issues
+            clusters: Cluster id of each current issue
+            iteration: Current iteration number
         
         Returns:
-            List of recurring issues or None
+            List of recurring issues (current wording) or None
         """
-        if len(self.history) < 3:
+        if iteration < self.recurring_window:
             return None
         
-        # Check last 3 iterations
-        recent_issues = [
-            set(h["review"].get("issues", []))
-            for h in self.history[-3:]
+        window = list(range(iteration - self.recurring_window + 1, iteration + 1))
+        recurring = [
+            issue for issue, cluster in zip(current_issues, clusters)
+            if self._issue_iterations[cluster][-self.recurring_window:] == window
         ]
         
-        # Find issues that appear in all recent iterations
-        recurring = set(current_issues)
-        for issue_set in recent_issues:
-            recurring &= issue_set
+        return recurring or None
+    
+    def _review_input(self, code: str) -> str:
+        """Full code on the first review, a review request with the diff after that."""
+        if not self.incremental or self._last_reviewed is None:
+            return code
+        return self.generate_review_request(code, self._last_reviewed, self._open_issues)
+    
+    def _fix_args(self, code: str, issues: List[str]) -> tuple:
+        """Fixer arguments: code and issues, plus the excerpt fix request when incremental."""
+        if not self.incremental:
+            return code, issues
+        return code, issues, self.generate_fix_request(
+            code, issues, incremental=True, previous_code=self._previous_reviewed
+        )
+    
+    @staticmethod
+    def _diff(old: str, new: str, context: int = 3) -> str:
+        """Unified diff between two versions of the code."""
+        return "".join(difflib.unified_diff(
+            old.splitlines(keepends=True),
+            new.splitlines(keepends=True),
+            "reviewed", "current", n=context
+        ))
+    
+    def generate_review_request(self, code: str, previous_code: str, open_issues: List[str]) -> str:
+        """
+        Generate incremental review prompt.
+        
+        Args:
+            code: Current code
+            previous_code: Last reviewed version
+            open_issues: Issues reported on that version
+        
+        Returns:
+            Review prompt with the still-open issues and the diff since the
+            last review
+        """
+        prompt = "Re-review the code after changes.\n\n"
+        
+        if open_issues:
+            prompt += "Issues from your last review:\n"
+            for i, issue in enumerate(open_issues, 1):
+                prompt += f"{i}. {issue}\n"
+            prompt += "\n"
+        
+        diff = self._diff(previous_code, code)
+        prompt += f"Changes since your last review:\n```diff\n{diff or '(no changes)'}\n```\n"
+        prompt += (
+            "\nCheck whether the issues are resolved and whether the changes "
+            "introduce new problems. Respond with JSON "
+            '{"approved": true/false, "issues": [...]} listing every issue that remains.'
+        )
         
-        return list(recurring) if recurring else None
+        return prompt
     
-    def generate_fix_request(self, code: str, issues: List[str]) -> str:
+    def _relevant_lines(self, code: str, issues: List[str], previous_code: Optional[str]) -> List[int]:
+        """0-based line numbers issues point at: explicit line numbers, quoted names, changed lines."""
+        lines = code.splitlines()
+        relevant = set()
+        
+        for issue in issues:
+            issue = str(issue)
+            # "line 12", "lines 3-5" or "app.py:12" (not times like 10:30 or ports like :8080)
+            for match in re.finditer(r"\blines?\s+(\d+)(?:\s*[-\u2013]\s*(\d+))?|\S+\.\w+:(\d+)\b", issue, re.IGNORECASE):
+                start = int(match.group(1) or match.group(3))
+                end = int(match.group(2) or start)
+                relevant.update(range(start - 1, min(end, len(lines))))
+            
+            names = re.findall(r"[`'\"]([A-Za-z_][\w.]*)\(?\)?[`'\"]|\b([A-Za-z_]\w*)\(\)", issue)
+            for name in {a or b for a, b in names}:
+                pattern = re.compile(rf"\b{re.escape(name.split('.')[-1])}\b")
+                hits = [i for i, line in enumerate(lines) if pattern.search(line)]
+                relevant.update(hits[:3])
+        
+        if previous_code is not None:
+            matcher = difflib.SequenceMatcher(None, previous_code.splitlines(), lines, autojunk=False)
+            for tag, _, _, j1, j2 in matcher.get_opcodes():
+                if tag != "equal":
+                    relevant.update(range(j1, max(j2, j1 + 1)))
+        
+        return sorted(i for i in relevant if 0 <= i < len(lines))
+    
+    def generate_fix_request(
+        self,
+        code: str,
+        issues: List[str],
+        incremental: bool = False,
+        previous_code: Optional[str] = None,
+        context: int = 5
+    ) -> str:
         """
         Generate fix request prompt for coder.
         
         Args:
             code: Current code
             issues: List of issues to fix
+            incremental: Include only excerpts around the lines the issues
+                refer to (line numbers, quoted names, lines changed since
+                previous_code) instead of the whole code; falls back to the
+                whole code if nothing can be located
+            previous_code: Last reviewed version, to include recent changes
+            context: Lines of context around each excerpt
         
         Returns:
             Fix request prompt
@@ -169,6 +651,30 @@ class QALoop:
             prompt += f"{i}. {issue}\n"
         
         prompt += "\nPlease fix these issues in the code.\n"
-        prompt += f"\nCurrent code:\n```\n{code}\n```"
+        
+        relevant = self._relevant_lines(code, issues, previous_code) if incremental else []
+        if not relevant:
+            prompt += f"\nCurrent code:\n```\n{code}\n```"
+            return prompt
+        
+        lines = code.splitlines()
+        ranges: List[List[int]] = []
+        for i in relevant:
+            start, end = max(i - context, 0), min(i + context, len(lines) - 1)
+            if ranges and start <= ranges[-1][1] + 1:
+                ranges[-1][1] = max(ranges[-1][1], end)
+            else:
+                ranges.append([start, end])
+        
+        width = len(str(len(lines)))
+        excerpts = []
+        for start, end in ranges:
+            excerpts.append("\n".join(
+                f"{n + 1:>{width}} | {lines[n]}" for n in range(start, end + 1)
+            ))
+        
+        prompt += f"\nRelevant excerpts ({len(lines)} lines total):\n```\n"
+        prompt += "\n...\n".join(excerpts)
+        prompt += "\n```"
         
         return prompt
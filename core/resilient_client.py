@@ -156,6 +156,62 @@ class ResilientClient:
         # Если дошли сюда, значит все попытки исчерпаны
         raise last_error
 
+    async def create_stream(self, *args, **kwargs):
+        """
+        Стриминговый запрос с fallback на резервные модели.
+        
+        Переключение возможно только до первого чанка: после него ошибка
+        пробрасывается, чтобы не склеивать ответы разных моделей. Закрытие
+        генератора (aclose) прерывает генерацию на стороне модели.
+        """
+        last_error = None
+        
+        for attempt in range(self.max_retries):
+            current_model = self._get_current_model()
+            client = OpenAIChatCompletionClient(
+                model=current_model,
+                base_url=self.base_url,
+                api_key=self.api_key,
+                model_capabilities={
+                    "vision": False,
+                    "function_calling": True,
+                    "json_output": True
+                }
+            )
+            stream = client.create_stream(*args, **kwargs)
+            
+            try:
+                first = await stream.__anext__()
+            except StopAsyncIteration:
+                return
+            except Exception as e:
+                error_str = str(e)
+                last_error = e
+                logger.warning(f"❌ Model {current_model} failed: {error_str[:100]}")
+                
+                is_rate_limit = "429" in error_str or "rate_limit" in error_str.lower()
+                is_server_error = "500" in error_str or "internal" in error_str.lower()
+                is_auth_error = "auth" in error_str.lower() or "401" in error_str or "403" in error_str
+                
+                if is_auth_error or is_rate_limit or is_server_error:
+                    if not self._switch_to_next_model():
+                        logger.error(f"All fallback models failed for tier '{self.model_tier}'")
+                        raise Exception(f"All models failed. Last error: {error_str}") from e
+                    continue
+                # Неподдерживаемый режим (например, structured output) - сразу наверх,
+                # вызывающий код сам выберет режим попроще
+                raise
+            
+            try:
+                yield first
+                async for chunk in stream:
+                    yield chunk
+            finally:
+                await stream.aclose()
+            return
+        
+        raise last_error
+
 def create_resilient_client(role: str, base_url: str, api_key: str) -> ResilientClient:
     """
     Фабрика для создания resilient клиентов по роли
@@ -167,7 +223,9 @@ def create_resilient_client(role: str, base_url: str, api_key: str) -> Resilient
         "manager": "standard",
         "coder_frontend": "fast",
         "coder_backend": "fast",
-        "tester": "standard"
+        "tester": "standard",
+        "selector": "fast",
+        "summarizer": "fast"
     }
     
     tier = tier_map.get(role, "standard")
@@ -1,9 +1,19 @@
 """Safe shell command runner with security policies."""
 
+import json
+import os
 import subprocess
 import re
+import sys
+import time
+from datetime import datetime
 from pathlib import Path
-from typing import Optional, List
+from typing import Optional, List, Dict, Any
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
 
 
 class SecurityError(Exception):
@@ -11,6 +21,23 @@ class SecurityError(Exception):
     pass
 
 
+class _RusagePopen(subprocess.Popen):
+    """Popen that reaps the child with wait4() to capture its resource usage."""
+    
+    rusage = None
+    
+    def _try_wait(self, wait_flags):
+        if not hasattr(os, "wait4"):
+            return super()._try_wait(wait_flags)
+        try:
+            pid, sts, usage = os.wait4(self.pid, wait_flags)
+        except ChildProcessError:
+            return (self.pid, 0)
+        if pid == self.pid:
+            self.rusage = usage
+        return (pid, sts)
+
+
 class ShellRunner:
     """Execute shell commands with security validation."""
     
@@ -41,17 +68,27 @@ class ShellRunner:
         r":\(\)\{.*\}",  # fork bomb
     ]
     
-    def __init__(self, allowed_cwd: Optional[Path] = None, log_dir: Optional[Path] = None):
+    def __init__(
+        self,
+        allowed_cwd: Optional[Path] = None,
+        log_dir: Optional[Path] = None,
+        task_id: Optional[str] = None,
+        phase: Optional[str] = None
+    ):
         """
         Initialize shell runner.
         
         Args:
             allowed_cwd: Restrict commands to this directory
             log_dir: Directory for command logs
+            task_id: Task identifier recorded with every command
+            phase: Current task phase recorded with every command
         """
         self.allowed_cwd = Path(allowed_cwd) if allowed_cwd else None
         self.log_dir = Path(log_dir) if log_dir else Path(".multiagent/logs")
         self.log_dir.mkdir(parents=True, exist_ok=True)
+        self.task_id = task_id
+        self.phase = phase
     
     def validate_command(self, command: str) -> None:
         """
@@ -84,16 +121,21 @@ class ShellRunner:
         command: str,
         cwd: Optional[Path] = None,
         timeout: int = 300,
-        capture_output: bool = True
+        capture_output: bool = True,
+        phase: Optional[str] = None
     ) -> subprocess.CompletedProcess:
         """
         Run shell command with validation.
         
+        Wall time, CPU time, max RSS, exit code and output size are
+        appended to the structured command log (shell_commands.jsonl).
+        
         Args:
             command: Shell command to run
             cwd: Working directory (must be within allowed_cwd)
             timeout: Command timeout in seconds
             capture_output: If True, capture stdout/stderr
+            phase: Task phase for this command (default: self.phase)
         
         Returns:
             CompletedProcess with result
@@ -114,20 +156,91 @@ class ShellRunner:
                     raise SecurityError(f"cwd outside allowed directory: {cwd}")
         
         # Run command
-        result = subprocess.run(
+        pipe = subprocess.PIPE if capture_output else None
+        children_before = self._children_usage()
+        started = time.monotonic()
+        
+        with _RusagePopen(
             command,
             shell=True,
             cwd=cwd,
-            timeout=timeout,
-            capture_output=capture_output,
+            stdout=pipe,
+            stderr=pipe,
             text=True
-        )
+        ) as process:
+            try:
+                stdout, stderr = process.communicate(timeout=timeout)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                stdout, stderr = process.communicate()
+                self._record_usage(
+                    command, cwd, phase, process, started, children_before,
+                    stdout, stderr, timed_out=True
+                )
+                raise subprocess.TimeoutExpired(
+                    command, timeout, output=stdout, stderr=stderr
+                )
+        
+        result = subprocess.CompletedProcess(command, process.returncode, stdout, stderr)
         
         # Log output
         self._log_command(command, result)
+        self._record_usage(command, cwd, phase, process, started, children_before, stdout, stderr)
         
         return result
     
+    @staticmethod
+    def _children_usage():
+        """Snapshot cumulative usage of reaped children (fallback when wait4 is missing)."""
+        if resource is None:
+            return None
+        return resource.getrusage(resource.RUSAGE_CHILDREN)
+    
+    def _record_usage(
+        self,
+        command: str,
+        cwd: Optional[Path],
+        phase: Optional[str],
+        process: _RusagePopen,
+        started: float,
+        children_before,
+        stdout: Optional[str],
+        stderr: Optional[str],
+        timed_out: bool = False
+    ):
+        """Append resource accounting for one command to the structured log."""
+        record: Dict[str, Any] = {
+            "timestamp": datetime.now().isoformat(),
+            "task_id": self.task_id,
+            "phase": phase or self.phase,
+            "command": command,
+            "cwd": str(cwd) if cwd else None,
+            "wall_time": round(time.monotonic() - started, 6),
+            "user_time": None,
+            "sys_time": None,
+            "max_rss_kb": None,
+            "returncode": process.returncode,
+            "stdout_bytes": len(stdout.encode("utf-8", "replace")) if stdout else 0,
+            "stderr_bytes": len(stderr.encode("utf-8", "replace")) if stderr else 0,
+            "timed_out": timed_out,
+        }
+        
+        usage = process.rusage
+        if usage is not None:
+            record["user_time"] = round(usage.ru_utime, 6)
+            record["sys_time"] = round(usage.ru_stime, 6)
+            # ru_maxrss is reported in bytes on macOS and in kilobytes elsewhere
+            max_rss = usage.ru_maxrss // 1024 if sys.platform == "darwin" else usage.ru_maxrss
+            record["max_rss_kb"] = max_rss
+        elif children_before is not None:
+            # Concurrent commands can blur this delta; max RSS is not recoverable
+            after = resource.getrusage(resource.RUSAGE_CHILDREN)
+            record["user_time"] = round(after.ru_utime - children_before.ru_utime, 6)
+            record["sys_time"] = round(after.ru_stime - children_before.ru_stime, 6)
+        
+        with open(self.log_dir / "shell_commands.jsonl", "a") as f:
+            f.write(json.dumps(record) + "\n")
+    
     def _log_command(self, command: str, result: subprocess.CompletedProcess):
         """Log command execution."""
         log_file = self.log_dir / "shell_commands.log"
@@ -0,0 +1,155 @@
+"""Rule-based speaker selection for SelectorGroupChat."""
+
+import re
+from typing import Any, Dict, List, Optional, Sequence
+
+# A coder reporting its work finished
+DONE_PATTERN = re.compile(
+    r"\b(done|finished|completed?|implemented|ready for review|please review)\b",
+    re.IGNORECASE
+)
+NOT_DONE_PATTERN = re.compile(r"\bnot (yet )?(done|finished|complete|implemented|ready)\b", re.IGNORECASE)
+
+# Messages carrying a tool result back to the agent that called the tool
+TOOL_RESULT_TYPES = ("ToolCallSummaryMessage", "ToolCallExecutionEvent")
+
+
+class RuleSelector:
+    """
+    Deterministic speaker transitions, used as SelectorGroupChat's selector_func.
+    
+    Decides the usual turns without a model call:
+    
+    - task from the user -> architect
+    - tool result -> the agent that called the tool
+    - architect -> a coder (the one named in the message, else the next
+      in turn)
+    - coder reporting done -> reviewer
+    - reviewer asking for fixes -> the coder named, else the last coder
+    
+    Anything else returns None and SelectorGroupChat falls back to its model
+    (which can then be a cheap one). stats counts both outcomes.
+    """
+    
+    def __init__(
+        self,
+        architect: str = "architect",
+        coders: Sequence[str] = ("frontend_dev", "backend_dev"),
+        reviewer: str = "senior_reviewer",
+        approval: str = "APPROVED"
+    ):
+        """
+        Initialize rule selector.
+        
+        Args:
+            architect: Architect agent name
+            coders: Coder agent names, in turn order
+            reviewer: Reviewer agent name
+            approval: Word with which the reviewer approves
+        """
+        self.architect = architect
+        self.coders = list(coders)
+        self.reviewer = reviewer
+        self.approval = approval
+        self._next_coder = 0
+        self._last_coder: Optional[str] = None
+        self.stats: Dict[str, Any] = {"rule": 0, "fallback": 0, "rules": {}}
+    
+    @staticmethod
+    def _text(message: Any) -> str:
+        """Message content as text."""
+        content = getattr(message, "content", "")
+        return content if isinstance(content, str) else str(content)
+    
+    def _mentioned_coder(self, text: str) -> Optional[str]:
+        """The single coder named in text (by name or its first part, e.g. "frontend")."""
+        lowered = text.lower()
+        named = [
+            coder for coder in self.coders
+            if coder.lower() in lowered or re.search(rf"\b{re.escape(coder.split('_')[0].lower())}\b", lowered)
+        ]
+        return named[0] if len(named) == 1 else None
+    
+    def _take_turn(self) -> str:
+        """Next coder in turn."""
+        coder = self.coders[self._next_coder % len(self.coders)]
+        self._next_coder += 1
+        return coder
+    
+    def _rule(self, messages: Sequence[Any]) -> Optional[tuple]:
+        """(rule name, speaker) for the last message, or None if ambiguous."""
+        if not messages:
+            return None
+        
+        last = messages[-1]
+        source = getattr(last, "source", None)
+        text = self._text(last)
+        
+        if source in self.coders:
+            self._last_coder = source
+        
+        if type(last).__name__ in TOOL_RESULT_TYPES and source != "user":
+            return "tool_result", source
+        
+        if source == "user" and len(messages) == 1:
+            return "task", self.architect
+        
+        if source == self.architect and self.coders:
+            coder = self._mentioned_coder(text) or self._take_turn()
+            return "architect_to_coder", coder
+        
+        if source in self.coders and DONE_PATTERN.search(text) and not NOT_DONE_PATTERN.search(text):
+            return "coder_done", self.reviewer
+        
+        if source == self.reviewer and self.approval not in text.upper():
+            coder = self._mentioned_coder(text) or self._last_coder
+            if coder:
+                return "review_to_coder", coder
+        
+        return None
+    
+    def __call__(self, messages: Sequence[Any]) -> Optional[str]:
+        """
+        Pick the next speaker.
+        
+        Args:
+            messages: Conversation so far
+        
+        Returns:
+            Agent name, or None to let the selector model decide
+        """
+        decision = self._rule(messages)
+        if decision is None:
+            self.stats["fallback"] += 1
+            return None
+        
+        name, speaker = decision
+        self.stats["rule"] += 1
+        self.stats["rules"][name] = self.stats["rules"].get(name, 0) + 1
+        return speaker
+    
+    def report(self) -> str:
+        """One-line summary of selector calls saved."""
+        total = self.stats["rule"] + self.stats["fallback"]
+        rules = ", ".join(f"{name}={count}" for name, count in sorted(self.stats["rules"].items()))
+        return (
+            f"{self.stats['rule']}/{total} turns chosen by rules ({rules or 'none'}), "
+            f"{self.stats['fallback']} selector model calls, {self.stats['rule']} saved"
+        )
+    
+    @classmethod
+    def for_agents(cls, agents: List[Any]) -> "RuleSelector":
+        """
+        Build rules from the registry's agent names.
+        
+        Args:
+            agents: Team participants (names as created by AgentRegistry)
+        
+        Returns:
+            RuleSelector with architect, coders and reviewer filled in
+        """
+        names = [agent.name for agent in agents]
+        reviewer = next((n for n in names if "reviewer" in n), "senior_reviewer")
+        architect = next((n for n in names if "architect" in n), "architect")
+        coders = [n for n in names if n.endswith("_dev") or "coder" in n]
+        return cls(architect=architect, coders=coders, reviewer=reviewer)
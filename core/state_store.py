@@ -1,11 +1,14 @@
 """State persistence with atomic writes."""
 
 import json
+import logging
 import os
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from datetime import datetime
 
+logger = logging.getLogger(__name__)
+
 
 class StateStore:
     """Manage task state with atomic writes."""
@@ -68,10 +71,60 @@ class StateStore:
         return (self.state_dir / f"{task_id}.json").exists()
     
     def delete(self, task_id: str):
-        """Delete state file."""
-        state_file = self.state_dir / f"{task_id}.json"
-        if state_file.exists():
-            state_file.unlink()
+        """Delete state file and event log."""
+        for path in (self.state_dir / f"{task_id}.json", self.state_dir / f"{task_id}.events.jsonl"):
+            if path.exists():
+                path.unlink()
+    
+    def append_event(self, task_id: str, event: Dict[str, Any]):
+        """
+        Append an event to the task's event log (<task_id>.events.jsonl).
+        
+        Unlike save(), this never rewrites earlier data, so it suits
+        records that only grow, such as QA iterations.
+        
+        Args:
+            task_id: Task identifier
+            event: JSON-serializable event
+        """
+        record = {"timestamp": datetime.now().isoformat(), **event}
+        line = (json.dumps(record) + "\n").encode("utf-8")
+        with open(self.state_dir / f"{task_id}.events.jsonl", "ab+") as f:
+            # A write cut short by a crash leaves no newline; start a new line
+            # so the next event isn't glued to the partial one
+            if f.seek(0, os.SEEK_END) > 0:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    line = b"\n" + line
+            f.write(line)
+    
+    def load_events(self, task_id: str) -> List[Dict[str, Any]]:
+        """
+        Load the task's event log.
+        
+        Args:
+            task_id: Task identifier
+        
+        Lines that don't decode (an append cut short by a crash) are
+        skipped with a warning.
+        
+        Returns:
+            Events in the order they were appended
+        """
+        events_file = self.state_dir / f"{task_id}.events.jsonl"
+        if not events_file.exists():
+            return []
+        
+        events = []
+        with open(events_file, encoding="utf-8", errors="replace") as f:
+            for number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    events.append(json.loads(line))
+                except json.JSONDecodeError:
+                    logger.warning(f"Skipping truncated event in {events_file} line {number}")
+        return events
     
     def list_tasks(self) -> list:
         """List all task IDs."""
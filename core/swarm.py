@@ -1,20 +1,46 @@
 ﻿import asyncio
-from typing import List, Any
+import logging
+from typing import List, Any, Optional, Callable
 from autogen_agentchat.teams import SelectorGroupChat
 from autogen_agentchat.conditions import MaxMessageTermination
+from core.speaker_rules import RuleSelector
+from core.parallel_coders import (
+    PLAN_PROMPT, ITEM_PROMPT, FileOwnership, ParallelCoders, join_report, owned_tools, parse_work_items
+)
+
+logger = logging.getLogger(__name__)
+
 
 class SwarmTeam:
-    def __init__(self, selector_model: Any):
+    def __init__(self, selector_model: Any, use_rules: bool = True):
+        # selector_model решает только неоднозначные ходы, остальные - RuleSelector
         self.selector_model = selector_model
+        self.use_rules = use_rules
+        self.rules: Optional[RuleSelector] = None
+        # Сколько раз execute_parallel не получил план и ушел в последовательный режим
+        self.plan_fallbacks = 0
 
     async def execute_task(self, task: str, agents: List[Any], max_steps: int = 200):
+        """
+        Run the agents as one selector group chat until the reviewer approves.
+        
+        Args:
+            task: Task for the team
+            agents: Participants (RuleSelector picks most speakers)
+            max_steps: Message limit
+        
+        Returns:
+            Completion message
+        """
         # Используем только MaxMessageTermination, проверку APPROVED делаем вручную
         termination = MaxMessageTermination(max_steps)
+        self.rules = RuleSelector.for_agents(agents) if self.use_rules else None
         
         team = SelectorGroupChat(
             participants=agents,
             model_client=self.selector_model,
-            termination_condition=termination
+            termination_condition=termination,
+            selector_func=self.rules
         )
 
         print(f"\n[SWARM] Starting task (max {max_steps} steps)...")
@@ -45,4 +71,80 @@ class SwarmTeam:
             traceback.print_exc()
             
         print(f"\n[SWARM] Total messages: {message_count}")
+        if self.rules:
+            print(f"[SWARM] Speaker selection: {self.rules.report()}")
         return "Task execution finished."
+
+    async def execute_parallel(
+        self,
+        task: str,
+        planner: Any,
+        coder_names: List[str],
+        coder_factory: Callable[[str, list], Any],
+        workspace: Any,
+        agents: List[Any],
+        max_steps: int = 200
+    ):
+        """
+        Plan work items, implement them with parallel coders, then review.
+        
+        Falls back to execute_task (counted in plan_fallbacks) when the
+        planner's reply contains no plan.
+        
+        Args:
+            task: Task for the team
+            planner: Tool-less agent whose final message is the plan JSON
+                (AgentRegistry.create_planner)
+            coder_names: Coders that run work items concurrently
+            coder_factory: fn(name, tools) -> fresh coder agent
+            workspace: tools.file_ops.Workspace the coders write to
+            agents: Participants of the join/review swarm
+            max_steps: Message limit of each swarm run
+        
+        Returns:
+            Completion message of the review swarm
+        """
+        # 1. Планировщик без инструментов делит задачу на независимые work items:
+        # с инструментами run заканчивается сводкой вызовов, а записи идут мимо FileOwnership
+        plan = await planner.run(task=PLAN_PROMPT.format(task=task, coders=len(coder_names)))
+        plan_text = getattr(plan.messages[-1], "content", "") if plan.messages else ""
+        items = parse_work_items(plan_text if isinstance(plan_text, str) else str(plan_text))
+        
+        if not items:
+            self.plan_fallbacks += 1
+            logger.warning(
+                f"No work items in the plan, falling back to the sequential swarm "
+                f"({self.plan_fallbacks} so far); plan began: {str(plan_text)[:200]!r}"
+            )
+            print("\n[SWARM] No work items in the plan, falling back to the sequential swarm")
+            return await self.execute_task(task, agents, max_steps)
+        
+        print(f"\n[SWARM] Parallel mode: {len(items)} work items, {len(coder_names)} coders")
+        for item in items:
+            print(f"  - {item['id']}: {item['title']} {item['files']}")
+        
+        # 2. Каждый item - свежий агент-кодер с инструментами, пишущими только в свои файлы
+        ownership = FileOwnership()
+        
+        async def run_item(item, coder_name):
+            coder = coder_factory(coder_name, owned_tools(workspace, ownership, item["id"]))
+            print(f"\n[SWARM] {coder_name} -> {item['id']}")
+            result = await coder.run(task=ITEM_PROMPT.format(
+                **{**item, "task": task, "files": ", ".join(item["files"]) or "(none planned)"}
+            ))
+            content = getattr(result.messages[-1], "content", "") if result.messages else ""
+            return content if isinstance(content, str) else str(content)
+        
+        started = asyncio.get_running_loop().time()
+        results = await ParallelCoders(coder_names, run_item, ownership).run(items)
+        elapsed = asyncio.get_running_loop().time() - started
+        busy = sum(r.get("seconds", 0) for r in results.values())
+        print(f"\n[SWARM] Parallel phase: {elapsed:.0f}s wall, {busy:.0f}s of coder time")
+        
+        # 3. Join: ревью и доработка всего результата обычным swarm-циклом
+        report = join_report(items, results)
+        return await self.execute_task(
+            f"{task}\n\n{report}\n\nReviewer: review the combined result. Coders: fix what the reviewer finds.",
+            agents,
+            max_steps
+        )
@@ -0,0 +1,382 @@
+"""Persistent workspace file index with .gitignore support."""
+
+import hashlib
+import json
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+
+
+# Always skipped, whatever .gitignore says (.git is a file in linked worktrees)
+ALWAYS_IGNORED = (".git", ".multiagent/")
+
+# Skipped by default in addition to .gitignore rules
+DEFAULT_IGNORES = (
+    "node_modules/",
+    "__pycache__/",
+    ".venv/",
+    "venv/",
+    ".tox/",
+    ".mypy_cache/",
+    ".pytest_cache/",
+    "*.pyc",
+)
+
+
+def _translate(pattern: str) -> str:
+    """Translate a gitignore glob (without anchoring) to a regex."""
+    regex = ""
+    i = 0
+    
+    while i < len(pattern):
+        if pattern.startswith("**/", i):
+            regex += "(?:.*/)?"
+            i += 3
+        elif pattern.startswith("/**", i) and i + 3 == len(pattern):
+            regex += "/.*"
+            i += 3
+        elif pattern.startswith("**", i):
+            regex += ".*"
+            i += 2
+        elif pattern[i] == "*":
+            regex += "[^/]*"
+            i += 1
+        elif pattern[i] == "?":
+            regex += "[^/]"
+            i += 1
+        elif pattern[i] == "[" and "]" in pattern[i + 1:]:
+            end = pattern.index("]", i + 1)
+            body = pattern[i + 1:end]
+            if body.startswith("!"):
+                body = "^" + body[1:]
+            regex += f"[{body}]"
+            i = end + 1
+        elif pattern[i] == "\\" and i + 1 < len(pattern):
+            regex += re.escape(pattern[i + 1])
+            i += 2
+        else:
+            regex += re.escape(pattern[i])
+            i += 1
+    
+    return regex
+
+
+class IgnoreRules:
+    """
+    Ordered gitignore rules; the last matching rule wins.
+    
+    Each rule applies below the directory its .gitignore lives in. Patterns
+    containing a slash (other than a trailing one) are anchored to that
+    directory, others match at any depth.
+    """
+    
+    def __init__(self, rules: Optional[List[Tuple[str, Any, bool, bool]]] = None):
+        """
+        Initialize rules.
+        
+        Args:
+            rules: (base, compiled regex, negate, dir_only) tuples
+        """
+        self.rules = rules or []
+    
+    def extend(self, lines: List[str], base: str = "") -> "IgnoreRules":
+        """
+        Return new rules with gitignore lines added.
+        
+        Args:
+            lines: Lines of a .gitignore file
+            base: Workspace-relative directory of that file ("" for root)
+        
+        Returns:
+            New IgnoreRules (self is unchanged, so parents can be shared)
+        """
+        rules = list(self.rules)
+        
+        for line in lines:
+            line = line.rstrip("\n")
+            if not line.strip() or line.startswith("#"):
+                continue
+            if not line.endswith("\\ "):
+                line = line.rstrip()
+            
+            negate = line.startswith("!")
+            if negate or line.startswith("\\!") or line.startswith("\\#"):
+                line = line[1:]
+            
+            dir_only = line.endswith("/")
+            line = line.rstrip("/")
+            if not line:
+                continue
+            
+            if "/" in line:
+                regex = "^" + _translate(line.lstrip("/")) + "$"
+            else:
+                regex = "(?:^|/)" + _translate(line) + "$"
+            
+            rules.append((base, re.compile(regex), negate, dir_only))
+        
+        return IgnoreRules(rules)
+    
+    def is_ignored(self, path: str, is_dir: bool) -> bool:
+        """
+        Check a workspace-relative POSIX path.
+        
+        Args:
+            path: Path relative to the workspace root
+            is_dir: Whether path is a directory
+        
+        Returns:
+            True if the last matching rule excludes it
+        """
+        ignored = False
+        
+        for base, regex, negate, dir_only in self.rules:
+            if dir_only and not is_dir:
+                continue
+            if base:
+                if not path.startswith(base + "/"):
+                    continue
+                relative = path[len(base) + 1:]
+            else:
+                relative = path
+            if regex.search(relative):
+                ignored = not negate
+        
+        return ignored
+
+
+class WorkspaceIndex:
+    """
+    Index of workspace files: path, size, mtime and (lazily) content hash.
+    
+    refresh() walks the workspace, but directories whose mtime is unchanged
+    reuse their cached listing and files whose (mtime_ns, size) are
+    unchanged keep their hash, so a refresh costs one stat per file and no
+    directory reads or hashing when nothing changed. Ignored directories
+    (per .gitignore, DEFAULT_IGNORES and ALWAYS_IGNORED) are never entered.
+    """
+    
+    VERSION = 1
+    
+    def __init__(
+        self,
+        root: str,
+        cache_file: Optional[str] = None,
+        ignores: Tuple[str, ...] = DEFAULT_IGNORES
+    ):
+        """
+        Initialize workspace index.
+        
+        Args:
+            root: Workspace root directory
+            cache_file: Where the index is persisted (default: memory only)
+            ignores: gitignore-style patterns applied before .gitignore files
+        """
+        self.root = Path(root).resolve()
+        self.cache_file = Path(cache_file) if cache_file else None
+        self.base_rules = IgnoreRules().extend(list(ALWAYS_IGNORED) + list(ignores))
+        self.dirs: Dict[str, Dict[str, Any]] = {}
+        self.files: Dict[str, Dict[str, Any]] = {}
+        self._dirty = False
+        self._loaded = False
+        self._lock = threading.RLock()
+    
+    def _load(self):
+        """Load persisted index (once)."""
+        if self._loaded:
+            return
+        self._loaded = True
+        
+        if not self.cache_file:
+            return
+        try:
+            with open(self.cache_file) as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return
+        
+        if data.get("version") == self.VERSION and data.get("root") == str(self.root):
+            self.dirs = data.get("dirs", {})
+            self.files = data.get("files", {})
+    
+    def save(self):
+        """Persist index atomically (tmp + rename) if it changed."""
+        if not self.cache_file or not self._dirty:
+            return
+        
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.cache_file.with_name(self.cache_file.name + ".tmp")
+        with open(tmp_file, "w") as f:
+            json.dump({
+                "version": self.VERSION,
+                "root": str(self.root),
+                "dirs": self.dirs,
+                "files": self.files
+            }, f)
+        os.replace(tmp_file, self.cache_file)
+        self._dirty = False
+    
+    def _listing(self, rel_dir: str, abs_dir: str) -> Optional[Dict[str, Any]]:
+        """Get directory listing, re-reading it only if the mtime changed."""
+        try:
+            mtime_ns = os.stat(abs_dir).st_mtime_ns
+        except OSError:
+            return None
+        
+        cached = self.dirs.get(rel_dir)
+        if cached and cached["mtime_ns"] == mtime_ns:
+            return cached
+        
+        dirs, files = [], []
+        try:
+            with os.scandir(abs_dir) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            dirs.append(entry.name)
+                        elif entry.is_file():
+                            files.append(entry.name)
+                    except OSError:
+                        continue
+        except OSError:
+            return None
+        
+        listing = {"mtime_ns": mtime_ns, "dirs": sorted(dirs), "files": sorted(files)}
+        self.dirs[rel_dir] = listing
+        self._dirty = True
+        return listing
+    
+    def refresh(self) -> Dict[str, List[str]]:
+        """
+        Bring the index up to date with the workspace.
+        
+        Returns:
+            Dict with "added", "modified" and "removed" paths
+        """
+        with self._lock:
+            self._load()
+            changes = {"added": [], "modified": [], "removed": []}
+            seen_dirs = set()
+            seen_files = set()
+            stack = [("", self.base_rules)]
+            
+            while stack:
+                rel_dir, rules = stack.pop()
+                abs_dir = os.path.join(self.root, rel_dir) if rel_dir else str(self.root)
+                listing = self._listing(rel_dir, abs_dir)
+                if listing is None:
+                    continue
+                seen_dirs.add(rel_dir)
+                
+                if ".gitignore" in listing["files"]:
+                    try:
+                        with open(os.path.join(abs_dir, ".gitignore"), encoding="utf-8", errors="replace") as f:
+                            rules = rules.extend(f.readlines(), rel_dir)
+                    except OSError:
+                        pass
+                
+                for name in listing["files"]:
+                    path = f"{rel_dir}/{name}" if rel_dir else name
+                    if rules.is_ignored(path, False):
+                        continue
+                    try:
+                        st = os.stat(os.path.join(abs_dir, name))
+                    except OSError:
+                        continue
+                    
+                    seen_files.add(path)
+                    entry = self.files.get(path)
+                    if entry is None:
+                        changes["added"].append(path)
+                    elif entry["mtime_ns"] != st.st_mtime_ns or entry["size"] != st.st_size:
+                        changes["modified"].append(path)
+                    else:
+                        continue
+                    self.files[path] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "hash": None}
+                    self._dirty = True
+                
+                for name in reversed(listing["dirs"]):
+                    path = f"{rel_dir}/{name}" if rel_dir else name
+                    if not rules.is_ignored(path, True):
+                        stack.append((path, rules))
+            
+            for path in set(self.files) - seen_files:
+                del self.files[path]
+                changes["removed"].append(path)
+                self._dirty = True
+            for path in set(self.dirs) - seen_dirs:
+                del self.dirs[path]
+                self._dirty = True
+            
+            for key in changes:
+                changes[key].sort()
+            self.save()
+            return changes
+    
+    def file_hash(self, path: str) -> Optional[str]:
+        """
+        Get SHA-1 of an indexed file's content, hashing only if it changed.
+        
+        Args:
+            path: Workspace-relative path
+        
+        Returns:
+            Hex digest, or None if the file is not indexed
+        """
+        with self._lock:
+            entry = self.files.get(path)
+            if entry is None:
+                return None
+            if entry["hash"] is None:
+                digest = hashlib.sha1()
+                with open(self.root / path, "rb") as f:
+                    for chunk in iter(lambda: f.read(1 << 20), b""):
+                        digest.update(chunk)
+                entry["hash"] = digest.hexdigest()
+                self._dirty = True
+            return entry["hash"]
+    
+    def paths(
+        self,
+        directory: str = "",
+        max_depth: Optional[int] = None,
+        pattern: Optional[str] = None,
+        extra: Iterable[str] = ()
+    ) -> List[str]:
+        """
+        List indexed files (call refresh() first for fresh results).
+        
+        Args:
+            directory: Workspace-relative directory to list ("" for root)
+            max_depth: Only files at most this many levels below directory
+                (1 = directly inside it)
+            pattern: Glob matched against the file name, or against the
+                path relative to directory if it contains "/"; "*" stays
+                within one path segment, "**" spans directories
+            extra: Paths not (yet) on disk to include, filtered the same way
+        
+        Returns:
+            Sorted workspace-relative paths
+        """
+        prefix = directory.strip("/")
+        prefix = f"{prefix}/" if prefix and prefix != "." else ""
+        
+        matcher = re.compile(_translate(pattern)) if pattern else None
+        
+        result = []
+        for path in set(self.files).union(extra):
+            if not path.startswith(prefix):
+                continue
+            relative = path[len(prefix):]
+            if max_depth is not None and relative.count("/") >= max_depth:
+                continue
+            if pattern:
+                subject = relative if "/" in pattern else relative.rsplit("/", 1)[-1]
+                if not matcher.fullmatch(subject):
+                    continue
+            result.append(path)
+        
+        result.sort()
+        return result
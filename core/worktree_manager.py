@@ -1,70 +1,697 @@
 """Git worktree manager for task isolation."""
 
+import asyncio
+import os
+import shutil
 import subprocess
-from pathlib import Path
-from typing import Optional
+import sys
+import tempfile
+import threading
+from pathlib import Path, PurePosixPath
+from typing import Callable, Optional, List, Iterable
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+from core.git_executor import GitExecutor
+from core.merge_service import MergeService
+from core.worktree_pool import WorktreePool
+
+
+def scope_directories(paths: Iterable[str]) -> List[str]:
+    """
+    Convert file and directory paths to cone-mode sparse checkout directories.
+    
+    Files map to their parent directory; entries ending in "/" are kept as
+    directories. Top-level files need no entry because cone mode always
+    includes files in the repository root.
+    
+    Args:
+        paths: Repository-relative paths
+    
+    Returns:
+        Sorted list of directories without redundant nested entries
+    """
+    dirs = set()
+    
+    for raw in paths:
+        path = raw.strip().replace("\\", "/")
+        if not path:
+            continue
+        if path.endswith("/"):
+            directory = path.strip("/")
+        else:
+            directory = str(PurePosixPath(path.lstrip("/")).parent)
+        if directory and directory != ".":
+            dirs.add(directory)
+    
+    # Drop directories already covered by a parent in the set
+    result = []
+    for directory in sorted(dirs):
+        if not any(directory.startswith(kept + "/") for kept in result):
+            result.append(directory)
+    
+    return result
+
+
+def path_scope_from_spec(spec_text: str) -> List[str]:
+    """
+    Read the path scope declared by a task specification.
+    
+    Uses the `scope` list if present, otherwise `files_to_modify` plus
+    `files_to_create`. Only the flat "key:" / "  - item" list form written
+    by `multiagent spec new` is understood.
+    
+    Args:
+        spec_text: Specification YAML text
+    
+    Returns:
+        List of repository-relative paths (empty means whole tree)
+    """
+    lists = {}
+    current = None
+    
+    for line in spec_text.splitlines():
+        stripped = line.strip()
+        if not stripped or stripped.startswith("#"):
+            continue
+        if not line[0].isspace() and stripped.endswith(":"):
+            current = stripped[:-1]
+            lists[current] = []
+        elif not line[0].isspace():
+            current = None
+        elif current is not None and stripped.startswith("- "):
+            lists[current].append(stripped[2:].strip().strip("'\""))
+    
+    if lists.get("scope"):
+        return lists["scope"]
+    
+    return lists.get("files_to_modify", []) + lists.get("files_to_create", [])
+
+
+# ioctl request number for FICLONE (linux/fs.h): share extents with another file
+FICLONE = 0x40049409
+
+# Worktree creation strategies (see WorktreeManager.create_worktree)
+STRATEGIES = ("checkout", "reflink", "copy")
+
+
+def reflink_supported(directory: Path) -> bool:
+    """
+    Check whether files in directory can be cloned copy-on-write.
+    
+    Args:
+        directory: Directory on the filesystem to probe
+    
+    Returns:
+        True if FICLONE works there (btrfs, XFS with reflink, bcachefs, ...)
+    """
+    if fcntl is None or not sys.platform.startswith("linux"):
+        return False
+    
+    directory.mkdir(parents=True, exist_ok=True)
+    with tempfile.TemporaryDirectory(dir=directory) as probe_dir:
+        src_path = os.path.join(probe_dir, "src")
+        with open(src_path, "wb") as f:
+            f.write(b"reflink probe")
+        try:
+            with open(src_path, "rb") as src, open(os.path.join(probe_dir, "dst"), "wb") as dst:
+                fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+            return True
+        except OSError:
+            return False
+
+
+def _clone_file(src: str, dst: str, reflink: bool):
+    """Copy file sharing its extents when reflink is set, keeping mode and mtime."""
+    if reflink:
+        with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+            fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+        shutil.copystat(src, dst)
+    else:
+        shutil.copy2(src, dst)
+
+
+def clone_tree(src: Path, dst: Path, reflink: bool = True):
+    """
+    Copy a checkout's files (not its .git link) into an existing directory.
+    
+    Args:
+        src: Source checkout
+        dst: Destination directory
+        reflink: Clone extents copy-on-write instead of copying bytes
+    """
+    for root, dirs, files in os.walk(src):
+        rel = os.path.relpath(root, src)
+        target = os.path.join(dst, rel) if rel != "." else str(dst)
+        
+        if rel == ".":
+            files = [name for name in files if name != ".git"]
+            dirs[:] = [name for name in dirs if name != ".git"]
+        
+        for name in list(dirs):
+            source = os.path.join(root, name)
+            if os.path.islink(source):
+                # os.walk lists symlinks to directories as dirs
+                os.symlink(os.readlink(source), os.path.join(target, name))
+                dirs.remove(name)
+            else:
+                os.makedirs(os.path.join(target, name), exist_ok=True)
+        
+        for name in files:
+            source = os.path.join(root, name)
+            if os.path.islink(source):
+                os.symlink(os.readlink(source), os.path.join(target, name))
+            else:
+                _clone_file(source, os.path.join(target, name), reflink)
+
+
+def parse_worktree_porcelain(output: str) -> List[dict]:
+    """
+    Parse `git worktree list --porcelain` output.
+    
+    Args:
+        output: Porcelain output
+    
+    Returns:
+        List of dicts with path, head, branch (full ref or None), detached,
+        bare, locked and prunable (reason string, True, or False)
+    """
+    worktrees = []
+    current = None
+    
+    for line in output.split("\n"):
+        if not line:
+            current = None
+            continue
+        
+        key, _, value = line.partition(" ")
+        
+        if key == "worktree":
+            current = {
+                "path": value,
+                "head": None,
+                "branch": None,
+                "detached": False,
+                "bare": False,
+                "locked": False,
+                "prunable": False
+            }
+            worktrees.append(current)
+        elif current is None:
+            continue
+        elif key == "HEAD":
+            current["head"] = value
+        elif key == "branch":
+            current["branch"] = value
+        elif key in ("detached", "bare"):
+            current[key] = True
+        elif key in ("locked", "prunable"):
+            current[key] = value or True
+    
+    return worktrees
 
 
 class WorktreeManager:
     """Manage git worktrees for task isolation."""
     
-    def __init__(self, base_dir: str = ".multiagent/worktrees"):
+    def __init__(
+        self,
+        base_dir: str = ".multiagent/worktrees",
+        pool: Optional[WorktreePool] = None,
+        executor: Optional[GitExecutor] = None,
+        strategy: str = "checkout",
+        defer_gc: bool = False
+    ):
         """
         Initialize worktree manager.
         
+        All worktrees share the repository's single object database.
+        
         Args:
             base_dir: Base directory for worktrees
+            pool: Warm worktree pool to claim from (default: no pool)
+            executor: Git executor for the async methods (default: current repo)
+            strategy: How create_worktree materializes files: "checkout"
+                (git checkout), "reflink" (copy-on-write clone of a pristine
+                base checkout, falling back to checkout when the filesystem
+                can't) or "copy" (plain copy of the pristine checkout)
+            defer_gc: Disable automatic gc/repacking in the git commands this
+                manager runs (commits, merges, object writes), so many
+                concurrent tasks don't repack the shared object store; call
+                run_maintenance() after the batch
         """
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown worktree strategy: {strategy}")
+        
         self.base_dir = Path(base_dir)
         self.base_dir.mkdir(parents=True, exist_ok=True)
+        self.pool = pool
+        self.strategy = strategy
+        self.git_env = None
+        if defer_gc:
+            self.git_env = dict(
+                os.environ,
+                GIT_CONFIG_COUNT="2",
+                GIT_CONFIG_KEY_0="gc.auto",
+                GIT_CONFIG_VALUE_0="0",
+                GIT_CONFIG_KEY_1="maintenance.auto",
+                GIT_CONFIG_VALUE_1="false"
+            )
+        self.executor = executor or GitExecutor(env=self.git_env)
+        self._checkpoints = {}
+        self._reflink: Optional[bool] = None
+        self._pristine_lock = threading.Lock()
+        # Worktrees created by cloning files (see _stat_args)
+        self._cloned = set()
+    
+    @classmethod
+    def from_config(cls, config, background: bool = True, **kwargs) -> "WorktreeManager":
+        """
+        Create a manager from project configuration.
+        
+        Uses worktree_base, and attaches a warm pool when worktree_pool
+        has a size above 0.
+        
+        Args:
+            config: core.config_loader.ConfigLoader
+            background: If True, start the pool's refill thread
+            **kwargs: Further WorktreeManager arguments
+        
+        Returns:
+            Configured manager
+        """
+        manager = cls(base_dir=config.get_worktree_base(), **kwargs)
+        pool = config.get_worktree_pool()
+        if pool["size"] > 0:
+            manager.enable_pool(
+                base_branch=pool["base_branch"],
+                size=pool["size"],
+                low_watermark=pool["low_watermark"],
+                refill_interval=pool["refill_interval"],
+                background=background
+            )
+        return manager
     
-    def create_worktree(self, task_id: str, base_branch: str = "main") -> Path:
+    def enable_pool(
+        self,
+        base_branch: str = "main",
+        size: int = 2,
+        low_watermark: int = 1,
+        refill_interval: float = 30.0,
+        background: bool = True
+    ) -> WorktreePool:
+        """
+        Attach a warm worktree pool stored under base_dir/.pool.
+        
+        Args:
+            base_branch: Branch pooled worktrees track
+            size: Number of free worktrees to keep ready
+            low_watermark: Refill when fewer than this many are free
+            refill_interval: Seconds between background refill passes
+            background: If True, start the refill thread
+        
+        Returns:
+            The attached pool
+        """
+        self.pool = WorktreePool(
+            str(self.base_dir / ".pool"),
+            base_branch=base_branch,
+            size=size,
+            low_watermark=low_watermark,
+            refill_interval=refill_interval,
+            repo_dir=self.executor.repo_dir
+        )
+        if background:
+            self.pool.start()
+        return self.pool
+    
+    def create_worktree(
+        self,
+        task_id: str,
+        base_branch: str = "main",
+        paths: Optional[List[str]] = None,
+        spec_text: Optional[str] = None
+    ) -> Path:
         """
         Create new worktree for task.
         
         Args:
             task_id: Unique task identifier
             base_branch: Base branch to branch from
+            paths: Limit the checkout to these paths (cone-mode sparse
+                checkout); None checks out the whole tree
+            spec_text: Task specification YAML; if paths is None, the scope
+                it declares (see path_scope_from_spec) limits the checkout
         
         Returns:
             Path to worktree directory
         """
+        return self._create_worktree(task_id, base_branch, paths, spec_text, self._run_git)
+    
+    def _run_git(self, args: List[str]) -> subprocess.CompletedProcess:
+        """Run a git command that changes shared repository state (sync callers)."""
+        return subprocess.run(["git"] + args, check=True, capture_output=True, text=True)
+    
+    def _locked_runner(self, loop: asyncio.AbstractEventLoop) -> Callable[[List[str]], subprocess.CompletedProcess]:
+        """Run shared-state git commands from a worker thread under the executor's repository lock."""
+        def run(args: List[str]) -> subprocess.CompletedProcess:
+            return asyncio.run_coroutine_threadsafe(self.executor.run(args, exclusive=True), loop).result()
+        return run
+    
+    def _create_worktree(
+        self,
+        task_id: str,
+        base_branch: str,
+        paths: Optional[List[str]],
+        spec_text: Optional[str],
+        register: Callable[[List[str]], subprocess.CompletedProcess]
+    ) -> Path:
+        """Create worktree (see create_worktree); register runs the commands that change shared repository state."""
         worktree_path = self.base_dir / task_id
         branch_name = f"task/{task_id}"
         
-        # git worktree add -b task/123 .multiagent/worktrees/task-123 main
-        cmd = [
-            "git", "worktree", "add",
+        if paths is None and spec_text:
+            paths = path_scope_from_spec(spec_text)
+        
+        if paths:
+            return self._create_sparse_worktree(worktree_path, branch_name, base_branch, paths, register)
+        
+        if self.pool and self.pool.base_branch == base_branch:
+            claimed = self.pool.claim(task_id, worktree_path)
+            if claimed:
+                return claimed
+        
+        if self.strategy == "copy" or (self.strategy == "reflink" and self.reflink_supported):
+            return self._create_cloned_worktree(worktree_path, branch_name, base_branch, register)
+        
+        # git worktree add --no-checkout -b task/123 .multiagent/worktrees/task-123 main
+        register([
+            "worktree", "add", "--no-checkout",
             "-b", branch_name,
-            str(worktree_path),
+            str(worktree_path.resolve()),
             base_branch
-        ]
+        ])
+        
+        # Populate index and files; touches only this worktree's index
+        subprocess.run(
+            ["git", "-C", str(worktree_path), "reset", "-q", "--hard"],
+            check=True, capture_output=True, text=True
+        )
+        
+        return worktree_path
+    
+    @property
+    def reflink_supported(self) -> bool:
+        """Whether base_dir's filesystem supports reflinks (probed once)."""
+        if self._reflink is None:
+            self._reflink = reflink_supported(self.base_dir)
+        return self._reflink
+    
+    def _pristine_checkout(
+        self,
+        base_branch: str,
+        register: Optional[Callable[[List[str]], subprocess.CompletedProcess]] = None
+    ) -> Path:
+        """Create or update the detached pristine checkout of base_branch."""
+        pristine = self.base_dir / ".pristine" / base_branch.replace("/", "_")
+        
+        if pristine.exists():
+            # Only files that changed on the base are rewritten
+            subprocess.run(
+                ["git", "-C", str(pristine), "checkout", "-q", "--detach", base_branch],
+                check=True, capture_output=True, text=True
+            )
+        else:
+            (register or self._run_git)(["worktree", "add", "-q", "--detach", str(pristine.resolve()), base_branch])
+        
+        return pristine
+    
+    def _create_cloned_worktree(
+        self,
+        worktree_path: Path,
+        branch_name: str,
+        base_branch: str,
+        register: Optional[Callable[[List[str]], subprocess.CompletedProcess]] = None
+    ) -> Path:
+        """Create worktree by cloning files and index from the pristine checkout."""
+        register = register or self._run_git
+        register(["worktree", "add", "--no-checkout", "-b", branch_name, str(worktree_path.resolve()), base_branch])
+        
+        with self._pristine_lock:
+            pristine = self._pristine_checkout(base_branch, register)
+            clone_tree(pristine, worktree_path, reflink=self.strategy == "reflink")
+            
+            # Reuse the pristine index so git doesn't re-hash every file
+            shutil.copy2(
+                self._git_output(["rev-parse", "--absolute-git-dir"], cwd=pristine) + "/index",
+                self._git_output(["rev-parse", "--absolute-git-dir"], cwd=worktree_path) + "/index"
+            )
+        
+        self._cloned.add(str(worktree_path.resolve()))
+        return worktree_path
+    
+    def _stat_args(self, worktree_path: Path) -> List[str]:
+        """
+        Git options for commands that scan a worktree's files.
+        
+        Cloned files keep mtime and size but not inode/ctime, so the first
+        scan with the default core.checkStat would re-hash every file.
+        Comparing only what survives the copy is passed per command;
+        nothing is written to the repository or worktree config.
+        """
+        if str(Path(worktree_path).resolve()) in self._cloned:
+            return ["-c", "core.checkStat=minimal"]
+        return []
+    
+    def run_maintenance(self):
+        """Run the gc/repack deferred by defer_gc once, for the whole batch."""
+        subprocess.run(
+            ["git", "gc", "--auto", "--quiet"],
+            check=True, capture_output=True, text=True
+        )
+    
+    def _create_sparse_worktree(
+        self,
+        worktree_path: Path,
+        branch_name: str,
+        base_branch: str,
+        paths: List[str],
+        register: Optional[Callable[[List[str]], subprocess.CompletedProcess]] = None
+    ) -> Path:
+        """Create worktree that only materializes the given path scope."""
+        # Register the worktree without writing any files yet
+        (register or self._run_git)(
+            ["worktree", "add", "--no-checkout", "-b", branch_name, str(worktree_path.resolve()), base_branch]
+        )
+        
+        # Sparse settings are per worktree (git enables extensions.worktreeConfig)
+        subprocess.run(
+            ["git", "-C", str(worktree_path), "sparse-checkout", "set", "--cone"] + scope_directories(paths),
+            check=True, capture_output=True, text=True
+        )
         
-        subprocess.run(cmd, check=True, capture_output=True, text=True)
+        subprocess.run(
+            ["git", "-C", str(worktree_path), "checkout"],
+            check=True, capture_output=True, text=True
+        )
         
         return worktree_path
     
-    def commit_checkpoint(self, worktree_path: Path, message: str):
+    def widen_scope(self, worktree_path: Path, paths: List[str]):
+        """
+        Add paths to a sparse worktree's checkout.
+        
+        Args:
+            worktree_path: Path to sparse worktree
+            paths: Additional repository-relative paths
+        """
+        dirs = scope_directories(paths)
+        if not dirs:
+            return
+        
+        subprocess.run(
+            ["git", "-C", str(worktree_path), "sparse-checkout", "add"] + dirs,
+            check=True, capture_output=True, text=True
+        )
+    
+    def commit_checkpoint(
+        self,
+        worktree_path: Path,
+        message: str,
+        paths: Optional[List[str]] = None,
+        use_index: bool = True
+    ) -> bool:
         """
         Create checkpoint commit in worktree.
         
+        With paths, only those files are staged (`git update-index`), so
+        the worktree is not re-scanned; pass the paths reported by the file
+        tools. Use paths=None after shell commands that may write anywhere.
+        
+        With use_index=False the commit is written with `git commit-tree`
+        from a private index onto refs/checkpoints/<task_id>, leaving the
+        worktree's index and branch untouched. Use squash_checkpoints() to
+        turn them into a single commit on the task branch.
+        
         Args:
             worktree_path: Path to worktree
             message: Commit message
+            paths: Worktree-relative paths that changed (default: scan all)
+            use_index: If False, commit to the private checkpoint ref
+        
+        Returns:
+            True if a commit was created, False if nothing changed
         """
-        # git -C <worktree> add -A
-        subprocess.run(
-            ["git", "-C", str(worktree_path), "add", "-A"],
-            check=True, capture_output=True, text=True
+        if not use_index:
+            return self._commit_private_checkpoint(Path(worktree_path), message, paths)
+        
+        if paths is None:
+            # git -C <worktree> add -A
+            subprocess.run(
+                ["git", "-C", str(worktree_path)] + self._stat_args(worktree_path) + ["add", "-A"],
+                check=True, capture_output=True, text=True
+            )
+        else:
+            if not paths:
+                return False
+            # Stages additions, modifications and deletions of exactly these paths
+            subprocess.run(
+                ["git", "-C", str(worktree_path), "update-index", "--add", "--remove", "--"] + list(paths),
+                check=True, capture_output=True, text=True
+            )
+        
+        # Nothing staged: exit code 0 (no output parsing, so any locale works)
+        staged = subprocess.run(
+            ["git", "-C", str(worktree_path), "diff", "--cached", "--quiet"],
+            capture_output=True, text=True
         )
+        if staged.returncode == 0:
+            return False
+        if staged.returncode != 1:
+            raise subprocess.CalledProcessError(staged.returncode, staged.args, staged.stdout, staged.stderr)
         
         # git -C <worktree> commit -m "message"
         subprocess.run(
             ["git", "-C", str(worktree_path), "commit", "-m", message],
+            check=True, capture_output=True, text=True, env=self.git_env
+        )
+        
+        return True
+    
+    def _git_output(self, args: List[str], cwd: Optional[Path] = None, env: Optional[dict] = None) -> str:
+        """Run git command and return stripped stdout."""
+        return subprocess.run(
+            ["git"] + args,
+            cwd=str(cwd) if cwd else None,
+            env=env or self.git_env,
             check=True, capture_output=True, text=True
+        ).stdout.strip()
+    
+    def _commit_private_checkpoint(self, worktree_path: Path, message: str, paths: Optional[List[str]]) -> bool:
+        """Commit changed paths onto refs/checkpoints/<task_id> via a private index."""
+        key = str(worktree_path.resolve())
+        state = self._checkpoints.get(key)
+        
+        if state is None:
+            git_dir = Path(self._git_output(["rev-parse", "--absolute-git-dir"], cwd=worktree_path))
+            ref = f"refs/checkpoints/{worktree_path.name}"
+            existing = subprocess.run(
+                ["git", "rev-parse", "--verify", "-q", ref],
+                cwd=str(worktree_path), capture_output=True, text=True
+            ).stdout.strip()
+            parent = existing or self._git_output(["rev-parse", "HEAD"], cwd=worktree_path)
+            state = {
+                "ref": ref,
+                "index": git_dir / "checkpoint-index",
+                "parent": parent,
+                "tree": self._git_output(["rev-parse", f"{parent}^{{tree}}"], cwd=worktree_path),
+            }
+            self._checkpoints[key] = state
+        
+        env = dict(self.git_env or os.environ, GIT_INDEX_FILE=str(state["index"]))
+        
+        if not state["index"].exists():
+            self._git_output(["read-tree", state["parent"]], cwd=worktree_path, env=env)
+        
+        if paths is None:
+            self._git_output(["add", "-A"], cwd=worktree_path, env=env)
+        elif paths:
+            self._git_output(["update-index", "--add", "--remove", "--"] + list(paths), cwd=worktree_path, env=env)
+        
+        tree = self._git_output(["write-tree"], cwd=worktree_path, env=env)
+        if tree == state["tree"]:
+            return False
+        
+        commit = self._git_output(
+            ["commit-tree", tree, "-p", state["parent"], "-m", message], cwd=worktree_path
         )
+        self._git_output(["update-ref", state["ref"], commit], cwd=worktree_path)
+        
+        state["parent"] = commit
+        state["tree"] = tree
+        return True
+    
+    def _has_private_checkpoints(self, task_id: str) -> bool:
+        """Whether refs/checkpoints/<task_id> exists."""
+        return subprocess.run(
+            ["git", "rev-parse", "--verify", "-q", f"refs/checkpoints/{task_id}"],
+            capture_output=True, text=True
+        ).returncode == 0
+    
+    def squash_checkpoints(self, task_id: str, target_branch: str = "main", message: Optional[str] = None) -> str:
+        """
+        Collapse all checkpoints of a task into one commit on its branch.
+        
+        Takes the tree of the private checkpoint ref if there is one,
+        otherwise the task branch tip, and commits it directly on top of
+        the merge base with target_branch.
+        
+        Args:
+            task_id: Task identifier
+            target_branch: Branch the task will be merged into
+            message: Commit message (default: "task/<task_id>")
+        
+        Returns:
+            SHA of the squashed commit
+        """
+        branch_name = f"task/{task_id}"
+        ref = f"refs/checkpoints/{task_id}"
+        worktree_path = self.base_dir / task_id
+        
+        private_tip = subprocess.run(
+            ["git", "rev-parse", "--verify", "-q", ref],
+            capture_output=True, text=True
+        ).stdout.strip()
+        
+        tip = private_tip or branch_name
+        base = self._git_output(["merge-base", target_branch, branch_name])
+        tree = self._git_output(["rev-parse", f"{tip}^{{tree}}"])
+        commit = self._git_output(["commit-tree", tree, "-p", base, "-m", message or branch_name])
+        
+        if worktree_path.exists():
+            # Mixed reset moves the branch and refreshes the worktree's index; files stay as they are
+            self._git_output(["reset", "-q", commit], cwd=worktree_path)
+        else:
+            self._git_output(["update-ref", f"refs/heads/{branch_name}", commit])
+        
+        if private_tip:
+            self._git_output(["update-ref", "-d", ref])
+            state = self._checkpoints.pop(str(worktree_path.resolve()), None)
+            if state and state["index"].exists():
+                state["index"].unlink()
+        
+        return commit
     
-    def merge_back(self, task_id: str, target_branch: str = "main", no_commit: bool = True):
+    def merge_back(
+        self,
+        task_id: str,
+        target_branch: str = "main",
+        no_commit: bool = True,
+        squash: bool = False
+    ):
         """
         Merge worktree branch back to target.
         
@@ -72,9 +699,13 @@ class WorktreeManager:
             task_id: Task identifier
             target_branch: Target branch to merge into
             no_commit: If True, stage changes without committing (for review)
+            squash: If True, collapse checkpoints into one commit first
         """
         branch_name = f"task/{task_id}"
         
+        if squash:
+            self.squash_checkpoints(task_id, target_branch)
+        
         # git checkout main
         subprocess.run(
             ["git", "checkout", target_branch],
@@ -87,7 +718,30 @@ class WorktreeManager:
             merge_cmd.append("--no-commit")
         merge_cmd.append(branch_name)
         
-        subprocess.run(merge_cmd, check=True, capture_output=True, text=True)
+        subprocess.run(merge_cmd, check=True, capture_output=True, text=True, env=self.git_env)
+    
+    def merge_back_many(self, task_ids: List[str], target_branch: str = "main", squash: bool = False) -> dict:
+        """
+        Merge many task branches at once without checking out target.
+        
+        Tasks with private checkpoints (commit_checkpoint(use_index=False))
+        are squashed onto their branch first, since the branch tip alone
+        doesn't contain that work.
+        
+        Args:
+            task_ids: Task identifiers
+            target_branch: Target branch to merge into
+            squash: If True, collapse the checkpoints of every task first
+        
+        Returns:
+            MergeService.merge_all() result (merged, skipped, plan, commit)
+        """
+        for task_id in task_ids:
+            if squash or self._has_private_checkpoints(task_id):
+                self.squash_checkpoints(task_id, target_branch)
+        
+        service = MergeService(repo_dir=self.executor.repo_dir, env=self.git_env)
+        return service.merge_all([f"task/{task_id}" for task_id in task_ids], target_branch)
     
     def cleanup(self, task_id: str, delete_branch: bool = False):
         """
@@ -97,28 +751,137 @@ class WorktreeManager:
             task_id: Task identifier
             delete_branch: If True, also delete the branch
         """
+        self._cleanup(task_id, delete_branch, self._run_git)
+    
+    def _cleanup(
+        self,
+        task_id: str,
+        delete_branch: bool,
+        register: Callable[[List[str]], subprocess.CompletedProcess]
+    ):
+        """Remove or recycle worktree (see cleanup); register runs the shared-state commands."""
         worktree_path = self.base_dir / task_id
         branch_name = f"task/{task_id}"
+        self._cloned.discard(str(worktree_path.resolve()))
         
-        # git worktree remove .multiagent/worktrees/task-123
-        subprocess.run(
-            ["git", "worktree", "remove", str(worktree_path)],
-            check=True, capture_output=True, text=True
-        )
+        # Recycle into the warm pool if it has room, otherwise remove
+        if not (self.pool and self.pool.release(worktree_path)):
+            # git worktree remove .multiagent/worktrees/task-123
+            register(["worktree", "remove", str(worktree_path.resolve())])
         
         if delete_branch:
             # git branch -D task/123
-            subprocess.run(
-                ["git", "branch", "-D", branch_name],
-                check=True, capture_output=True, text=True
-            )
+            register(["branch", "-D", branch_name])
+    
+    async def create_worktree_async(
+        self,
+        task_id: str,
+        base_branch: str = "main",
+        paths: Optional[List[str]] = None,
+        spec_text: Optional[str] = None
+    ) -> Path:
+        """
+        Create new worktree for task without blocking other tasks.
+        
+        Builds the same worktree as create_worktree (pool, strategy, sparse
+        scope) in a worker thread. Only the worktree registration holds the
+        repository lock; the file checkout runs in parallel with other tasks.
+        
+        Args:
+            task_id: Unique task identifier
+            base_branch: Base branch to branch from
+            paths: Limit the checkout to these paths (see create_worktree)
+            spec_text: Task specification YAML (see create_worktree)
+        
+        Returns:
+            Path to worktree directory
+        """
+        register = self._locked_runner(asyncio.get_running_loop())
+        return await asyncio.to_thread(self._create_worktree, task_id, base_branch, paths, spec_text, register)
+    
+    async def commit_checkpoint_async(self, worktree_path: Path, message: str):
+        """
+        Create checkpoint commit in worktree.
+        
+        Each worktree has its own index and branch, so checkpoints of
+        different tasks run in parallel; lock contention is retried.
+        
+        Args:
+            worktree_path: Path to worktree
+            message: Commit message
+        """
+        cwd = Path(worktree_path).resolve()
+        await self.executor.run(["add", "-A"], cwd=cwd)
+        await self.executor.run(["commit", "-m", message], cwd=cwd)
+    
+    async def merge_back_async(self, task_id: str, target_branch: str = "main", no_commit: bool = True):
+        """
+        Merge worktree branch back to target in the main checkout.
+        
+        Args:
+            task_id: Task identifier
+            target_branch: Target branch to merge into
+            no_commit: If True, stage changes without committing (for review)
+        """
+        merge_args = ["merge"]
+        if no_commit:
+            merge_args.append("--no-commit")
+        merge_args.append(f"task/{task_id}")
+        
+        # Checkout and merge must not interleave with another task's merge
+        async with self.executor.repo_lock:
+            await self.executor.run(["checkout", target_branch])
+            await self.executor.run(merge_args)
+    
+    async def cleanup_async(self, task_id: str, delete_branch: bool = False):
+        """
+        Remove worktree and optionally delete branch.
+        
+        Like cleanup, a pool with room takes the worktree back; the git
+        commands run in a worker thread, shared-state ones under the
+        repository lock.
+        
+        Args:
+            task_id: Task identifier
+            delete_branch: If True, also delete the branch
+        """
+        register = self._locked_runner(asyncio.get_running_loop())
+        await asyncio.to_thread(self._cleanup, task_id, delete_branch, register)
+    
+    async def cleanup_many(self, task_ids: List[str], delete_branch: bool = False):
+        """
+        Remove many finished worktrees at once.
+        
+        Directories are deleted in parallel, then a single `git worktree
+        prune` drops their registrations and a single `git branch -D`
+        deletes all branches. Uncommitted changes in these worktrees are
+        discarded.
+        
+        Args:
+            task_ids: Task identifiers
+            delete_branch: If True, also delete the task branches
+        """
+        if not task_ids:
+            return
+        
+        paths = [(self.base_dir / task_id).resolve() for task_id in task_ids]
+        await asyncio.gather(*(
+            asyncio.to_thread(shutil.rmtree, path, True) for path in paths
+        ))
+        
+        await self.executor.run(["worktree", "prune"], exclusive=True)
+        
+        if delete_branch:
+            branches = [f"task/{task_id}" for task_id in task_ids]
+            # Check disabled: branches already gone must not fail the batch
+            await self.executor.run(["branch", "-D"] + branches, exclusive=True, check=False)
     
     def list_worktrees(self) -> list:
         """
         List all worktrees.
         
         Returns:
-            List of worktree info dicts
+            List of worktree info dicts (see parse_worktree_porcelain)
         """
         # git worktree list --porcelain
         result = subprocess.run(
@@ -126,22 +889,4 @@ class WorktreeManager:
             check=True, capture_output=True, text=True
         )
         
-        worktrees = []
-        current = {}
-        
-        for line in result.stdout.strip().split("\n"):
-            if line.startswith("worktree "):
-                if current:
-                    worktrees.append(current)
-                current = {"path": line.split(" ", 1)[1]}
-            elif line.startswith("branch "):
-                current["branch"] = line.split(" ", 1)[1]
-            elif line == "":
-                if current:
-                    worktrees.append(current)
-                    current = {}
-        
-        if current:
-            worktrees.append(current)
-        
-        return worktrees
+        return parse_worktree_porcelain(result.stdout)
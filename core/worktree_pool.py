@@ -0,0 +1,215 @@
+"""Pool of pre-checked-out worktrees for instant task startup."""
+
+import logging
+import subprocess
+import threading
+import uuid
+from pathlib import Path
+from typing import List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class WorktreePool:
+    """
+    Keep warm worktrees checked out at the base branch.
+    
+    Free worktrees live in pool_dir on branches named pool/<slot>. Claiming
+    one renames its branch to task/<task_id> and moves the directory into
+    place, so a task starts with a branch rename and a cheap reset instead
+    of a full checkout.
+    """
+    
+    def __init__(
+        self,
+        pool_dir: str,
+        base_branch: str = "main",
+        size: int = 2,
+        low_watermark: int = 1,
+        refill_interval: float = 30.0,
+        repo_dir: Optional[str] = None
+    ):
+        """
+        Initialize worktree pool.
+        
+        Args:
+            pool_dir: Directory holding free worktrees
+            base_branch: Branch pooled worktrees track
+            size: Number of free worktrees to keep ready
+            low_watermark: Wake the refill thread when fewer are free
+            refill_interval: Seconds between background refill passes
+            repo_dir: Repository to run git in (default: current directory)
+        """
+        self.pool_dir = Path(pool_dir).resolve()
+        self.pool_dir.mkdir(parents=True, exist_ok=True)
+        self.base_branch = base_branch
+        self.size = size
+        self.low_watermark = low_watermark
+        self.refill_interval = refill_interval
+        self.repo_dir = repo_dir
+        
+        self._lock = threading.Lock()
+        # Worktrees being checked out by refill(), not yet in the pool
+        self._creating = 0
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    def _git(self, args: List[str], cwd: Optional[Path] = None) -> subprocess.CompletedProcess:
+        """Run git command in repo (or in cwd if given)."""
+        return subprocess.run(
+            ["git"] + args,
+            cwd=str(cwd) if cwd else self.repo_dir,
+            check=True, capture_output=True, text=True
+        )
+    
+    def free_slots(self) -> List[Path]:
+        """List free pooled worktrees."""
+        return sorted(p for p in self.pool_dir.iterdir() if p.is_dir())
+    
+    def refill(self) -> int:
+        """
+        Create worktrees until the pool holds `size` free ones.
+        
+        Returns:
+            Number of worktrees created
+        """
+        created = 0
+        
+        while not self._stop.is_set():
+            with self._lock:
+                if len(self.free_slots()) + self._creating >= self.size:
+                    break
+                self._creating += 1
+            
+            slot = f"slot-{uuid.uuid4().hex[:8]}"
+            staging = self.pool_dir.parent / f".{slot}"
+            
+            try:
+                # The checkout runs without the lock, next to the pool; claim()
+                # only sees the worktree once it is moved in complete
+                self._git(["worktree", "add", "-q", "-b", f"pool/{slot}", str(staging), self.base_branch])
+                with self._lock:
+                    self._git(["worktree", "move", str(staging), str(self.pool_dir / slot)])
+            except subprocess.CalledProcessError as e:
+                logger.warning(f"Pool slot {slot} not created: {(e.stderr or '').strip() or e}")
+                raise
+            finally:
+                with self._lock:
+                    self._creating -= 1
+            
+            created += 1
+        
+        return created
+    
+    def claim(self, task_id: str, dest: Path) -> Optional[Path]:
+        """
+        Take a free worktree for a task.
+        
+        Args:
+            task_id: Task identifier (branch becomes task/<task_id>)
+            dest: Where the task worktree should live
+        
+        Returns:
+            dest if a pooled worktree was claimed, None if the pool is empty
+            or the slot can't be taken over (the caller creates the
+            worktree normally)
+        """
+        target = Path(dest).resolve()
+        target.parent.mkdir(parents=True, exist_ok=True)
+        
+        with self._lock:
+            slots = self.free_slots()
+            if not slots:
+                self._wake.set()
+                return None
+            
+            slot = slots[0]
+            try:
+                self._git(["branch", "-m", f"pool/{slot.name}", f"task/{task_id}"])
+            except subprocess.CalledProcessError as e:
+                # e.g. task/<task_id> already exists; the slot stays free
+                logger.warning(f"Pooled worktree not claimed for {task_id}: {e.stderr.strip()}")
+                return None
+            try:
+                self._git(["worktree", "move", str(slot), str(target)])
+            except subprocess.CalledProcessError as e:
+                self._git(["branch", "-m", f"task/{task_id}", f"pool/{slot.name}"])
+                logger.warning(f"Pooled worktree not claimed for {task_id}: {e.stderr.strip()}")
+                return None
+            remaining = len(slots) - 1
+        
+        # Catch up with commits that landed on the base since the slot was made
+        self._git(["reset", "-q", "--hard", self.base_branch], cwd=target)
+        
+        if remaining < self.low_watermark:
+            self._wake.set()
+        
+        return Path(dest)
+    
+    def release(self, worktree_path: Path) -> bool:
+        """
+        Return a task worktree to the pool.
+        
+        The task branch is left in place; the worktree switches to a fresh
+        pool branch at the base, is cleaned of untracked and ignored files
+        and, if it was a sparse checkout, gets its full tree back.
+        
+        Args:
+            worktree_path: Task worktree to recycle
+        
+        Returns:
+            True if recycled, False if the pool is full (caller removes it)
+        """
+        with self._lock:
+            if len(self.free_slots()) >= self.size:
+                return False
+        
+        slot = f"slot-{uuid.uuid4().hex[:8]}"
+        path = Path(worktree_path).resolve()
+        
+        self._git(["checkout", "-q", "-f", "-B", f"pool/{slot}", self.base_branch], cwd=path)
+        self._git(["clean", "-q", "-ffdx"], cwd=path)
+        
+        # The next task to claim the slot expects the whole tree
+        sparse = subprocess.run(
+            ["git", "config", "--bool", "core.sparseCheckout"],
+            cwd=str(path), capture_output=True, text=True
+        )
+        if sparse.stdout.strip() == "true":
+            self._git(["sparse-checkout", "disable"], cwd=path)
+        
+        with self._lock:
+            self._git(["worktree", "move", str(path), str(self.pool_dir / slot)])
+        
+        return True
+    
+    def start(self):
+        """Start background refill thread."""
+        if self._thread and self._thread.is_alive():
+            return
+        
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._refill_loop, name="worktree-pool", daemon=True)
+        self._thread.start()
+    
+    def stop(self, timeout: Optional[float] = None):
+        """Stop background refill thread."""
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+    
+    def _refill_loop(self):
+        """Refill on wake-up or every refill_interval seconds."""
+        while not self._stop.is_set():
+            try:
+                self.refill()
+            except subprocess.CalledProcessError:
+                # Base branch missing or repo busy (logged by refill); retry on next pass
+                pass
+            except Exception as e:
+                logger.warning(f"Pool refill failed, retrying on next pass: {e}")
+            self._wake.wait(self.refill_interval)
+            self._wake.clear()
@@ -0,0 +1,318 @@
+"""Cached worktree registry joined with task state."""
+
+import asyncio
+import json
+import os
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+from core.git_executor import GitExecutor
+from core.state_store import StateStore
+from core.worktree_manager import WorktreeManager, parse_worktree_porcelain
+
+
+class WorktreeRegistry:
+    """
+    Structured view of all worktrees with task metadata.
+    
+    `git worktree list` is only re-run when the repository's worktree
+    metadata changed: the cache is keyed on the mtimes of .git/worktrees,
+    each entry's HEAD, branch ref and lock file, and whether each worktree
+    directory still exists. Disk usage is measured on demand and cached for
+    disk_usage_ttl seconds.
+    """
+    
+    # Task statuses whose worktrees can be removed by prune(finished=True)
+    FINISHED_STATUSES = ("completed", "merged", "failed", "cancelled")
+    
+    def __init__(
+        self,
+        repo_dir: Optional[str] = None,
+        state_store: Optional[StateStore] = None,
+        cache_file: str = ".multiagent/worktrees/.registry.json",
+        disk_usage_ttl: float = 300.0
+    ):
+        """
+        Initialize worktree registry.
+        
+        Args:
+            repo_dir: Repository directory (default: current directory)
+            state_store: Task state store to join with (default: .multiagent/tasks)
+            cache_file: Where the cache is persisted between runs
+            disk_usage_ttl: Seconds before disk usage is measured again
+        """
+        self.repo_dir = Path(repo_dir) if repo_dir else Path.cwd()
+        self.state_store = state_store or StateStore()
+        self.cache_file = Path(cache_file)
+        self.disk_usage_ttl = disk_usage_ttl
+        self._cache: Optional[Dict[str, Any]] = None
+        self._common_dir: Optional[Path] = None
+    
+    def common_dir(self) -> Path:
+        """Locate the repository's common git directory without spawning git."""
+        if self._common_dir is not None:
+            return self._common_dir
+        
+        for directory in [self.repo_dir.resolve()] + list(self.repo_dir.resolve().parents):
+            dot_git = directory / ".git"
+            if dot_git.is_dir():
+                self._common_dir = dot_git
+                break
+            if dot_git.is_file():
+                # Linked worktree: ".git" file points at .git/worktrees/<name>
+                git_dir = Path(dot_git.read_text().split(":", 1)[1].strip())
+                if not git_dir.is_absolute():
+                    git_dir = (directory / git_dir).resolve()
+                commondir = git_dir / "commondir"
+                if commondir.exists():
+                    git_dir = (git_dir / commondir.read_text().strip()).resolve()
+                self._common_dir = git_dir
+                break
+        else:
+            output = subprocess.run(
+                ["git", "rev-parse", "--path-format=absolute", "--git-common-dir"],
+                cwd=str(self.repo_dir), check=True, capture_output=True, text=True
+            ).stdout.strip()
+            self._common_dir = Path(output)
+        
+        return self._common_dir
+    
+    def signature(self) -> List[Any]:
+        """
+        Compute a cheap fingerprint of the worktree metadata.
+        
+        Returns:
+            JSON-serializable list that changes whenever a worktree is
+            added, removed, moved, locked, switches HEAD, gets a new commit
+            on its branch or goes missing
+        """
+        common = self.common_dir()
+        admin = common / "worktrees"
+        
+        def mtime(path: Path) -> int:
+            try:
+                return path.stat().st_mtime_ns
+            except OSError:
+                return 0
+        
+        def head_state(git_dir: Path) -> List[int]:
+            # HEAD itself plus the loose ref it points at (commits move the ref, not HEAD)
+            try:
+                head = (git_dir / "HEAD").read_text().strip()
+            except OSError:
+                return [0, 0]
+            ref_mtime = mtime(common / head[5:]) if head.startswith("ref: ") else 0
+            return [mtime(git_dir / "HEAD"), ref_mtime]
+        
+        signature: List[Any] = [mtime(admin), mtime(common / "packed-refs"), head_state(common)]
+        
+        if admin.is_dir():
+            with os.scandir(admin) as entries:
+                for entry in sorted(entries, key=lambda e: e.name):
+                    entry_dir = Path(entry.path)
+                    try:
+                        gitdir = (entry_dir / "gitdir").read_text().strip()
+                    except OSError:
+                        gitdir = ""
+                    signature.append([
+                        entry.name,
+                        head_state(entry_dir),
+                        mtime(entry_dir / "locked"),
+                        os.path.exists(gitdir) if gitdir else False
+                    ])
+        
+        return signature
+    
+    def _load_cache(self) -> Dict[str, Any]:
+        """Load persisted cache (once per process)."""
+        if self._cache is None:
+            try:
+                with open(self.cache_file) as f:
+                    self._cache = json.load(f)
+            except (OSError, json.JSONDecodeError):
+                self._cache = {}
+            self._cache.setdefault("disk_usage", {})
+        return self._cache
+    
+    def _save_cache(self):
+        """Persist cache atomically (tmp + rename)."""
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.cache_file.with_name(self.cache_file.name + ".tmp")
+        with open(tmp_file, "w") as f:
+            json.dump(self._cache, f)
+        os.replace(tmp_file, self.cache_file)
+    
+    def _git_worktrees(self) -> List[Dict[str, Any]]:
+        """Read worktrees from git, using the cache when metadata is unchanged."""
+        cache = self._load_cache()
+        signature = self.signature()
+        
+        if cache.get("signature") == signature and "worktrees" in cache:
+            return cache["worktrees"]
+        
+        output = subprocess.run(
+            ["git", "worktree", "list", "--porcelain"],
+            cwd=str(self.repo_dir), check=True, capture_output=True, text=True
+        ).stdout
+        
+        cache["signature"] = signature
+        cache["worktrees"] = parse_worktree_porcelain(output)
+        self._save_cache()
+        return cache["worktrees"]
+    
+    @staticmethod
+    def _disk_usage(path: str) -> int:
+        """Sum allocated bytes under path (not following symlinks)."""
+        total = 0
+        stack = [path]
+        
+        while stack:
+            try:
+                with os.scandir(stack.pop()) as entries:
+                    for entry in entries:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                stack.append(entry.path)
+                            else:
+                                st = entry.stat(follow_symlinks=False)
+                                total += getattr(st, "st_blocks", 0) * 512 or st.st_size
+                        except OSError:
+                            continue
+            except OSError:
+                continue
+        
+        return total
+    
+    def _last_activity(self, info: Dict[str, Any], state: Optional[Dict[str, Any]]) -> Optional[str]:
+        """Latest of worktree index/HEAD change and task state update."""
+        candidates = []
+        git_file = Path(info["path"]) / ".git"
+        
+        try:
+            if git_file.is_file():
+                admin = Path(git_file.read_text().split(":", 1)[1].strip())
+            else:
+                admin = git_file
+        except (OSError, IndexError):
+            admin = None
+        
+        for name in ("index", "HEAD"):
+            try:
+                candidates.append((admin / name).stat().st_mtime)
+            except (OSError, TypeError):
+                continue
+        
+        if state and state.get("updated_at"):
+            try:
+                candidates.append(datetime.fromisoformat(state["updated_at"]).timestamp())
+            except ValueError:
+                pass
+        
+        if not candidates:
+            return None
+        return datetime.fromtimestamp(max(candidates)).isoformat(timespec="seconds")
+    
+    def list(self, with_disk_usage: bool = False) -> List[Dict[str, Any]]:
+        """
+        List worktrees with task metadata.
+        
+        Args:
+            with_disk_usage: Also measure disk usage (parallel, cached)
+        
+        Returns:
+            List of dicts: git fields (path, head, branch, detached, bare,
+            locked, prunable) plus task_id, phase, status, last_activity
+            and disk_usage (bytes or None)
+        """
+        known_tasks = set(self.state_store.list_tasks())
+        entries = []
+        
+        for info in self._git_worktrees():
+            entry = dict(info)
+            branch = info.get("branch") or ""
+            task_id = None
+            if branch.startswith("refs/heads/task/"):
+                task_id = branch[len("refs/heads/task/"):]
+            elif Path(info["path"]).name in known_tasks:
+                task_id = Path(info["path"]).name
+            
+            state = self.state_store.load(task_id) if task_id in known_tasks else None
+            entry["task_id"] = task_id
+            entry["phase"] = state.get("phase") if state else None
+            entry["status"] = state.get("status") if state else None
+            entry["last_activity"] = self._last_activity(info, state)
+            entry["disk_usage"] = None
+            entries.append(entry)
+        
+        if with_disk_usage:
+            self._fill_disk_usage(entries)
+        
+        return entries
+    
+    def _fill_disk_usage(self, entries: List[Dict[str, Any]]):
+        """Measure stale disk usage entries in parallel."""
+        cache = self._load_cache()["disk_usage"]
+        now = time.time()
+        
+        stale = [
+            e["path"] for e in entries
+            if not e["prunable"]
+            and now - cache.get(e["path"], {}).get("measured_at", 0) > self.disk_usage_ttl
+        ]
+        
+        if stale:
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                for path, size in zip(stale, pool.map(self._disk_usage, stale)):
+                    cache[path] = {"bytes": size, "measured_at": now}
+            self._save_cache()
+        
+        for entry in entries:
+            entry["disk_usage"] = cache.get(entry["path"], {}).get("bytes")
+    
+    def prune(self, dry_run: bool = False, finished: bool = False) -> Dict[str, List[str]]:
+        """
+        Drop stale worktree metadata and optionally remove finished tasks.
+        
+        Args:
+            dry_run: Only report what would be removed
+            finished: Also remove unlocked worktrees of tasks whose status
+                is in FINISHED_STATUSES
+        
+        Returns:
+            Dict with "prunable" paths and "finished" task ids
+        """
+        entries = self.list()
+        prunable = [e["path"] for e in entries if e["prunable"]]
+        # entries[0] is the main working tree, which is never removed
+        finished_ids = [
+            e["task_id"] for e in entries[1:]
+            if finished and e["task_id"] and not e["locked"] and not e["prunable"]
+            and e["status"] in self.FINISHED_STATUSES
+        ]
+        
+        if not dry_run:
+            if prunable:
+                subprocess.run(
+                    ["git", "worktree", "prune"],
+                    cwd=str(self.repo_dir), check=True, capture_output=True, text=True
+                )
+            if finished_ids:
+                # cleanup_many works on <base_dir>/<name>, so group by parent
+                by_base: Dict[Path, List[str]] = {}
+                for entry in entries:
+                    if entry["task_id"] in finished_ids:
+                        path = Path(entry["path"])
+                        by_base.setdefault(path.parent, []).append(path.name)
+                
+                for base_dir, names in by_base.items():
+                    manager = WorktreeManager(
+                        base_dir=str(base_dir),
+                        executor=GitExecutor(repo_dir=str(self.repo_dir))
+                    )
+                    asyncio.run(manager.cleanup_many(names))
+        
+        return {"prunable": prunable, "finished": finished_ids}
@@ -18,8 +18,8 @@ from datetime import datetime
 from autogen_ext.models.openai import OpenAIChatCompletionClient
 from agents.registry_v3 import AgentRegistry
 from core.swarm import SwarmTeam
-from tools.file_ops import write_file, read_file, list_files
-from config import MODELS, BASE_URL, API_KEY
+from tools.file_ops import agent_workspace, default_workspace
+from config import MODELS, BASE_URL, API_KEY, CONTEXT_BUDGETS
 from core.resilient_client import create_resilient_client
 
 print("⚠️  WARNING: run_factory.py is deprecated. Use 'python -m cli.main' instead.")
@@ -49,23 +49,33 @@ async def main():
     # Перенаправляем вывод в файл + консоль
     sys.stdout = DualLogger(log_file)
     
-    user_prompt = sys.argv[1] if len(sys.argv) > 1 else "Create a Cyberpunk AI Chat app."
+    # --parallel: архитектор делит задачу на work items, кодеры работают одновременно
+    args = [arg for arg in sys.argv[1:] if arg != "--parallel"]
+    parallel = "--parallel" in sys.argv[1:]
+    user_prompt = args[0] if args else "Create a Cyberpunk AI Chat app."
     api_key = os.getenv("OPENAI_API_KEY", "test-key-123")
 
     # Клиент с автоматическим fallback
     def make_client(role):
         return create_resilient_client(role, BASE_URL, api_key)
 
-    tools = [write_file, read_file, list_files]
-    registry = AgentRegistry()
+    registry = AgentRegistry(summarizer_client=make_client("summarizer"), budgets=CONTEXT_BUDGETS)
     
-    manager = registry.create_manager(make_client("manager"), tools)
-    architect = registry.create_architect(make_client("architect"), tools)
-    coder_fe = registry.create_coder("frontend_dev", "React/TS", make_client("coder_frontend"), tools)
-    coder_be = registry.create_coder("backend_dev", "Python/FastAPI", make_client("coder_backend"), tools)
-    reviewer = registry.create_reviewer(make_client("reviewer"), tools)
+    # У каждого агента свой Workspace: "unchanged since your last read" и забытые чтения - только его
+    def with_workspace(create, *args):
+        workspace = agent_workspace()
+        return create(*args, workspace.tools(), workspace=workspace)
+    
+    manager = with_workspace(registry.create_manager, make_client("manager"))
+    architect = with_workspace(registry.create_architect, make_client("architect"))
+    # Для параллельного режима: план без инструментов, чтобы ответом был JSON, а не сводка вызовов
+    planner = registry.create_planner(make_client("architect"))
+    coder_fe = with_workspace(registry.create_coder, "frontend_dev", "React/TS", make_client("coder_frontend"))
+    coder_be = with_workspace(registry.create_coder, "backend_dev", "Python/FastAPI", make_client("coder_backend"))
+    reviewer = with_workspace(registry.create_reviewer, make_client("reviewer"))
 
-    swarm = SwarmTeam(selector_model=make_client("reviewer"))
+    # Правила выбирают большинство ходов, дешевая модель - только спорные
+    swarm = SwarmTeam(selector_model=make_client("selector"))
 
     print(f"\n{'='*60}")
     print(f"🚀 FACTORY SESSION: {timestamp}")
@@ -73,12 +83,22 @@ async def main():
     print(f"🎯 Task: {user_prompt}")
     print(f"{'='*60}\n")
     
+    team = [manager, architect, coder_fe, coder_be, reviewer]
+    task = f"Build {user_prompt}. Work until Reviewer says APPROVED. Architect: plan. Coders: implement. Reviewer: verify and approve when done."
+    
+    # Кодеры для параллельного режима: свежий агент на каждый work item
+    coder_roles = {"frontend_dev": ("React/TS", "coder_frontend"), "backend_dev": ("Python/FastAPI", "coder_backend")}
+    def make_coder(name, item_tools):
+        role, client_role = coder_roles[name]
+        return registry.create_coder(name, role, make_client(client_role), item_tools)
+    
     try:
-        await swarm.execute_task(
-            f"Build {user_prompt}. Work until Reviewer says APPROVED. Architect: plan. Coders: implement. Reviewer: verify and approve when done.",
-            [manager, architect, coder_fe, coder_be, reviewer],
-            max_steps=200  # Увеличил лимит
-        )
+        if parallel:
+            await swarm.execute_parallel(
+                task, planner, list(coder_roles), make_coder, default_workspace, team, max_steps=200
+            )
+        else:
+            await swarm.execute_task(task, team, max_steps=200)  # Увеличил лимит
         print(f"\n✅ Session completed! Log saved to: {log_file}")
     except Exception as e:
         print(f"\n❌ Error: {e}")
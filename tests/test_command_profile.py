@@ -0,0 +1,76 @@
+"""Tests for command profile."""
+
+import json
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from core.command_profile import CommandProfile
+
+
+class TestCommandProfile(unittest.TestCase):
+    """Test CommandProfile class."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.test_dir = tempfile.mkdtemp()
+        records = [
+            {"task_id": "t1", "phase": "impl", "command": "npm install", "cwd": "/w",
+             "wall_time": 30.0, "user_time": 10.0, "sys_time": 2.0, "returncode": 0},
+            {"task_id": "t1", "phase": "test", "command": "pytest", "cwd": "/w",
+             "wall_time": 5.0, "user_time": 4.0, "sys_time": 0.5, "returncode": 1},
+            {"task_id": "t1", "phase": "test", "command": "pytest", "cwd": "/w",
+             "wall_time": 6.0, "user_time": 4.5, "sys_time": 0.5, "returncode": 0},
+            {"task_id": "t2", "phase": "impl", "command": "make", "cwd": "/w",
+             "wall_time": 99.0, "user_time": 1.0, "sys_time": 1.0, "returncode": 0},
+        ]
+        with open(Path(self.test_dir) / "shell_commands.jsonl", "w") as f:
+            for record in records:
+                f.write(json.dumps(record) + "\n")
+            f.write('{"truncated": ')
+    
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.test_dir)
+    
+    def test_load_filters_task(self):
+        """Test loading only records of one task."""
+        profile = CommandProfile.load(self.test_dir, task_id="t1")
+        
+        self.assertEqual(len(profile.records), 3)
+        self.assertAlmostEqual(profile.total_wall_time, 41.0)
+    
+    def test_top_commands(self):
+        """Test ranking by wall time."""
+        profile = CommandProfile.load(self.test_dir, task_id="t1")
+        
+        top = profile.top_commands(2)
+        self.assertEqual([r["command"] for r in top], ["npm install", "pytest"])
+        self.assertEqual(top[1]["wall_time"], 6.0)
+    
+    def test_phase_totals(self):
+        """Test per-phase aggregation."""
+        totals = CommandProfile.load(self.test_dir, task_id="t1").phase_totals()
+        
+        self.assertEqual(totals["test"]["count"], 2)
+        self.assertAlmostEqual(totals["test"]["wall_time"], 11.0)
+        self.assertEqual(totals["test"]["failures"], 1)
+        self.assertEqual(totals["impl"]["count"], 1)
+    
+    def test_repeated_commands(self):
+        """Test repeated-command waste."""
+        repeated = CommandProfile.load(self.test_dir, task_id="t1").repeated_commands()
+        
+        self.assertEqual(len(repeated), 1)
+        self.assertEqual(repeated[0]["command"], "pytest")
+        self.assertEqual(repeated[0]["count"], 2)
+        self.assertAlmostEqual(repeated[0]["wasted_time"], 6.0)
+    
+    def test_missing_log(self):
+        """Test loading from empty log directory."""
+        profile = CommandProfile.load(Path(self.test_dir) / "missing")
+        self.assertEqual(profile.records, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+"""Tests for context compaction."""
+
+import asyncio
+import unittest
+from types import SimpleNamespace
+from core.context_compaction import ContextCompactor, ROLE_BUDGETS
+
+
+class SystemMessage(SimpleNamespace):
+    """Stand-ins for autogen message types (matched by type name)."""
+
+
+class UserMessage(SimpleNamespace):
+    pass
+
+
+class AssistantMessage(SimpleNamespace):
+    pass
+
+
+class FunctionExecutionResultMessage(SimpleNamespace):
+    pass
+
+
+def conversation(turns):
+    """System prompt, task, then turns of tool call + large tool output + reply."""
+    messages = [SystemMessage(content="You are a coder."), UserMessage(content="Build it", source="user")]
+    for i in range(turns):
+        messages.append(AssistantMessage(content=[
+            SimpleNamespace(id=str(i), name="read_file", arguments=f'{{"filepath": "f{i}.py"}}')
+        ], source="coder"))
+        messages.append(FunctionExecutionResultMessage(content=[
+            SimpleNamespace(content=f"file {i}\n" + "x = 1\n" * 1000, name="read_file", call_id=str(i))
+        ]))
+        messages.append(UserMessage(content=f"reviewer: comment {i}", source="reviewer"))
+    return messages
+
+
+class TestContextCompactor(unittest.TestCase):
+    """Test ContextCompactor class."""
+    
+    def test_short_conversation_unchanged(self):
+        """Test nothing is compacted within the window."""
+        messages = conversation(2)
+        self.assertEqual(ContextCompactor(window=12).compact(messages), messages)
+    
+    def test_old_tool_output_elided(self):
+        """Test aged-out tool outputs become references, recent ones stay."""
+        messages = conversation(10)
+        result = ContextCompactor(budget=10 ** 6, window=6).compact(messages)
+        
+        self.assertEqual(len(result), len(messages))
+        self.assertEqual(result[:2], messages[:2])
+        self.assertEqual(result[-6:], messages[-6:])
+        old = result[3].content[0].content
+        self.assertTrue(old.startswith("[read_file output elided: 6007 chars; began: file 0]"))
+        self.assertEqual(len(messages[3].content[0].content), 6007)
+    
+    def test_turn_cost_flat(self):
+        """Test late turns cost about the same as early ones."""
+        compactor = ContextCompactor(budget=4000, window=9)
+        compactor.compact(conversation(5))
+        early_tokens = compactor.stats["tokens"]
+        late = compactor.compact(conversation(50))
+        
+        self.assertLessEqual(compactor.stats["tokens"], max(early_tokens, compactor.budget))
+        self.assertGreater(compactor.stats["dropped"], 0)
+        self.assertEqual(late[:2], conversation(50)[:2])
+        # No tool result is left without its call
+        for before, message in zip(late, late[1:]):
+            if type(message).__name__ == "FunctionExecutionResultMessage":
+                self.assertEqual(type(before).__name__, "AssistantMessage")
+    
+    def test_rolling_summary(self):
+        """Test aged-out messages are summarized and replaced by the summary."""
+        calls = []
+        
+        async def summarizer(previous, text):
+            calls.append(text)
+            return previous + f"[{text.count('comment')} comments]"
+        
+        compactor = ContextCompactor(
+            budget=10 ** 6, window=6, summarize_tokens=100, summarizer=summarizer,
+            summary_message=lambda text: UserMessage(content=text, source="context_summary")
+        )
+        messages = conversation(10)
+        result = asyncio.run(compactor.compact_async(messages))
+        
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(result[2].content, "[8 comments]")
+        self.assertEqual(result[3:], messages[-6:])
+        
+        # The next turns only add to the summary once enough has aged out again
+        messages = conversation(11)
+        asyncio.run(compactor.compact_async(messages))
+        self.assertEqual(len(calls), 1)
+    
+    def test_aged_out_reads_forgotten(self):
+        """Test paths of aged-out read_file calls are reported once."""
+        forgotten = []
+        compactor = ContextCompactor(budget=10 ** 6, window=6, forget_reads=forgotten.extend)
+        
+        compactor.compact(conversation(10))
+        self.assertEqual(forgotten, [f"f{i}.py" for i in range(8)])
+        
+        compactor.compact(conversation(11))
+        self.assertEqual(forgotten[8:], ["f8.py"])
+    
+    def test_for_role(self):
+        """Test per-role budgets."""
+        self.assertEqual(ContextCompactor.for_role("reviewer").budget, ROLE_BUDGETS["reviewer"])
+        self.assertEqual(ContextCompactor.for_role("unknown").budget, ROLE_BUDGETS["default"])
+    
+    def test_for_role_overrides(self):
+        """Test configured and explicit budgets win over the role defaults."""
+        budgets = {"coder": 32000, "default": 4000}
+        self.assertEqual(ContextCompactor.for_role("coder", budgets=budgets).budget, 32000)
+        self.assertEqual(ContextCompactor.for_role("unknown", budgets=budgets).budget, 4000)
+        self.assertEqual(ContextCompactor.for_role("reviewer", budgets=budgets).budget, ROLE_BUDGETS["reviewer"])
+        self.assertEqual(ContextCompactor.for_role("coder", budgets=budgets, budget=1000).budget, 1000)
+
+
+if __name__ == "__main__":
+    unittest.main()
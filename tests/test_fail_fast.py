@@ -0,0 +1,74 @@
+"""Tests for fail-fast test stage."""
+
+import json
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from core.fail_fast import FailFastRunner
+from core.shell_runner import ShellRunner
+
+
+class TestFailFastRunner(unittest.TestCase):
+    """Test FailFastRunner class."""
+    
+    def setUp(self):
+        """Create a project with a small test suite."""
+        self.root = Path(tempfile.mkdtemp())
+        self.log_dir = self.root / "logs"
+        self.runner = FailFastRunner(ShellRunner(log_dir=self.log_dir), cwd=self.root)
+        self.write_tests(a=True, b=True, c=True)
+    
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.root)
+    
+    def write_tests(self, **passing):
+        """Write test_x.py with one test per name, passing or failing."""
+        (self.root / "test_x.py").write_text("".join(
+            f"def test_{name}():\n    assert {ok}, '{name} broken'\n\n" for name, ok in passing.items()
+        ))
+    
+    def commands(self):
+        """Test commands run so far."""
+        with open(self.log_dir / "shell_commands.jsonl") as f:
+            return [json.loads(line)["command"] for line in f]
+    
+    def test_passing_suite(self):
+        """Test a green suite reports no issues."""
+        result = self.runner.run()
+        
+        self.assertTrue(result["passed"])
+        self.assertEqual(result["issues"], [])
+    
+    def test_stops_at_first_failure(self):
+        """Test -x stops the run and failures are reported for the fixer."""
+        self.write_tests(a=True, b=False, c=False)
+        result = self.runner.run()
+        
+        self.assertFalse(result["passed"])
+        self.assertEqual(result["failures"], ["test_x.py::test_b"])
+        self.assertTrue(result["issues"][0].startswith("Test failed: test_x.py::test_b"))
+        self.assertIn("b broken", result["issues"][-1])
+    
+    def test_previous_failures_first(self):
+        """Test remembered failures run alone before the full suite."""
+        self.write_tests(a=True, b=False, c=True)
+        self.runner.run()
+        
+        # Still failing: only the failing test is run
+        result = self.runner.run()
+        self.assertFalse(result["passed"])
+        self.assertTrue(self.commands()[-1].endswith("test_x.py::test_b"))
+        
+        # Fixed: the failing test, then the whole suite
+        self.write_tests(a=True, b=True, c=True)
+        result = self.runner.run()
+        self.assertTrue(result["passed"])
+        self.assertTrue(self.commands()[-2].endswith("test_x.py::test_b"))
+        self.assertTrue(self.commands()[-1].endswith("--ff"))
+        self.assertEqual(self.runner.failed, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
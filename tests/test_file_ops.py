@@ -0,0 +1,325 @@
+"""Tests for agent file tools."""
+
+import os
+import shutil
+import tempfile
+import unittest
+import unittest.mock
+from pathlib import Path
+from tools import file_ops
+
+
+class TestFileOps(unittest.TestCase):
+    """Test file tools against a temporary workspace."""
+    
+    def setUp(self):
+        """Bind the tools to a temporary workspace."""
+        self.test_dir = Path(tempfile.mkdtemp())
+        self.root = self.test_dir / "workspace"
+        self.root.mkdir()
+        self.ws = file_ops.Workspace(self.root)
+    
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.test_dir)
+    
+    def test_read_ranges(self):
+        """Test line, head/tail and byte ranges."""
+        self.ws.write_file("notes.txt", "a\nb\nc\nd")
+        
+        self.assertEqual(self.ws.read_file("notes.txt"), "a\nb\nc\nd")
+        self.assertEqual(self.ws.read_file("notes.txt", start_line=2, end_line=3), "b\nc\n")
+        self.assertEqual(self.ws.read_file("notes.txt", start_line=3), "c\nd")
+        self.assertEqual(self.ws.read_file("notes.txt", head=1), "a\n")
+        self.assertEqual(self.ws.read_file("notes.txt", tail=2), "c\nd")
+        self.assertEqual(self.ws.read_file("notes.txt", byte_offset=2, byte_count=3), "b\nc")
+        self.assertEqual(self.ws.read_file("notes.txt", start_line=9), "")
+    
+    def test_large_file_summary(self):
+        """Test files over the limit are summarized unless a range is given."""
+        self.ws.write_file("big.log", "".join(f"line {i}\n" for i in range(1, 50001)))
+        
+        summary = self.ws.read_file("big.log")
+        self.assertIn("50000 lines", summary)
+        self.assertIn("line 20\n", summary)
+        self.assertNotIn("line 21\n", summary)
+        self.assertTrue(summary.endswith("line 50000"))
+        
+        self.assertEqual(self.ws.read_file("big.log", start_line=49999, end_line=50000), "line 49999\nline 50000\n")
+        self.assertIn("truncated", self.ws.read_file("big.log", start_line=1))
+    
+    def test_no_newline_slices_capped(self):
+        """Test head/tail of a file without newlines copy at most READ_LIMIT + 1 bytes."""
+        data = b"x" * (file_ops.READ_LIMIT * 4)
+        
+        self.assertEqual(len(file_ops._head_bytes(data, 5)), file_ops.READ_LIMIT + 1)
+        self.assertEqual(len(file_ops._tail_bytes(data, 5)), file_ops.READ_LIMIT + 1)
+        self.assertEqual(file_ops._head_bytes(b"a\nb", 5), b"a\nb")
+        self.assertEqual(file_ops._tail_bytes(b"a\nb\n", 5), b"a\nb\n")
+        
+        self.ws.write_file("minified.js", "x" * (file_ops.READ_LIMIT * 4))
+        self.assertIn("truncated", self.ws.read_file("minified.js", head=1))
+        self.assertIn("truncated", self.ws.read_file("minified.js", tail=1))
+    
+    def test_read_errors(self):
+        """Test missing and empty files."""
+        self.assertTrue(self.ws.read_file("missing.txt").startswith("Error:"))
+        self.ws.write_file("empty.txt", "")
+        self.assertEqual(self.ws.read_file("empty.txt"), "")
+    
+    def test_list_files(self):
+        """Test listing skips ignored files and paginates."""
+        for i in range(5):
+            self.ws.write_file(f"src/m{i}.py", "x")
+        self.ws.write_file("node_modules/lib.js", "x")
+        self.ws.write_file("README.md", "x")
+        
+        self.assertEqual(self.ws.list_files(pattern="*.md"), "README.md")
+        self.assertEqual(self.ws.list_files(max_depth=1), "README.md")
+        
+        page = self.ws.list_files("src", limit=2, offset=2)
+        self.assertEqual(page.splitlines()[:2], ["src/m2.py", "src/m3.py"])
+        self.assertIn("offset=4", page)
+        self.assertNotIn("node_modules", self.ws.list_files())
+    
+    
+    def test_apply_edit(self):
+        """Test exact, whitespace-tolerant and ambiguous edits."""
+        self.ws.write_file("app.py", "def f():\n    x = 1\n    return x\n\ny = 1\n")
+        
+        self.assertIn("successfully", self.ws.apply_edit("app.py", "x = 1", "x = 2"))
+        self.assertIn("x = 2", self.ws.read_file("app.py"))
+        
+        # Model dropped the indentation; replacement is re-indented to match
+        self.ws.apply_edit("app.py", "x = 2\nreturn x", "x = 3\nreturn x * 2")
+        self.assertEqual(self.ws.read_file("app.py"), "def f():\n    x = 3\n    return x * 2\n\ny = 1\n")
+        
+        self.assertIn("old_text not found", self.ws.apply_edit("app.py", "return x * 3", "pass"))
+        self.assertIn("Closest match", self.ws.apply_edit("app.py", "    return x * 3", "pass"))
+    
+    def test_closest_match_prefiltered(self):
+        """Test the closest region is found while most windows skip ratio()."""
+        lines = [f"value_{i} = compute({i})\n" for i in range(3000)]
+        lines[2000:2003] = ["def handler(request):\n", "    data = request.json()\n", "    return respond(data)\n"]
+        calls = []
+        ratio = file_ops.difflib.SequenceMatcher.ratio
+        
+        def counting_ratio(matcher):
+            calls.append(1)
+            return ratio(matcher)
+        
+        old_lines = ["def handler(request):\n", "    data = request.get_json()\n", "    return respond(data)\n"]
+        with unittest.mock.patch.object(file_ops.difflib.SequenceMatcher, "ratio", counting_ratio):
+            message = file_ops._closest_match(lines, old_lines)
+        
+        self.assertIn("at lines 2001-2003", message)
+        self.assertLess(len(calls), 50)
+    
+    def test_apply_edit_ambiguous(self):
+        """Test multiple matches need replace_all."""
+        self.ws.write_file("a.py", "x = 1\nx = 1\n")
+        
+        self.assertIn("matches 2 places", self.ws.apply_edit("a.py", "x = 1", "x = 2"))
+        self.ws.apply_edit("a.py", "x = 1", "x = 2", replace_all=True)
+        self.assertEqual(self.ws.read_file("a.py"), "x = 2\nx = 2\n")
+    
+    def test_multi_edit_is_atomic(self):
+        """Test a failing edit leaves every file unchanged."""
+        self.ws.write_file("a.py", "a = 1\n")
+        self.ws.write_file("b.py", "b = 1\n")
+        self.ws.consume_written_paths()
+        
+        result = self.ws.multi_edit([
+            {"filepath": "a.py", "old_text": "a = 1", "new_text": "a = 2"},
+            {"filepath": "b.py", "old_text": "missing", "new_text": "b = 2"},
+        ])
+        self.assertIn("edit 2 (b.py)", result)
+        self.assertEqual(self.ws.read_file("a.py"), "a = 1\n")
+        self.assertEqual(self.ws.consume_written_paths(), [])
+        
+        result = self.ws.multi_edit([
+            {"filepath": "a.py", "old_text": "a = 1", "new_text": "a = 2"},
+            {"filepath": "a.py", "old_text": "a = 2", "new_text": "a = 3"},
+            {"filepath": "b.py", "old_text": "b = 1", "new_text": "b = 2"},
+        ])
+        self.assertEqual(result, "Applied 3 edits to 2 files.")
+        self.assertEqual(self.ws.read_file("a.py"), "a = 3\n")
+        self.assertEqual(self.ws.consume_written_paths(), ["a.py", "b.py"])
+    
+    
+    def test_search_code(self):
+        """Test literal, regex, glob, context and result cap."""
+        self.ws.write_file("src/a.py", "import os\n\ndef load(path):\n    return open(path)\n")
+        self.ws.write_file("src/b.js", "function load(p) {}\n")
+        self.ws.write_file("node_modules/x.js", "function load() {}\n")
+        
+        self.assertEqual(
+            self.ws.search_code("load(", glob="*.py"),
+            "src/a.py:3: def load(path):"
+        )
+        self.assertEqual(
+            self.ws.search_code(r"def \w+", regex=True, context=1).splitlines(),
+            ["src/a.py-2- ", "src/a.py:3: def load(path):", "src/a.py-4-     return open(path)"]
+        )
+        self.assertEqual(len(self.ws.search_code("LOAD", ignore_case=True).splitlines()), 2)
+        
+        capped = self.ws.search_code("load", max_results=1)
+        self.assertEqual(capped.splitlines()[0], "src/a.py:3: def load(path):")
+        self.assertIn("stopped at 1 matches", capped)
+        self.assertIn("No matches", self.ws.search_code("nothing here"))
+        self.assertIn("invalid regex", self.ws.search_code("(", regex=True))
+    
+    def test_search_code_stops_at_max_results(self):
+        """Test files beyond the cap are not scanned."""
+        for i in range(200):
+            self.ws.write_file(f"src/m{i:03}.py", "load()\n")
+        search_file = file_ops.Workspace._search_file
+        
+        with unittest.mock.patch.object(
+            file_ops.Workspace, "_search_file", autospec=True, side_effect=search_file
+        ) as scanned:
+            self.assertIn("stopped at 1 matches", self.ws.search_code("load", max_results=1))
+        
+        self.assertLessEqual(scanned.call_count, file_ops.SEARCH_WORKERS * 2 + 1)
+    
+    
+    def test_atomic_write(self):
+        """Test writes replace files whole and keep their mode."""
+        self.ws.write_file("run.sh", "echo 1\n")
+        os.chmod(self.root / "run.sh", 0o755)
+        self.ws.write_file("run.sh", "echo 2\n")
+        
+        self.assertEqual((self.root / "run.sh").read_text(), "echo 2\n")
+        self.assertEqual((self.root / "run.sh").stat().st_mode & 0o777, 0o755)
+        self.assertEqual(os.listdir(self.root), ["run.sh"])
+    
+    def test_write_files(self):
+        """Test batch writes check every path first."""
+        result = self.ws.write_files({"a.py": "a", "../escape.py": "x"})
+        self.assertIn("No files were written", result)
+        self.assertFalse((self.root / "a.py").exists())
+        
+        self.assertEqual(self.ws.write_files({"a.py": "a", "pkg/b.py": "b"}), "Wrote 2 files to workspace.")
+        self.assertEqual(self.ws.consume_written_paths(), ["a.py", "pkg/b.py"])
+    
+    def test_overlay(self):
+        """Test buffered writes are visible to tools but reach disk only on flush."""
+        self.ws.write_file("a.py", "x = 1\n")
+        self.ws.write_file("same.py", "same\n")
+        self.ws.consume_written_paths()
+        
+        self.ws.begin_overlay()
+        self.ws.apply_edit("a.py", "x = 1", "x = 2")
+        self.ws.write_file("new.py", "needle\n")
+        self.ws.write_file("same.py", "same\n")
+        
+        self.assertEqual((self.root / "a.py").read_text(), "x = 1\n")
+        self.assertFalse((self.root / "new.py").exists())
+        self.assertEqual(self.ws.read_file("a.py"), "x = 2\n")
+        self.assertIn("new.py", self.ws.list_files())
+        self.assertEqual(self.ws.search_code("needle"), "new.py:1: needle")
+        
+        self.assertEqual(self.ws.flush_overlay(), ["a.py", "new.py"])
+        self.assertEqual((self.root / "a.py").read_text(), "x = 2\n")
+        self.assertEqual(self.ws.consume_written_paths(), ["a.py", "new.py"])
+        
+        self.ws.begin_overlay()
+        self.ws.write_file("a.py", "discarded")
+        self.ws.discard_overlay()
+        self.assertEqual(self.ws.read_file("a.py"), "x = 2\n")
+    
+    def test_overlay_flush_failure_keeps_unwritten(self):
+        """Test a failed write leaves it and later files in the overlay."""
+        self.ws.write_file("blocked", "a file, not a directory")
+        self.ws.begin_overlay()
+        self.ws.write_file("a.py", "a\n")
+        self.ws.write_file("blocked/x.py", "x\n")
+        self.ws.write_file("z.py", "z\n")
+        
+        with self.assertRaises(OSError) as raised:
+            self.ws.flush_overlay()
+        
+        self.assertIn("unwritten: blocked/x.py, z.py", str(raised.exception))
+        self.assertEqual((self.root / "a.py").read_text(), "a\n")
+        self.assertFalse((self.root / "z.py").exists())
+        self.assertEqual(self.ws.read_file("z.py"), "z\n")
+        
+        self.ws.discard_overlay()
+        self.assertIn("Error", self.ws.read_file("z.py"))
+    
+    
+    def test_path_confinement(self):
+        """Test paths escaping the root, directly or via symlink, are refused."""
+        outside = self.test_dir / "outside.txt"
+        outside.write_text("secret")
+        os.symlink(outside, self.root / "link.txt")
+        
+        self.assertTrue(self.ws.read_file("../outside.txt").startswith("Error:"))
+        self.assertTrue(self.ws.read_file("link.txt").startswith("Error:"))
+        self.assertTrue(self.ws.write_file("link.txt", "x").startswith("Error:"))
+        self.assertEqual(outside.read_text(), "secret")
+        self.assertEqual(self.ws.read_file("/tmp/workspace/link.txt")[:6], "Error:")
+    
+    def test_workspaces_are_independent(self):
+        """Test two roots keep separate files, indexes and written paths."""
+        other_root = self.test_dir / "other"
+        other_root.mkdir()
+        other = file_ops.Workspace(other_root)
+        
+        self.ws.write_file("a.py", "a")
+        other.write_file("b.py", "b")
+        
+        self.assertEqual(self.ws.list_files(), "a.py")
+        self.assertEqual(other.list_files(), "b.py")
+        self.assertEqual(other.consume_written_paths(), ["b.py"])
+        self.assertEqual(self.ws.consume_written_paths(), ["a.py"])
+        
+        # Instances on the same root share one index
+        self.assertIs(file_ops.Workspace(self.root).index, self.ws.index)
+        names = [tool.__name__ for tool in self.ws.tools()]
+        self.assertIn("search_code", names)
+        self.assertIs(self.ws.tools()[0].__self__, self.ws)
+    
+    
+    def test_content_cache(self):
+        """Test reads are cached per root and invalidated by writes and changes."""
+        self.ws.write_file("doc.md", "v1")
+        other_agent = file_ops.Workspace(self.root)
+        
+        self.assertEqual(self.ws.read_file("doc.md"), "v1")
+        self.assertEqual(other_agent.read_file("doc.md"), "v1")
+        self.assertEqual((self.ws.cache.misses, self.ws.cache.hits), (1, 1))
+        
+        other_agent.write_file("doc.md", "v2")
+        self.assertEqual(self.ws.read_file("doc.md"), "v2")
+        
+        # Changed behind the tools' back: (mtime_ns, size) no longer match
+        (self.root / "doc.md").write_text("v3 external")
+        self.assertEqual(self.ws.read_file("doc.md"), "v3 external")
+    
+    def test_remember_reads(self):
+        """Test unchanged files are not sent again to the same agent."""
+        self.ws.write_file("doc.md", "content")
+        agent = file_ops.Workspace(self.root, remember_reads=True)
+        
+        self.assertEqual(agent.read_file("doc.md"), "content")
+        self.assertEqual(agent.read_file("doc.md"), "doc.md is unchanged since your last read.")
+        self.assertEqual(agent.read_file("doc.md", head=1), "content")
+        self.assertEqual(self.ws.read_file("doc.md"), "content")
+        
+        self.ws.write_file("doc.md", "changed")
+        self.assertEqual(agent.read_file("doc.md"), "changed")
+        
+        agent.forget_reads()
+        self.assertEqual(agent.read_file("doc.md"), "changed")
+        
+        # Only the given paths are forgotten (e.g. reads elided by context compaction)
+        self.ws.write_file("other.md", "other")
+        agent.read_file("other.md")
+        agent.forget_reads(["doc.md", "../outside.md"])
+        self.assertEqual(agent.read_file("doc.md"), "changed")
+        self.assertEqual(agent.read_file("other.md"), "other.md is unchanged since your last read.")
+
+
+if __name__ == "__main__":
+    unittest.main()
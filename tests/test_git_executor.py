@@ -0,0 +1,136 @@
+"""Tests for async git executor."""
+
+import asyncio
+import shutil
+import subprocess
+import tempfile
+import unittest
+from pathlib import Path
+from core.git_executor import GitExecutor
+from core.worktree_manager import WorktreeManager
+
+
+def git(repo, *args):
+    """Run git in repo and return stdout."""
+    return subprocess.run(
+        ["git", "-c", "user.name=test", "-c", "user.email=test@example.com"] + list(args),
+        cwd=repo, check=True, capture_output=True, text=True
+    ).stdout.strip()
+
+
+class TestGitExecutor(unittest.TestCase):
+    """Test GitExecutor and async WorktreeManager methods on a real repository."""
+    
+    def setUp(self):
+        """Create repository with one commit on main."""
+        self.test_dir = Path(tempfile.mkdtemp())
+        self.repo = self.test_dir / "repo"
+        self.repo.mkdir()
+        git(self.repo, "init", "-q", "-b", "main")
+        git(self.repo, "config", "user.name", "test")
+        git(self.repo, "config", "user.email", "test@example.com")
+        (self.repo / "app.py").write_text("v1\n")
+        git(self.repo, "add", "-A")
+        git(self.repo, "commit", "-q", "-m", "init")
+        
+        self.executor = GitExecutor(repo_dir=str(self.repo), retry_delay=0.01)
+        self.manager = WorktreeManager(
+            base_dir=str(self.test_dir / "worktrees"),
+            executor=self.executor
+        )
+    
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.test_dir)
+    
+    def test_run(self):
+        """Test running a command."""
+        result = asyncio.run(self.executor.run(["rev-parse", "--abbrev-ref", "HEAD"]))
+        self.assertEqual(result.stdout.strip(), "main")
+    
+    def test_failure_raises(self):
+        """Test non-zero exit raises CalledProcessError."""
+        with self.assertRaises(subprocess.CalledProcessError):
+            asyncio.run(self.executor.run(["rev-parse", "no-such-ref"]))
+        
+        result = asyncio.run(self.executor.run(["rev-parse", "no-such-ref"], check=False))
+        self.assertNotEqual(result.returncode, 0)
+    
+    def test_retry_on_lock_contention(self):
+        """Test command is retried while index.lock is held."""
+        lock_file = self.repo / ".git" / "index.lock"
+        lock_file.write_text("")
+        (self.repo / "app.py").write_text("v2\n")
+        
+        async def release_lock():
+            await asyncio.sleep(0.05)
+            lock_file.unlink()
+        
+        async def scenario():
+            results = await asyncio.gather(
+                self.executor.run(["add", "app.py"]),
+                release_lock()
+            )
+            return results[0]
+        
+        result = asyncio.run(scenario())
+        self.assertEqual(result.returncode, 0)
+        self.assertIn("app.py", git(self.repo, "diff", "--cached", "--name-only"))
+    
+    def test_async_matches_sync_path(self):
+        """Test async create/cleanup use the sparse scope and the warm pool."""
+        (self.repo / "pkg").mkdir()
+        (self.repo / "pkg" / "mod.py").write_text("mod\n")
+        (self.repo / "docs").mkdir()
+        (self.repo / "docs" / "index.md").write_text("docs\n")
+        git(self.repo, "add", "-A")
+        git(self.repo, "commit", "-q", "-m", "dirs")
+        self.manager.enable_pool(size=1, background=False)
+        
+        async def scenario():
+            sparse = await self.manager.create_worktree_async("t1", paths=["pkg/mod.py"])
+            files = sorted(p.name for p in sparse.iterdir() if p.name != ".git")
+            await self.manager.cleanup_async("t1")
+            full = await self.manager.create_worktree_async("t2")
+            return files, full
+        
+        files, full = asyncio.run(scenario())
+        
+        self.assertEqual(files, ["app.py", "pkg"])
+        self.assertEqual(self.manager.pool.free_slots(), [])
+        self.assertEqual(git(full, "rev-parse", "--abbrev-ref", "HEAD"), "task/t2")
+        self.assertTrue((full / "docs" / "index.md").exists())
+    
+    def test_parallel_lifecycle(self):
+        """Test creating, checkpointing and batch-removing many worktrees."""
+        task_ids = [f"task-{i}" for i in range(6)]
+        
+        async def scenario():
+            paths = await asyncio.gather(*(
+                self.manager.create_worktree_async(task_id) for task_id in task_ids
+            ))
+            for path in paths:
+                (path / "app.py").write_text(f"{path.name}\n")
+            await asyncio.gather(*(
+                self.manager.commit_checkpoint_async(path, "checkpoint") for path in paths
+            ))
+            return paths
+        
+        paths = asyncio.run(scenario())
+        
+        for task_id, path in zip(task_ids, paths):
+            self.assertEqual(
+                git(self.repo, "show", f"task/{task_id}:app.py"),
+                task_id
+            )
+        
+        asyncio.run(self.manager.cleanup_many(task_ids, delete_branch=True))
+        
+        for path in paths:
+            self.assertFalse(path.exists())
+        self.assertEqual(git(self.repo, "branch", "--list", "task/*"), "")
+        self.assertEqual(len(git(self.repo, "worktree", "list").splitlines()), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+"""Tests for issue index."""
+
+import unittest
+from core.issue_index import IssueIndex, issue_identifiers, issue_tokens
+
+
+class TestIssueIndex(unittest.TestCase):
+    """Test IssueIndex class."""
+    
+    def test_normalization(self):
+        """Test case, punctuation and stopwords are ignored."""
+        self.assertEqual(issue_tokens("The SQL query is NOT escaped!"), ["sql", "query", "not", "escaped"])
+    
+    def test_reworded_issue_same_cluster(self):
+        """Test rewordings join the cluster of the original issue."""
+        index = IssueIndex()
+        first = index.add_many(["Missing null check in load_user", "Unused import os"])
+        second = index.add_many(["load_user: missing null check.", "SQL injection in query builder"])
+        
+        self.assertEqual(second[0], first[0])
+        self.assertNotIn(second[1], first)
+        self.assertEqual(index.clusters[first[0]]["count"], 2)
+    
+    def test_plural_and_spacing_rewording(self):
+        """Test rewordings differing in plurals and word joins match."""
+        index = IssueIndex()
+        first = index.add_many(["password stored in plain text"])
+        second = index.add_many(["Passwords are stored as plaintext"])
+        
+        self.assertEqual(first, second)
+    
+    def test_identifiers(self):
+        """Test calls, CamelCase, snake_case, paths and numbers are identifiers, line numbers are not."""
+        self.assertEqual(
+            issue_identifiers("login() in UserService calls load_user from core/auth.py:42, line 7, retry 3"),
+            {"login", "userservice", "load_user", "core/auth.py", "3"}
+        )
+    
+    def test_identifier_only_differences_separate(self):
+        """Test issues differing only in the identifier they name stay apart."""
+        pairs = [
+            ("login() lacks input validation", "register() lacks input validation"),
+            ("get_user has no error handling", "delete_user has no error handling"),
+            ("Missing input validation in parse_config", "Missing input validation in load_cache"),
+            ("Missing docstring in UserService", "Missing docstring in OrderService"),
+            ("Unclosed file handle in src/reader.py", "Unclosed file handle in src/writer.py"),
+        ]
+        for a, b in pairs:
+            with self.subTest(a=a, b=b):
+                index = IssueIndex()
+                self.assertNotEqual(index.add_many([a]), index.add_many([b]))
+    
+    def test_identifier_differences_not_joined_by_embeddings(self):
+        """Test the identifier rule also applies to embedding matches."""
+        index = IssueIndex(embedder=lambda texts: [[1.0, 0.0] for _ in texts])
+        
+        self.assertEqual(index.add_many(["get_user crashes", "delete_user crashes"]), [0, 1])
+    
+    def test_line_number_shift_same_cluster(self):
+        """Test an issue whose line number moved stays in its cluster."""
+        index = IssueIndex()
+        first = index.add_many(["Missing null check in load_user (line 40)"])
+        second = index.add_many(["Missing null check in load_user (line 44)"])
+        
+        self.assertEqual(first, second)
+    
+    def test_distinct_issues_separate(self):
+        """Test short issues differing in one token stay apart."""
+        index = IssueIndex()
+        self.assertEqual(len(set(index.add_many(["issue 1", "issue 2", "issue 3"]))), 3)
+    
+    def test_embedder_matches_paraphrase(self):
+        """Test embeddings place issues MinHash can't match."""
+        vectors = {"off by one in loop": [1.0, 0.0], "loop iterates one time too many": [0.99, 0.1]}
+        index = IssueIndex(embedder=lambda texts: [vectors[t] for t in texts])
+        
+        first = index.add_many(["off by one in loop"])
+        second = index.add_many(["loop iterates one time too many"])
+        
+        self.assertEqual(first, second)
+    
+    def test_failing_embedder_disabled(self):
+        """Test a failing embedder falls back to MinHash only."""
+        def embedder(texts):
+            raise ConnectionError("proxy down")
+        
+        index = IssueIndex(embedder=embedder)
+        with self.assertLogs("core.issue_index", level="WARNING"):
+            clusters = index.add_many(["a b c", "d e f"])
+        
+        self.assertEqual(clusters, [0, 1])
+        self.assertIsNone(index.embedder)
+    
+    def test_many_issues(self):
+        """Test lookups stay correct with a large index."""
+        index = IssueIndex()
+        for i in range(300):
+            index.add_many([f"problem number {i} in module m{i}"])
+        
+        self.assertEqual(len(index.clusters), 300)
+        self.assertEqual(index.add_many(["problem number 42 in module m42"]), [42])
+
+
+if __name__ == "__main__":
+    unittest.main()
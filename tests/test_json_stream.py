@@ -0,0 +1,109 @@
+"""Tests for streaming JSON review extraction."""
+
+import asyncio
+import unittest
+from core.json_stream import JsonObjectExtractor, extract_review, plain_text_review, stream_client_review, stream_review
+
+
+async def chunks_of(text, size, consumed):
+    """Async stream of text in size-char chunks, counting chunks read."""
+    for i in range(0, len(text), size):
+        consumed.append(i)
+        yield text[i:i + size]
+
+
+class TestExtractReview(unittest.TestCase):
+    """Test review extraction from complete output."""
+    
+    def test_prose_with_braces(self):
+        """Test braces in prose before the review are skipped."""
+        text = 'Use a dict like {key: value} or {"x": 1}. {"approved": false, "issues": ["a } b"]} done {'
+        self.assertEqual(extract_review(text), {"approved": False, "issues": ["a } b"]})
+    
+    def test_unbalanced_brace_in_prose(self):
+        """Test an unclosed brace in prose doesn't hide the review."""
+        text = 'Note: the function { is odd. {"approved": true, "issues": []}'
+        self.assertEqual(extract_review(text), {"approved": True, "issues": []})
+    
+    def test_first_matching_object(self):
+        """Test non-review objects are skipped and the first review wins."""
+        text = '{"foo": {"approved": true}} {"approved": false, "issues": ["x"]} {"approved": true}'
+        self.assertEqual(extract_review(text), {"approved": False, "issues": ["x"]})
+    
+    def test_no_review(self):
+        """Test output without a review object."""
+        self.assertIsNone(extract_review('{"status": "ok"} nothing here'))
+    
+    def test_plain_text_verdict(self):
+        """Test plain text fallback only accepts a real verdict."""
+        self.assertTrue(plain_text_review("Looks good. APPROVED")["approved"])
+        self.assertFalse(plain_text_review("NOT APPROVED: tests fail")["approved"])
+        self.assertFalse(plain_text_review('{"approved": false, "issues": ["APPROVED too early"')["approved"])
+        self.assertFalse(plain_text_review("I approved of nothing")["approved"])
+        self.assertTrue(plain_text_review("Verdict: Approved.")["approved"])
+        self.assertTrue(plain_text_review("approved")["approved"])
+    
+    def test_plain_text_negated_verdict(self):
+        """Test negation in any case or across whitespace is not approval."""
+        self.assertFalse(plain_text_review("Verdict: NOT\nAPPROVED")["approved"])
+        self.assertFalse(plain_text_review("Tests fail, so not APPROVED")["approved"])
+        self.assertFalse(plain_text_review("This isn't  approved.")["approved"])
+        self.assertFalse(plain_text_review("NOT\tapproved")["approved"])
+    
+    def test_plain_text_negated_clause(self):
+        """Test negation earlier in the verdict's clause is not approval."""
+        self.assertFalse(plain_text_review("Status: not yet approved")["approved"])
+        self.assertFalse(plain_text_review("This cannot be approved.")["approved"])
+        self.assertFalse(plain_text_review("Rejected - will not be approved")["approved"])
+        self.assertFalse(plain_text_review("Rejected, needs work: APPROVED")["approved"])
+        # Negation in an earlier sentence doesn't reach the verdict
+        self.assertTrue(plain_text_review("Tests did not pass at first. Fixed now.\nAPPROVED")["approved"])
+        self.assertTrue(plain_text_review("Nothing isn't covered\n\nAPPROVED")["approved"])
+
+
+class TestStreamReview(unittest.TestCase):
+    """Test incremental extraction."""
+    
+    def test_chunked_feed(self):
+        """Test an object split across chunks completes on its last chunk."""
+        extractor = JsonObjectExtractor()
+        self.assertIsNone(extractor.feed('Review: {"approved": fa'))
+        self.assertIsNone(extractor.feed('lse, "issues": ["use \\"{\\" carefully"'))
+        self.assertEqual(extractor.feed("]} trailing"), {"approved": False, "issues": ['use "{" carefully']})
+    
+    def test_stream_stops_early(self):
+        """Test the stream is not read past the review object."""
+        consumed = []
+        text = '{"approved": true, "issues": []}' + " and a long explanation" * 100
+        
+        review = asyncio.run(stream_review(chunks_of(text, 8, consumed)))
+        
+        self.assertEqual(review, {"approved": True, "issues": []})
+        self.assertEqual(len(consumed), 4)
+    
+    def test_client_falls_back_to_json_mode(self):
+        """Test structured output is tried first and unsupported modes fall back."""
+        calls = []
+        
+        class Client:
+            def create_stream(self, messages, **kwargs):
+                calls.append(kwargs)
+                return self._stream(kwargs)
+            
+            async def _stream(self, kwargs):
+                if "extra_create_args" in kwargs:
+                    raise ValueError("response_format not supported")
+                yield '{"approved": false, '
+                yield '"issues": ["bug"]}'
+        
+        review = asyncio.run(stream_client_review(Client(), ["review this"]))
+        
+        self.assertEqual(review, {"approved": False, "issues": ["bug"]})
+        self.assertEqual(calls, [
+            {"json_output": True, "extra_create_args": calls[0]["extra_create_args"]},
+            {"json_output": True}
+        ])
+
+
+if __name__ == "__main__":
+    unittest.main()
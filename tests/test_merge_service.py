@@ -0,0 +1,111 @@
+"""Tests for merge service."""
+
+import shutil
+import subprocess
+import tempfile
+import unittest
+from pathlib import Path
+from core.merge_service import MergeService
+
+
+def git(repo, *args):
+    """Run git in repo and return stdout."""
+    return subprocess.run(
+        ["git"] + list(args),
+        cwd=repo, check=True, capture_output=True, text=True
+    ).stdout.strip()
+
+
+class TestMergeService(unittest.TestCase):
+    """Test MergeService against a real repository."""
+    
+    def setUp(self):
+        """Create repository with several task branches."""
+        self.test_dir = Path(tempfile.mkdtemp())
+        self.repo = self.test_dir / "repo"
+        self.repo.mkdir()
+        git(self.repo, "init", "-q", "-b", "main")
+        git(self.repo, "config", "user.name", "test")
+        git(self.repo, "config", "user.email", "test@example.com")
+        for name in ("a.py", "b.py", "c.py", "shared.py"):
+            (self.repo / name).write_text(f"{name}\n")
+        git(self.repo, "add", "-A")
+        git(self.repo, "commit", "-q", "-m", "init")
+        
+        self._branch("task/a", {"a.py": "a changed\n"})
+        self._branch("task/b", {"b.py": "b changed\n"})
+        self._branch("task/s1", {"shared.py": "one\n", "c.py": "c changed\n"})
+        self._branch("task/s2", {"shared.py": "two\n"})
+        
+        self.service = MergeService(repo_dir=str(self.repo))
+    
+    def _branch(self, name, files):
+        """Create branch from main with changed files."""
+        git(self.repo, "checkout", "-q", "-b", name, "main")
+        for path, content in files.items():
+            (self.repo / path).write_text(content)
+        git(self.repo, "commit", "-q", "-am", name)
+        git(self.repo, "checkout", "-q", "main")
+    
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.test_dir)
+    
+    def test_check_conflicts(self):
+        """Test in-memory checks against target."""
+        checks = self.service.check_conflicts(["task/a", "task/s1"], "main")
+        
+        self.assertTrue(checks["task/a"]["clean"])
+        self.assertEqual(checks["task/a"]["changed_files"], ["a.py"])
+        self.assertEqual(checks["task/s1"]["changed_files"], ["c.py", "shared.py"])
+    
+    def test_changed_files_with_spaces(self):
+        """Test paths containing spaces are reported whole."""
+        git(self.repo, "checkout", "-q", "-b", "task/space", "main")
+        (self.repo / "release notes.md").write_text("notes\n")
+        git(self.repo, "add", "-A")
+        git(self.repo, "commit", "-q", "-m", "notes")
+        git(self.repo, "checkout", "-q", "main")
+        
+        checks = self.service.check_conflicts(["task/space"], "main")
+        
+        self.assertEqual(checks["task/space"]["changed_files"], ["release notes.md"])
+    
+    def test_plan_orders_independent_first(self):
+        """Test plan puts non-overlapping branches first."""
+        plan = self.service.plan(["task/s2", "task/s1", "task/a", "task/b"], "main")
+        
+        self.assertEqual(plan["order"][:2], ["task/a", "task/b"])
+        self.assertEqual(plan["overlaps"]["task/s1"], ["task/s2"])
+        self.assertEqual(plan["conflicting"], {})
+    
+    def test_merge_all(self):
+        """Test clean merges land on target and conflicts are skipped."""
+        head_before = git(self.repo, "rev-parse", "HEAD")
+        
+        result = self.service.merge_all(["task/a", "task/b", "task/s1", "task/s2"], "main")
+        
+        self.assertEqual(result["merged"], ["task/a", "task/b", "task/s2"])
+        self.assertEqual(result["skipped"], {"task/s1": ["shared.py"]})
+        self.assertEqual(git(self.repo, "rev-parse", "main"), result["commit"])
+        self.assertNotEqual(result["commit"], head_before)
+        
+        # Main checkout was fast-forwarded and is clean
+        self.assertEqual((self.repo / "a.py").read_text(), "a changed\n")
+        self.assertEqual((self.repo / "shared.py").read_text(), "two\n")
+        self.assertEqual(git(self.repo, "status", "--porcelain"), "")
+    
+    def test_merge_all_conflict_with_target(self):
+        """Test branch conflicting with target is reported, not merged."""
+        (self.repo / "a.py").write_text("main moved\n")
+        git(self.repo, "commit", "-q", "-am", "main moves")
+        
+        result = self.service.merge_all(["task/a", "task/b"], "main", dry_run=True)
+        
+        self.assertEqual(result["merged"], ["task/b"])
+        self.assertEqual(result["skipped"], {"task/a": ["a.py"]})
+        self.assertEqual((self.repo / "b.py").read_text(), "b.py\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+"""Tests for parallel coder execution."""
+
+import asyncio
+import shutil
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from core.parallel_coders import FileOwnership, ParallelCoders, join_report, owned_tools, parse_work_items
+from tools import file_ops
+
+
+def item(item_id, files, depends_on=()):
+    """Work item."""
+    return {"id": item_id, "title": item_id, "description": "", "files": list(files), "depends_on": list(depends_on)}
+
+
+class TestWorkItems(unittest.TestCase):
+    """Test plan parsing and file ownership."""
+    
+    def test_parse_plan(self):
+        """Test items are extracted from prose and normalized."""
+        text = 'Plan {draft}: {"items": [{"id": "api", "title": "API", "files": ["./api.py"]}, ' \
+               '{"title": "UI", "files": ["ui.tsx"], "depends_on": ["api", "ghost"]}]} done'
+        items = parse_work_items(text)
+        
+        self.assertEqual([i["id"] for i in items], ["api", "item-2"])
+        self.assertEqual(items[0]["files"], ["api.py"])
+        self.assertEqual(items[1]["depends_on"], ["api"])
+        self.assertEqual(parse_work_items("no plan"), [])
+    
+    def test_ownership(self):
+        """Test claims are all-or-nothing and released per owner."""
+        ownership = FileOwnership()
+        self.assertEqual(ownership.claim("a", ["x.py", "y.py"]), [])
+        self.assertEqual(ownership.claim("b", ["z.py", "y.py"]), ["y.py"])
+        self.assertIsNone(ownership.owner_of("z.py"))
+        
+        ownership.release("a")
+        self.assertEqual(ownership.claim("b", ["z.py", "y.py"]), [])
+    
+    def test_owned_tools(self):
+        """Test writes to another item's files are rejected."""
+        test_dir = Path(tempfile.mkdtemp())
+        try:
+            ws = file_ops.Workspace(test_dir)
+            ownership = FileOwnership()
+            ownership.claim("ui", ["ui.tsx"])
+            tools = {tool.__name__: tool for tool in owned_tools(ws, ownership, "api")}
+            
+            self.assertIn("successfully", tools["write_file"]("api.py", "x = 1\n"))
+            self.assertEqual(ownership.owner_of("api.py"), "api")
+            self.assertIn("owned by another work item: ui.tsx (ui)", tools["write_files"]({"ok.py": "", "ui.tsx": ""}))
+            self.assertFalse((test_dir / "ok.py").exists())
+            self.assertIn("owned by another", tools["multi_edit"]([{"filepath": "ui.tsx", "old_text": "a", "new_text": "b"}]))
+            self.assertIn("x = 1", tools["read_file"]("api.py"))
+        finally:
+            shutil.rmtree(test_dir)
+
+
+class TestParallelCoders(unittest.TestCase):
+    """Test ParallelCoders scheduling."""
+    
+    def run_items(self, items, coders=("fe", "be", "db"), fail=()):
+        """Run items with coders that take 0.1s each; return results, event log and wall time."""
+        log = []
+        
+        async def execute(work_item, coder):
+            log.append(("start", work_item["id"]))
+            await asyncio.sleep(0.1)
+            log.append(("end", work_item["id"]))
+            if work_item["id"] in fail:
+                raise RuntimeError("boom")
+            return f"{work_item['id']} built by {coder}"
+        
+        started = time.monotonic()
+        results = asyncio.run(ParallelCoders(list(coders), execute).run(items))
+        return results, log, time.monotonic() - started
+    
+    def test_disjoint_items_run_concurrently(self):
+        """Test throughput scales with the number of coders."""
+        results, _, elapsed = self.run_items([item("a", ["a.py"]), item("b", ["b.py"]), item("c", ["c.py"])])
+        
+        self.assertEqual({r["status"] for r in results.values()}, {"done"})
+        self.assertEqual(len({r["coder"] for r in results.values()}), 3)
+        self.assertLess(elapsed, 0.25)
+    
+    def test_overlapping_files_serialized(self):
+        """Test items sharing a file never run at the same time."""
+        _, log, _ = self.run_items([item("a", ["shared.py", "a.py"]), item("b", ["shared.py"])])
+        self.assertEqual(log, [("start", "a"), ("end", "a"), ("start", "b"), ("end", "b")])
+    
+    def test_dependencies(self):
+        """Test dependents wait, and are skipped when a dependency fails."""
+        results, log, _ = self.run_items(
+            [item("ui", ["ui.tsx"], ["api"]), item("api", ["api.py"]), item("docs", ["d.md"], ["ui"])],
+            fail=("ui",)
+        )
+        
+        self.assertLess(log.index(("end", "api")), log.index(("start", "ui")))
+        self.assertEqual(results["ui"]["status"], "failed")
+        self.assertEqual(results["docs"]["status"], "skipped")
+        self.assertIn("[failed] ui", join_report([item("ui", []), item("api", [])], results))
+    
+    def test_dependency_cycle_blocked(self):
+        """Test cyclic dependencies don't hang the join."""
+        results, _, _ = self.run_items([item("a", [], ["b"]), item("b", [], ["a"])])
+        self.assertEqual({r["status"] for r in results.values()}, {"blocked"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,8 @@
 """Tests for QA loop."""
 
+import asyncio
+import json
+import time
 import unittest
 from core.qa_loop import QALoop
 
@@ -90,6 +93,11 @@ class TestQALoop(unittest.TestCase):
         # Plain text with APPROVED
         review = loop._parse_review('The code looks good. APPROVED')
         self.assertTrue(review["approved"])
+        
+        # Braces in prose and an "approved" mention in a rejection
+        review = loop._parse_review('Wrap it in {braces}. {"approved": false, "issues": ["not approved yet"]} }')
+        self.assertFalse(review["approved"])
+        self.assertEqual(review["issues"], ["not approved yet"])
     
     def test_generate_fix_request(self):
         """Test fix request generation."""
@@ -103,6 +111,369 @@ class TestQALoop(unittest.TestCase):
         self.assertIn("missing docstring", request)
         self.assertIn("no type hints", request)
         self.assertIn("def foo(): pass", request)
+    
+    
+    
+    def test_incremental_review(self):
+        """Test reviewer gets the diff and open issues after the first pass."""
+        seen = []
+        
+        def reviewer(text):
+            seen.append(text)
+            if len(seen) == 1:
+                return '{"approved": false, "issues": ["divide by zero in ratio()"]}'
+            return '{"approved": true, "issues": []}'
+        
+        code = "\n".join(f"line{i} = {i}" for i in range(100))
+        fixed = code.replace("line50 = 50", "line50 = 50 if d else 0")
+        
+        loop = QALoop(incremental=True)
+        result = loop.run(reviewer, lambda c, issues, request: fixed, code)
+        
+        self.assertEqual(result["status"], "approved")
+        self.assertEqual(seen[0], code)
+        self.assertIn("1. divide by zero in ratio()", seen[1])
+        self.assertIn("-line50 = 50\n+line50 = 50 if d else 0", seen[1])
+        self.assertNotIn("line10 = 10", seen[1])
+    
+    def test_incremental_fixer_gets_excerpts(self):
+        """Test the fixer gets an excerpt fix request in incremental mode."""
+        requests = []
+        
+        def reviewer(text):
+            if "x20 = 21" in text:
+                return '{"approved": true, "issues": []}'
+            if "x10 = 11" in text:
+                return '{"approved": false, "issues": ["off-by-one on line 20"]}'
+            return '{"approved": false, "issues": ["off-by-one on line 10"]}'
+        
+        def fixer(code, issues, request):
+            requests.append(request)
+            line = 10 if len(requests) == 1 else 20
+            return code.replace(f"x{line} = {line}", f"x{line} = {line + 1}")
+        
+        code = "\n".join(f"x{i} = {i}" for i in range(1, 201))
+        result = QALoop(incremental=True).run(reviewer, fixer, code)
+        
+        self.assertEqual(result["status"], "approved")
+        self.assertEqual(len(requests), 2)
+        self.assertIn("1. off-by-one on line 10", requests[0])
+        self.assertIn(" 10 | x10 = 10", requests[0])
+        self.assertNotIn("x100 = 100", requests[0])
+        # Second round also shows the line changed by the previous fix
+        self.assertIn(" 20 | x20 = 20", requests[1])
+        self.assertIn(" 10 | x10 = 11", requests[1])
+        self.assertNotIn("x100 = 100", requests[1])
+        
+        # Without incremental the fixer keeps its two arguments
+        result = QALoop().run(reviewer, lambda code, issues: code.replace("x10 = 10", "x20 = 21"), code)
+        self.assertEqual(result["status"], "approved")
+    
+    def test_incremental_fix_request(self):
+        """Test fix request with excerpts around referenced lines and names."""
+        code = "\n".join(f"x{i} = {i}" for i in range(1, 201))
+        code = code.replace("x150 = 150", "def ratio(a, b): return a / b")
+        loop = QALoop()
+        
+        request = loop.generate_fix_request(
+            code, ["off-by-one on line 20", "`ratio` divides by zero"], incremental=True, context=2
+        )
+        
+        self.assertIn(" 20 | x20 = 20", request)
+        self.assertIn("150 | def ratio(a, b)", request)
+        self.assertIn(" 18 | x18 = 18", request)
+        self.assertNotIn("x100 = 100", request)
+        self.assertIn("200 lines total", request)
+        
+        # Nothing to anchor on: whole code
+        request = loop.generate_fix_request(code, ["style is inconsistent"], incremental=True)
+        self.assertIn("x100 = 100", request)
+        
+        # path:line is a location; times and ports are not
+        request = loop.generate_fix_request(code, ["app.py:120 leaks a handle"], incremental=True, context=0)
+        self.assertIn("120 | x120 = 120", request)
+        request = loop.generate_fix_request(
+            code, ["retry at 10:30 fails", "server on localhost:80 refuses"], incremental=True
+        )
+        self.assertIn("x100 = 100", request)
+    
+    
+    def test_oscillation_detected(self):
+        """Test A -> B -> A ends early without a third review."""
+        calls = []
+        
+        def reviewer(code):
+            calls.append(code)
+            return f'{{"approved": false, "issues": ["problem in {code}"]}}'
+        
+        def fixer(code, issues):
+            return "B" if code == "A" else "A"
+        
+        loop = QALoop(max_iterations=10)
+        result = loop.run(reviewer, fixer, "A")
+        
+        self.assertEqual(result["status"], "oscillating")
+        self.assertEqual(result["iterations"], 3)
+        self.assertEqual(result["cycle_start"], 1)
+        self.assertEqual(calls, ["A", "B"])
+        
+        history = result["history"]
+        self.assertEqual(history[2]["code_hash"], history[0]["code_hash"])
+        self.assertTrue(history[2]["cached"])
+        self.assertEqual(history[2]["issues"], history[0]["issues"])
+        # Only the latest entry keeps the full review
+        self.assertNotIn("review", history[0])
+        self.assertEqual(history[2]["review"]["issues"], ["problem in A"])
+    
+    def test_unchanged_code_not_rereviewed(self):
+        """Test an unchanged version reuses its review."""
+        calls = []
+        
+        def reviewer(code):
+            calls.append(code)
+            return '{"approved": false, "issues": ["same issue"]}'
+        
+        result = QALoop(max_iterations=10).run(reviewer, lambda code, issues: code, "code")
+        
+        self.assertEqual(result["status"], "recurring_issues")
+        self.assertEqual(len(calls), 1)
+    
+    def test_test_failures_skip_reviewer(self):
+        """Test failing tests go to the fixer without a review."""
+        reviewed, fixed_with = [], []
+        
+        def tests(code):
+            if code.count("fix") < 2:
+                return {"passed": False, "issues": [f"Test failed: test_{len(code)}"]}
+            return {"passed": True, "issues": []}
+        
+        def reviewer(code):
+            reviewed.append(code)
+            return '{"approved": true, "issues": []}'
+        
+        def fixer(code, issues):
+            fixed_with.append(issues)
+            return code + " fix"
+        
+        result = QALoop(max_iterations=10).run(reviewer, fixer, "code", test_fn=tests)
+        
+        self.assertEqual(result["status"], "approved")
+        self.assertEqual(result["iterations"], 3)
+        self.assertEqual(reviewed, ["code fix fix"])
+        self.assertEqual(fixed_with, [["Test failed: test_4"], ["Test failed: test_8"]])
+        self.assertEqual(result["history"][0]["stage"], "tests")
+        self.assertEqual(result["history"][0]["issues"], ["Test failed: test_4"])
+    
+    def test_history_bounded(self):
+        """Test old iterations are rolled up and spilled to the event log."""
+        events = []
+        
+        def reviewer(code):
+            return json.dumps({"approved": False, "issues": [f"problem {len(code)}", "style"]})
+        
+        loop = QALoop(max_iterations=60, recurring_window=100, history_limit=5, event_log=events.append)
+        result = loop.run(reviewer, lambda code, issues: code + "x", "x")
+        
+        self.assertEqual(result["status"], "max_iterations")
+        self.assertEqual([h["iteration"] for h in result["history"]], [56, 57, 58, 59, 60])
+        self.assertEqual([h["iteration"] for h in result["history"] if "review" in h], [60])
+        self.assertEqual(len(events), 60)
+        self.assertEqual(events[0]["review"]["issues"], ["problem 1", "style"])
+        self.assertEqual(len(loop._reviews), 5)
+        
+        summary = result["history_summary"]
+        self.assertEqual((summary["iterations"], summary["first_iteration"], summary["last_iteration"]), (55, 1, 55))
+        self.assertEqual(summary["issues_reported"], 110)
+        self.assertEqual(summary["issue_counts"]["style"], 55)
+        self.assertLessEqual(len(summary["issue_counts"]), QALoop.SUMMARY_ISSUES)
+        self.assertEqual(summary["open_issues"], ["problem 55", "style"])
+        self.assertEqual(summary["resolved_total"], 54)
+        self.assertEqual(summary["resolved_issues"][-1], "problem 54")
+        self.assertEqual(len(summary["resolved_issues"]), QALoop.SUMMARY_ISSUES)
+    
+    def test_oscillation_beyond_history_limit(self):
+        """Test cycles are found even after the first version was compacted."""
+        def reviewer(code):
+            return json.dumps({"approved": False, "issues": [f"issue in {code}"]})
+        
+        versions = {"A": "B", "B": "A"}
+        result = QALoop(history_limit=1).run(reviewer, lambda code, issues: versions[code], "A")
+        
+        self.assertEqual(result["status"], "oscillating")
+        self.assertEqual(result["cycle_start"], 1)
+        self.assertEqual(len(result["history"]), 1)
+    
+    def test_reworded_recurring_issues(self):
+        """Test recurring detection matches reworded issues."""
+        wordings = [
+            "Missing input validation in parse_config",
+            "parse_config is missing input validation!",
+            "The parse_config function: missing input validation",
+        ]
+        
+        def reviewer(code):
+            return json.dumps({"approved": False, "issues": [wordings[len(code) - 1], f"style nit {len(code)}"]})
+        
+        result = QALoop(max_iterations=10).run(reviewer, lambda code, issues: code + "x", "x")
+        
+        self.assertEqual(result["status"], "recurring_issues")
+        self.assertEqual(result["iterations"], 3)
+        self.assertEqual(result["recurring_issues"], [wordings[2]])
+        self.assertEqual(result["history"][1]["repeated_issues"], [wordings[1]])
+
+    
+    def test_different_functions_not_recurring(self):
+        """Test the same complaint about a different function each iteration is not recurring."""
+        functions = ["login", "register", "logout", "reset_password", "delete_account"]
+        
+        def reviewer(code):
+            return json.dumps({"approved": False, "issues": [f"{functions[len(code) - 1]}() lacks input validation"]})
+        
+        result = QALoop(max_iterations=5).run(reviewer, lambda code, issues: code + "x", "x")
+        
+        self.assertEqual(result["status"], "max_iterations")
+        self.assertEqual(result["iterations"], 5)
+
+def reviewer_after(delay, output):
+    """Build async reviewer returning output after delay seconds."""
+    async def review(code):
+        await asyncio.sleep(delay)
+        return output if isinstance(output, str) else output(code)
+    return review
+
+
+class TestQALoopAsync(unittest.TestCase):
+    """Test QALoop.run_async with several reviewers."""
+    
+    def test_reviewers_run_concurrently(self):
+        """Test iteration time is bounded by the slowest reviewer."""
+        ok = '{"approved": true, "issues": []}'
+        reviewers = {name: reviewer_after(0.2, ok) for name in ("security", "correctness", "style")}
+        
+        start = time.monotonic()
+        result = asyncio.run(QALoop().run_async(reviewers, lambda code, issues: code, "code"))
+        
+        self.assertEqual(result["status"], "approved")
+        self.assertLess(time.monotonic() - start, 0.5)
+        self.assertEqual(set(result["history"][0]["review"]["reviews"]), set(reviewers))
+    
+    def test_issues_merged_and_fixed(self):
+        """Test duplicate issues are merged before the fixer runs."""
+        fixed_with = []
+        
+        def security(code):
+            if code.endswith("fixed"):
+                return '{"approved": true, "issues": []}'
+            return '{"approved": false, "issues": ["SQL injection in query.", "missing auth"]}'
+        
+        async def correctness(code):
+            if code.endswith("fixed"):
+                return '{"approved": true, "issues": []}'
+            return '{"approved": false, "issues": ["sql  injection in query"]}'
+        
+        def fixer(code, issues):
+            fixed_with.append(issues)
+            return code + " fixed"
+        
+        result = asyncio.run(QALoop().run_async(
+            {"security": security, "correctness": correctness}, fixer, "code"
+        ))
+        
+        self.assertEqual(result["status"], "approved")
+        self.assertEqual(result["iterations"], 2)
+        self.assertEqual(fixed_with, [["SQL injection in query.", "missing auth"]])
+    
+    def test_streamed_review(self):
+        """Test a streaming reviewer is read only up to its review object."""
+        read = []
+        
+        async def reviewer(code):
+            for chunk in ['Sure {', '"approved": true, "issues": []}', " because"] + [" more"] * 50:
+                read.append(chunk)
+                yield chunk
+        
+        result = asyncio.run(QALoop().run_async({"streaming": reviewer}, lambda code, issues: code, "code"))
+        
+        self.assertEqual(result["status"], "approved")
+        self.assertEqual(len(read), 2)
+    
+    def test_quorum_cancels_slow_reviewer(self):
+        """Test reaching the quorum stops waiting for other reviewers."""
+        ok = '{"approved": true, "issues": []}'
+        reviewers = {
+            "a": reviewer_after(0, ok),
+            "b": reviewer_after(0, ok),
+            "slow": reviewer_after(5, '{"approved": false, "issues": ["x"]}'),
+        }
+        
+        start = time.monotonic()
+        result = asyncio.run(QALoop().run_async(reviewers, lambda code, issues: code, "code", quorum=2))
+        
+        self.assertEqual(result["status"], "approved")
+        self.assertLess(time.monotonic() - start, 1)
+        self.assertEqual(result["history"][0]["review"]["cancelled"], ["slow"])
+    
+    def test_failing_reviewer_recorded(self):
+        """Test a reviewer that raises counts as a rejection with its error as issue."""
+        fixed_with = []
+        
+        def flaky(code):
+            if code == "v1":
+                raise TimeoutError("proxy timeout")
+            return '{"approved": true, "issues": []}'
+        
+        def fixer(code, issues):
+            fixed_with.append(issues)
+            return "v2"
+        
+        result = asyncio.run(QALoop().run_async(
+            {"flaky": flaky, "ok": reviewer_after(0, '{"approved": true, "issues": []}')}, fixer, "v1"
+        ))
+        
+        self.assertEqual(result["status"], "approved")
+        self.assertEqual(result["iterations"], 2)
+        self.assertEqual(fixed_with, [["Reviewer flaky failed: TimeoutError: proxy timeout"]])
+    
+    def test_embedder_off_event_loop(self):
+        """Test issue embeddings are computed outside the event loop."""
+        on_loop = []
+        
+        def embedder(texts):
+            try:
+                asyncio.get_running_loop()
+                on_loop.append(True)
+            except RuntimeError:
+                on_loop.append(False)
+            return [[1.0, float(i)] for i in range(len(texts))]
+        
+        result = asyncio.run(QALoop(embedder=embedder).run_async(
+            {"r": reviewer_after(0, lambda code: '{"approved": %s, "issues": ["bug"]}' % str(code == "v2").lower())},
+            lambda code, issues: "v2", "v1"
+        ))
+        
+        self.assertEqual(result["status"], "approved")
+        self.assertEqual(on_loop, [False])
+    
+    def test_early_exit(self):
+        """Test a rejection ends the round when the quorum is out of reach."""
+        reviewers = {
+            "fast": reviewer_after(
+                0, lambda code: '{"approved": true, "issues": []}' if code == "v2"
+                else '{"approved": false, "issues": ["bug"]}'
+            ),
+            "slow": reviewer_after(0.3, '{"approved": true, "issues": []}'),
+        }
+        
+        events = []
+        result = asyncio.run(QALoop(event_log=events.append).run_async(
+            reviewers, lambda code, issues: "v2", "v1", early_exit=True
+        ))
+        
+        first = events[0]["review"]
+        self.assertFalse(first["approved"])
+        self.assertEqual(first["cancelled"], ["slow"])
+        self.assertEqual(result["status"], "approved")
+        self.assertEqual(result["final_code"], "v2")
 
 
 if __name__ == "__main__":
@@ -1,5 +1,8 @@
 """Tests for shell runner."""
 
+import json
+import shutil
+import tempfile
 import unittest
 from pathlib import Path
 from core.shell_runner import ShellRunner, SecurityError
@@ -58,6 +61,31 @@ class TestShellRunner(unittest.TestCase):
         # Should raise error for cwd outside allowed
         with self.assertRaises(SecurityError):
             runner.run("ls", cwd="/etc")
+    
+    
+    def test_usage_recorded(self):
+        """Test that resource usage is appended to the structured log."""
+        log_dir = tempfile.mkdtemp()
+        try:
+            runner = ShellRunner(log_dir=log_dir, task_id="task-1", phase="test")
+            result = runner.run("echo hello")
+            
+            self.assertEqual(result.returncode, 0)
+            self.assertEqual(result.stdout.strip(), "hello")
+            
+            with open(Path(log_dir) / "shell_commands.jsonl") as f:
+                record = json.loads(f.readline())
+            
+            self.assertEqual(record["task_id"], "task-1")
+            self.assertEqual(record["phase"], "test")
+            self.assertEqual(record["command"], "echo hello")
+            self.assertEqual(record["returncode"], 0)
+            self.assertEqual(record["stdout_bytes"], len("hello\n"))
+            self.assertGreaterEqual(record["wall_time"], 0.0)
+            self.assertIn("max_rss_kb", record)
+            self.assertFalse(record["timed_out"])
+        finally:
+            shutil.rmtree(log_dir)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,70 @@
+"""Tests for rule-based speaker selection."""
+
+import unittest
+from types import SimpleNamespace
+from core.speaker_rules import RuleSelector
+
+
+def msg(source, content):
+    """Plain chat message."""
+    return SimpleNamespace(source=source, content=content)
+
+
+class ToolCallSummaryMessage(SimpleNamespace):
+    """Stand-in for autogen's tool result message (matched by type name)."""
+
+
+class TestRuleSelector(unittest.TestCase):
+    """Test RuleSelector class."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.select = RuleSelector()
+        self.thread = []
+    
+    def say(self, source, content, message_type=None):
+        """Append a message and return the selected next speaker."""
+        self.thread.append((message_type or msg)(source=source, content=content))
+        return self.select(self.thread)
+    
+    def test_typical_session(self):
+        """Test the usual flow is decided without the model."""
+        self.assertEqual(self.say("user", "Build a chat app"), "architect")
+        self.assertEqual(self.say("architect", "Plan written. Backend first: the API."), "backend_dev")
+        self.assertEqual(self.say("backend_dev", "Wrote api.py", ToolCallSummaryMessage), "backend_dev")
+        self.assertEqual(self.say("backend_dev", "API implemented, ready for review"), "senior_reviewer")
+        self.assertEqual(self.say("senior_reviewer", "Missing input validation in api.py"), "backend_dev")
+        self.assertEqual(self.say("senior_reviewer", "The frontend_dev must fix the form"), "frontend_dev")
+        
+        self.assertEqual(self.select.stats["rule"], 6)
+        self.assertEqual(self.select.stats["fallback"], 0)
+        self.assertEqual(self.select.stats["rules"]["tool_result"], 1)
+    
+    def test_architect_round_robin(self):
+        """Test the architect hands off to coders in turn when none is named."""
+        self.say("user", "task")
+        self.assertEqual(self.say("architect", "Plan ready."), "frontend_dev")
+        self.assertEqual(self.say("architect", "Next part."), "backend_dev")
+    
+    def test_ambiguous_falls_back(self):
+        """Test unclear turns are left to the selector model."""
+        self.say("user", "task")
+        self.assertIsNone(self.say("frontend_dev", "Not done yet, thinking about state management"))
+        self.assertIsNone(self.say("project_manager", "Status?"))
+        self.assertIsNone(self.say("senior_reviewer", "APPROVED"))
+        
+        self.assertEqual(self.select.stats["fallback"], 3)
+        self.assertIn("3 selector model calls, 1 saved", self.select.report())
+    
+    def test_for_agents(self):
+        """Test roles are derived from registry agent names."""
+        agents = [SimpleNamespace(name=n) for n in
+                  ("project_manager", "architect", "frontend_dev", "backend_dev", "senior_reviewer")]
+        select = RuleSelector.for_agents(agents)
+        
+        self.assertEqual(select.coders, ["frontend_dev", "backend_dev"])
+        self.assertEqual((select.architect, select.reviewer), ("architect", "senior_reviewer"))
+
+
+if __name__ == "__main__":
+    unittest.main()
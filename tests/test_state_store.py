@@ -71,6 +71,34 @@ class TestStateStore(unittest.TestCase):
         self.store.delete("test-delete")
         self.assertFalse(self.store.exists("test-delete"))
     
+    def test_event_log(self):
+        """Test events are appended and survive alongside state."""
+        self.store.save("task-1", {"phase": "qa"})
+        self.store.append_event("task-1", {"type": "qa_iteration", "iteration": 1})
+        self.store.append_event("task-1", {"type": "qa_iteration", "iteration": 2})
+        
+        events = self.store.load_events("task-1")
+        self.assertEqual([e["iteration"] for e in events], [1, 2])
+        self.assertIn("timestamp", events[0])
+        self.assertEqual(self.store.list_tasks(), ["task-1"])
+        self.assertEqual(self.store.load_events("missing"), [])
+        
+        self.store.delete("task-1")
+        self.assertEqual(self.store.load_events("task-1"), [])
+    
+    def test_truncated_event_skipped(self):
+        """Test a partially written event doesn't break loading or later appends."""
+        self.store.append_event("task-1", {"iteration": 1})
+        with open(self.store.state_dir / "task-1.events.jsonl", "a") as f:
+            f.write('{"timestamp": "2026-01-01", "itera')
+        
+        with self.assertLogs("core.state_store", level="WARNING"):
+            self.assertEqual([e["iteration"] for e in self.store.load_events("task-1")], [1])
+        
+        self.store.append_event("task-1", {"iteration": 2})
+        with self.assertLogs("core.state_store", level="WARNING"):
+            self.assertEqual([e["iteration"] for e in self.store.load_events("task-1")], [1, 2])
+    
     def test_list_tasks(self):
         """Test listing all tasks."""
         self.store.save("task-1", {"phase": "test"})
@@ -0,0 +1,140 @@
+"""Tests for workspace file index."""
+
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from core.workspace_index import WorkspaceIndex, IgnoreRules
+
+
+class TestIgnoreRules(unittest.TestCase):
+    """Test gitignore pattern matching."""
+    
+    def test_patterns(self):
+        """Test unanchored, anchored, directory-only and negated patterns."""
+        rules = IgnoreRules().extend([
+            "# comment",
+            "*.log",
+            "!keep.log",
+            "/build",
+            "dist/",
+            "docs/**/*.tmp",
+        ])
+        
+        self.assertTrue(rules.is_ignored("a/b/debug.log", False))
+        self.assertFalse(rules.is_ignored("a/keep.log", False))
+        self.assertTrue(rules.is_ignored("build", True))
+        self.assertFalse(rules.is_ignored("src/build", True))
+        self.assertTrue(rules.is_ignored("src/dist", True))
+        self.assertFalse(rules.is_ignored("src/dist", False))
+        self.assertTrue(rules.is_ignored("docs/x/y/z.tmp", False))
+        self.assertFalse(rules.is_ignored("src/z.tmp", False))
+    
+    def test_nested_base(self):
+        """Test rules from a nested .gitignore only apply below it."""
+        rules = IgnoreRules().extend(["/out", "*.gen"], base="pkg")
+        
+        self.assertTrue(rules.is_ignored("pkg/out", True))
+        self.assertTrue(rules.is_ignored("pkg/sub/a.gen", False))
+        self.assertFalse(rules.is_ignored("out", True))
+        self.assertFalse(rules.is_ignored("a.gen", False))
+
+
+class TestWorkspaceIndex(unittest.TestCase):
+    """Test WorkspaceIndex functionality."""
+    
+    def setUp(self):
+        """Create workspace with ignored and regular files."""
+        self.test_dir = Path(tempfile.mkdtemp())
+        self.root = self.test_dir / "ws"
+        for rel, content in {
+            "app.py": "app",
+            "src/core/a.py": "a",
+            "src/core/b.txt": "b",
+            "src/gen/out.js": "x",
+            "node_modules/lib/index.js": "lib",
+            ".git/HEAD": "ref",
+            "src/.gitignore": "gen/\n",
+        }.items():
+            path = self.root / rel
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(content)
+        
+        self.cache_file = self.test_dir / "index.json"
+        self.index = WorkspaceIndex(str(self.root), cache_file=str(self.cache_file))
+    
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.test_dir)
+    
+    def test_refresh_respects_ignores(self):
+        """Test ignored directories are skipped."""
+        changes = self.index.refresh()
+        
+        self.assertEqual(
+            changes["added"],
+            ["app.py", "src/.gitignore", "src/core/a.py", "src/core/b.txt"]
+        )
+        self.assertEqual(self.index.files["app.py"]["size"], 3)
+    
+    def test_incremental_refresh(self):
+        """Test refresh reports only what changed."""
+        self.index.refresh()
+        self.assertEqual(self.index.refresh(), {"added": [], "modified": [], "removed": []})
+        
+        (self.root / "app.py").write_text("app v2")
+        (self.root / "src" / "core" / "c.py").write_text("c")
+        (self.root / "src" / "core" / "b.txt").unlink()
+        
+        changes = self.index.refresh()
+        self.assertEqual(changes["added"], ["src/core/c.py"])
+        self.assertEqual(changes["modified"], ["app.py"])
+        self.assertEqual(changes["removed"], ["src/core/b.txt"])
+    
+    def test_gitignore_change_applies(self):
+        """Test editing .gitignore re-includes files without a full rescan."""
+        self.index.refresh()
+        (self.root / "src" / ".gitignore").write_text("*.txt\n")
+        
+        changes = self.index.refresh()
+        self.assertEqual(changes["added"], ["src/gen/out.js"])
+        self.assertEqual(changes["removed"], ["src/core/b.txt"])
+    
+    def test_lazy_hash(self):
+        """Test hashes are computed on demand and reset on change."""
+        self.index.refresh()
+        self.assertIsNone(self.index.files["app.py"]["hash"])
+        
+        first = self.index.file_hash("app.py")
+        self.assertEqual(len(first), 40)
+        self.assertIsNone(self.index.file_hash("missing.py"))
+        
+        (self.root / "app.py").write_text("changed")
+        self.index.refresh()
+        self.assertNotEqual(self.index.file_hash("app.py"), first)
+    
+    def test_persistence(self):
+        """Test a new index instance reuses the persisted state."""
+        self.index.refresh()
+        self.index.file_hash("app.py")
+        self.index.save()
+        
+        reloaded = WorkspaceIndex(str(self.root), cache_file=str(self.cache_file))
+        self.assertEqual(reloaded.refresh()["added"], [])
+        self.assertIsNotNone(reloaded.files["app.py"]["hash"])
+    
+    def test_paths_filters(self):
+        """Test directory, depth and glob filters."""
+        self.index.refresh()
+        
+        self.assertEqual(self.index.paths("src/core"), ["src/core/a.py", "src/core/b.txt"])
+        self.assertEqual(self.index.paths(".", max_depth=1), ["app.py"])
+        self.assertEqual(self.index.paths(pattern="*.py"), ["app.py", "src/core/a.py"])
+        self.assertEqual(self.index.paths("src", pattern="core/*.txt"), ["src/core/b.txt"])
+        # "*" doesn't cross directories, "**" does
+        self.assertEqual(self.index.paths(pattern="src/*.py"), [])
+        self.assertEqual(self.index.paths(pattern="src/**/*.py"), ["src/core/a.py"])
+
+
+if __name__ == "__main__":
+    unittest.main()
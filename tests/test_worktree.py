@@ -1,9 +1,14 @@
 """Tests for worktree manager."""
 
+import os
+import shutil
+import subprocess
+import tempfile
 import unittest
 from unittest.mock import patch, MagicMock
 from pathlib import Path
-from core.worktree_manager import WorktreeManager
+from core.config_loader import ConfigLoader
+from core.worktree_manager import WorktreeManager, scope_directories, path_scope_from_spec
 
 
 class TestWorktreeManager(unittest.TestCase):
@@ -20,12 +25,13 @@ class TestWorktreeManager(unittest.TestCase):
         
         path = self.manager.create_worktree("test-123", "main")
         
-        # Verify git command
-        mock_run.assert_called_once()
-        args = mock_run.call_args[0][0]
+        # Verify git commands: register, then populate the worktree
+        self.assertEqual(mock_run.call_count, 2)
+        args = mock_run.call_args_list[0][0][0]
         self.assertEqual(args[0:3], ["git", "worktree", "add"])
         self.assertIn("task/test-123", args)
         self.assertIn("main", args)
+        self.assertEqual(mock_run.call_args_list[1][0][0][3:], ["reset", "-q", "--hard"])
         
         # Verify returned path
         self.assertEqual(path, Path(".test_worktrees/test-123"))
@@ -33,21 +39,25 @@ class TestWorktreeManager(unittest.TestCase):
     @patch('subprocess.run')
     def test_commit_checkpoint(self, mock_run):
         """Test checkpoint commit."""
-        mock_run.return_value = MagicMock(returncode=0)
+        # git diff --cached --quiet exits 1 when something is staged
+        mock_run.side_effect = lambda cmd, **kwargs: MagicMock(returncode=1 if "diff" in cmd else 0)
         
         worktree_path = Path(".test_worktrees/test-123")
-        self.manager.commit_checkpoint(worktree_path, "checkpoint: test")
+        self.assertTrue(self.manager.commit_checkpoint(worktree_path, "checkpoint: test"))
         
-        # Should call git add and git commit
-        self.assertEqual(mock_run.call_count, 2)
+        # Should call git add, git diff --cached and git commit
+        self.assertEqual(mock_run.call_count, 3)
         
         # First call: git add -A
         add_args = mock_run.call_args_list[0][0][0]
         self.assertIn("add", add_args)
         self.assertIn("-A", add_args)
         
-        # Second call: git commit
-        commit_args = mock_run.call_args_list[1][0][0]
+        # Second call: check for staged changes
+        self.assertIn("--cached", mock_run.call_args_list[1][0][0])
+        
+        # Third call: git commit
+        commit_args = mock_run.call_args_list[2][0][0]
         self.assertIn("commit", commit_args)
         self.assertIn("checkpoint: test", commit_args)
     
@@ -108,6 +118,370 @@ branch refs/heads/task/123
         self.assertEqual(worktrees[0]["branch"], "refs/heads/main")
         self.assertEqual(worktrees[1]["path"], "/path/to/worktree1")
         self.assertEqual(worktrees[1]["branch"], "refs/heads/task/123")
+    
+    
+    @patch('subprocess.run')
+    def test_create_worktree_from_pool(self, mock_run):
+        """Test worktree is claimed from the pool when one is ready."""
+        pool = MagicMock(base_branch="main")
+        pool.claim.return_value = Path(".test_worktrees/test-123")
+        manager = WorktreeManager(base_dir=".test_worktrees", pool=pool)
+        
+        path = manager.create_worktree("test-123", "main")
+        
+        pool.claim.assert_called_once_with("test-123", Path(".test_worktrees/test-123"))
+        mock_run.assert_not_called()
+        self.assertEqual(path, Path(".test_worktrees/test-123"))
+    
+    @patch('subprocess.run')
+    def test_cleanup_releases_to_pool(self, mock_run):
+        """Test cleanup recycles the worktree instead of removing it."""
+        mock_run.return_value = MagicMock(returncode=0)
+        pool = MagicMock(base_branch="main")
+        pool.release.return_value = True
+        manager = WorktreeManager(base_dir=".test_worktrees", pool=pool)
+        
+        manager.cleanup("test-123", delete_branch=True)
+        
+        pool.release.assert_called_once_with(Path(".test_worktrees/test-123"))
+        mock_run.assert_called_once()
+        self.assertEqual(mock_run.call_args[0][0], ["git", "branch", "-D", "task/test-123"])
+    
+    def test_from_config(self):
+        """Test base directory and pool settings come from the config."""
+        test_dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, test_dir)
+        config = ConfigLoader(test_dir / "config.json")
+        config.save({
+            "worktree_base": str(test_dir / "worktrees"),
+            "worktree_pool": {"size": 3, "low_watermark": 2, "base_branch": "develop"}
+        })
+        
+        manager = WorktreeManager.from_config(config, background=False)
+        
+        self.assertEqual(manager.base_dir, test_dir / "worktrees")
+        self.assertEqual((manager.pool.size, manager.pool.low_watermark), (3, 2))
+        self.assertEqual(manager.pool.refill_interval, 30.0)
+        self.assertEqual(manager.pool.base_branch, "develop")
+        
+        config.update("worktree_pool.size", 0)
+        self.assertIsNone(WorktreeManager.from_config(config).pool)
+    
+    
+    @patch('subprocess.run')
+    def test_create_sparse_worktree(self, mock_run):
+        """Test worktree creation limited to a path scope."""
+        mock_run.return_value = MagicMock(returncode=0)
+        
+        path = self.manager.create_worktree(
+            "test-123", "main", paths=["services/api/app.py", "libs/common/"]
+        )
+        
+        self.assertEqual(mock_run.call_count, 3)
+        
+        add_args = mock_run.call_args_list[0][0][0]
+        self.assertEqual(add_args[0:3], ["git", "worktree", "add"])
+        self.assertIn("--no-checkout", add_args)
+        
+        sparse_args = mock_run.call_args_list[1][0][0]
+        self.assertEqual(sparse_args[3:6], ["sparse-checkout", "set", "--cone"])
+        self.assertEqual(sparse_args[6:], ["libs/common", "services/api"])
+        
+        checkout_args = mock_run.call_args_list[2][0][0]
+        self.assertEqual(checkout_args[-1], "checkout")
+        self.assertEqual(path, Path(".test_worktrees/test-123"))
+    
+    @patch('subprocess.run')
+    def test_create_worktree_from_spec_scope(self, mock_run):
+        """Test the scope declared by a spec limits the checkout."""
+        mock_run.return_value = MagicMock(returncode=0)
+        spec = "task_id: t\nfiles_to_modify:\n  - services/api/app.py\nfiles_to_create:\n  - libs/common/util.py\n"
+        
+        self.manager.create_worktree("test-123", "main", spec_text=spec)
+        
+        sparse_args = mock_run.call_args_list[1][0][0]
+        self.assertEqual(sparse_args[3:], ["sparse-checkout", "set", "--cone", "libs/common", "services/api"])
+    
+    @patch('subprocess.run')
+    def test_create_worktree_spec_without_scope(self, mock_run):
+        """Test a spec without paths checks out the whole tree."""
+        mock_run.return_value = MagicMock(returncode=0)
+        
+        self.manager.create_worktree("test-123", "main", spec_text="task_id: t\n")
+        
+        commands = [call[0][0] for call in mock_run.call_args_list]
+        self.assertFalse(any("sparse-checkout" in args for args in commands))
+        self.assertEqual(commands[-1][3:], ["reset", "-q", "--hard"])
+    
+    @patch('subprocess.run')
+    def test_widen_scope(self, mock_run):
+        """Test adding directories to a sparse worktree."""
+        mock_run.return_value = MagicMock(returncode=0)
+        
+        self.manager.widen_scope(Path(".test_worktrees/test-123"), ["docs/architecture.md"])
+        
+        args = mock_run.call_args[0][0]
+        self.assertEqual(args[3:], ["sparse-checkout", "add", "docs"])
+    
+    def test_scope_directories(self):
+        """Test conversion of paths to cone directories."""
+        dirs = scope_directories([
+            "README.md",
+            "src/app/main.py",
+            "src/app/util/helpers.py",
+            "src/",
+            "web\\ui\\index.ts",
+        ])
+        
+        self.assertEqual(dirs, ["src", "web/ui"])
+    
+    def test_path_scope_from_spec(self):
+        """Test reading scope from a spec."""
+        spec = """name: demo
+files_to_modify:
+  - services/api/app.py
+files_to_create:
+  - services/api/new.py
+
+notes: |
+  - not a path
+"""
+        self.assertEqual(
+            path_scope_from_spec(spec),
+            ["services/api/app.py", "services/api/new.py"]
+        )
+        
+        scoped = spec + "scope:\n  - services/\n"
+        self.assertEqual(path_scope_from_spec(scoped), ["services/"])
+
+
+
+def git(repo, *args):
+    """Run git in repo and return stdout."""
+    return subprocess.run(
+        ["git"] + list(args),
+        cwd=repo, check=True, capture_output=True, text=True
+    ).stdout.strip()
+
+
+class TestCheckpoints(unittest.TestCase):
+    """Test checkpoint modes against a real repository."""
+    
+    def setUp(self):
+        """Create repository and a task worktree."""
+        self.old_cwd = os.getcwd()
+        self.test_dir = Path(tempfile.mkdtemp())
+        self.repo = self.test_dir / "repo"
+        self.repo.mkdir()
+        git(self.repo, "init", "-q", "-b", "main")
+        git(self.repo, "config", "user.name", "test")
+        git(self.repo, "config", "user.email", "test@example.com")
+        (self.repo / "app.py").write_text("v1\n")
+        (self.repo / "old.py").write_text("old\n")
+        git(self.repo, "add", "-A")
+        git(self.repo, "commit", "-q", "-m", "init")
+        
+        os.chdir(self.repo)
+        self.manager = WorktreeManager(base_dir=str(self.test_dir / "worktrees"))
+        self.worktree = self.manager.create_worktree("t1", "main")
+    
+    def tearDown(self):
+        """Clean up test fixtures."""
+        os.chdir(self.old_cwd)
+        shutil.rmtree(self.test_dir)
+    
+    def test_paths_checkpoint(self):
+        """Test staging only reported paths and skipping no-op commits."""
+        (self.worktree / "app.py").write_text("v2\n")
+        (self.worktree / "new.py").write_text("new\n")
+        (self.worktree / "unreported.py").write_text("x\n")
+        (self.worktree / "old.py").unlink()
+        
+        committed = self.manager.commit_checkpoint(
+            self.worktree, "cp 1", paths=["app.py", "new.py", "old.py"]
+        )
+        
+        self.assertTrue(committed)
+        files = git(self.worktree, "ls-tree", "--name-only", "HEAD").split()
+        self.assertEqual(files, ["app.py", "new.py"])
+        
+        self.assertFalse(self.manager.commit_checkpoint(self.worktree, "cp 2", paths=["app.py"]))
+        # Unreported change to a tracked file: nothing staged, not an error
+        (self.worktree / "new.py").write_text("changed\n")
+        self.assertFalse(self.manager.commit_checkpoint(self.worktree, "cp 2b", paths=["app.py"]))
+        self.assertFalse(self.manager.commit_checkpoint(self.worktree, "cp 3", paths=[]))
+        self.assertEqual(git(self.worktree, "rev-list", "--count", "HEAD"), "2")
+    
+    def test_private_checkpoints_and_squash(self):
+        """Test commit-tree checkpoints leave the index alone and squash cleanly."""
+        (self.worktree / "app.py").write_text("v2\n")
+        self.assertTrue(self.manager.commit_checkpoint(
+            self.worktree, "cp 1", paths=["app.py"], use_index=False
+        ))
+        (self.worktree / "new.py").write_text("new\n")
+        self.assertTrue(self.manager.commit_checkpoint(
+            self.worktree, "cp 2", paths=["new.py"], use_index=False
+        ))
+        self.assertFalse(self.manager.commit_checkpoint(
+            self.worktree, "cp 3", paths=["new.py"], use_index=False
+        ))
+        
+        # Branch and index untouched, checkpoints on the private ref
+        self.assertEqual(git(self.worktree, "rev-list", "--count", "HEAD"), "1")
+        self.assertEqual(git(self.worktree, "diff", "--cached", "--name-only"), "")
+        self.assertEqual(git(self.repo, "rev-list", "--count", "refs/checkpoints/t1"), "3")
+        
+        self.manager.squash_checkpoints("t1", "main", "Task t1")
+        
+        self.assertEqual(git(self.repo, "rev-list", "--count", "task/t1"), "2")
+        self.assertEqual(git(self.repo, "show", "task/t1:new.py"), "new")
+        self.assertEqual(git(self.worktree, "status", "--porcelain"), "")
+        with self.assertRaises(subprocess.CalledProcessError):
+            git(self.repo, "rev-parse", "--verify", "refs/checkpoints/t1")
+    
+    def test_merge_many_private_checkpoints(self):
+        """Test batch merge includes work that only exists in private checkpoints."""
+        (self.worktree / "new.py").write_text("new\n")
+        self.manager.commit_checkpoint(self.worktree, "cp 1", paths=["new.py"], use_index=False)
+        
+        result = self.manager.merge_back_many(["t1"], "main")
+        
+        self.assertEqual(result["merged"], ["task/t1"])
+        self.assertEqual(git(self.repo, "show", "main:new.py"), "new")
+        self.assertEqual((self.repo / "new.py").read_text(), "new\n")
+    
+    def test_squash_regular_checkpoints(self):
+        """Test squashing several index-based checkpoints."""
+        for i in range(3):
+            (self.worktree / "app.py").write_text(f"v{i + 2}\n")
+            self.manager.commit_checkpoint(self.worktree, f"cp {i}", paths=["app.py"])
+        
+        self.manager.squash_checkpoints("t1", "main")
+        
+        self.assertEqual(git(self.repo, "rev-list", "--count", "main..task/t1"), "1")
+        self.assertEqual(git(self.repo, "show", "task/t1:app.py"), "v4")
+
+
+class TestSparsePool(unittest.TestCase):
+    """Test recycling sparse worktrees through the warm pool."""
+    
+    def setUp(self):
+        """Create repository with two directories and a top-level file."""
+        self.old_cwd = os.getcwd()
+        self.test_dir = Path(tempfile.mkdtemp())
+        self.repo = self.test_dir / "repo"
+        for name in ("a", "b"):
+            (self.repo / name).mkdir(parents=True)
+            (self.repo / name / "mod.py").write_text(f"{name}\n")
+        git(self.repo, "init", "-q", "-b", "main")
+        git(self.repo, "config", "user.name", "test")
+        git(self.repo, "config", "user.email", "test@example.com")
+        (self.repo / "top").write_text("top\n")
+        git(self.repo, "add", "-A")
+        git(self.repo, "commit", "-q", "-m", "init")
+        os.chdir(self.repo)
+        
+        self.manager = WorktreeManager(base_dir=str(self.test_dir / "worktrees"))
+        self.manager.enable_pool(size=1, background=False)
+    
+    def tearDown(self):
+        """Clean up test fixtures."""
+        os.chdir(self.old_cwd)
+        shutil.rmtree(self.test_dir)
+    
+    def test_full_task_after_sparse_task(self):
+        """Test a recycled sparse worktree is whole again for the next task."""
+        sparse = self.manager.create_worktree("t1", "main", paths=["a/mod.py"])
+        self.assertEqual(sorted(p.name for p in sparse.iterdir() if p.name != ".git"), ["a", "top"])
+        
+        self.manager.cleanup("t1")
+        self.assertEqual(len(self.manager.pool.free_slots()), 1)
+        
+        full = self.manager.create_worktree("t2", "main")
+        self.assertEqual(git(full, "rev-parse", "--abbrev-ref", "HEAD"), "task/t2")
+        self.assertEqual(sorted(p.name for p in full.iterdir() if p.name != ".git"), ["a", "b", "top"])
+        self.assertEqual(git(full, "status", "--porcelain"), "")
+
+
+class TestCloneStrategy(unittest.TestCase):
+    """Test creating worktrees from the pristine base checkout."""
+    
+    def setUp(self):
+        """Create repository with a nested file and a symlink."""
+        self.old_cwd = os.getcwd()
+        self.test_dir = Path(tempfile.mkdtemp())
+        self.repo = self.test_dir / "repo"
+        (self.repo / "pkg").mkdir(parents=True)
+        git(self.repo, "init", "-q", "-b", "main")
+        git(self.repo, "config", "user.name", "test")
+        git(self.repo, "config", "user.email", "test@example.com")
+        (self.repo / "app.py").write_text("v1\n")
+        (self.repo / "pkg" / "mod.py").write_text("mod\n")
+        os.symlink("app.py", self.repo / "link.py")
+        git(self.repo, "add", "-A")
+        git(self.repo, "commit", "-q", "-m", "init")
+        os.chdir(self.repo)
+    
+    def tearDown(self):
+        """Clean up test fixtures."""
+        os.chdir(self.old_cwd)
+        shutil.rmtree(self.test_dir)
+    
+    def test_copy_strategy(self):
+        """Test cloned worktrees are clean, independent and track changes."""
+        manager = WorktreeManager(base_dir=str(self.test_dir / "worktrees"), strategy="copy")
+        first = manager.create_worktree("t1", "main")
+        second = manager.create_worktree("t2", "main")
+        
+        self.assertEqual(git(first, "status", "--porcelain"), "")
+        self.assertEqual(git(first, "rev-parse", "--abbrev-ref", "HEAD"), "task/t1")
+        self.assertEqual(os.readlink(first / "link.py"), "app.py")
+        self.assertEqual((second / "pkg" / "mod.py").read_text(), "mod\n")
+        
+        (first / "app.py").write_text("v2\n")
+        self.assertEqual(git(first, "status", "--porcelain"), "M app.py")
+        self.assertEqual((second / "app.py").read_text(), "v1\n")
+        self.assertTrue(manager.commit_checkpoint(first, "cp 1"))
+        
+        # Pristine checkout follows the base branch
+        (self.repo / "app.py").write_text("v3\n")
+        git(self.repo, "commit", "-q", "-am", "v3")
+        third = manager.create_worktree("t3", "main")
+        self.assertEqual((third / "app.py").read_text(), "v3\n")
+        self.assertEqual(git(third, "status", "--porcelain"), "")
+        
+        # Stat tuning is per command, not written to any config
+        config = subprocess.run(
+            ["git", "config", "--get", "extensions.worktreeConfig"], cwd=self.repo, capture_output=True, text=True
+        )
+        self.assertEqual(config.stdout, "")
+        self.assertEqual(manager._stat_args(first), ["-c", "core.checkStat=minimal"])
+    
+    @patch("core.worktree_manager.reflink_supported", return_value=False)
+    def test_reflink_falls_back_to_checkout(self, mock_probe):
+        """Test reflink strategy uses git checkout without filesystem support."""
+        manager = WorktreeManager(base_dir=str(self.test_dir / "worktrees"), strategy="reflink")
+        worktree = manager.create_worktree("t1", "main")
+        
+        self.assertEqual(git(worktree, "status", "--porcelain"), "")
+        self.assertFalse((self.test_dir / "worktrees" / ".pristine").exists())
+        mock_probe.assert_called_once()
+    
+    def test_unknown_strategy(self):
+        """Test unknown strategies are rejected."""
+        with self.assertRaises(ValueError):
+            WorktreeManager(base_dir=str(self.test_dir / "worktrees"), strategy="hardlink")
+    
+    def test_defer_gc(self):
+        """Test deferred gc disables auto gc for manager commits."""
+        manager = WorktreeManager(base_dir=str(self.test_dir / "worktrees"), defer_gc=True)
+        self.assertEqual(manager.git_env["GIT_CONFIG_KEY_0"], "gc.auto")
+        self.assertIs(manager.executor.env, manager.git_env)
+        
+        worktree = manager.create_worktree("t1", "main")
+        (worktree / "app.py").write_text("v2\n")
+        self.assertTrue(manager.commit_checkpoint(worktree, "cp 1"))
+        manager.run_maintenance()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,133 @@
+"""Tests for warm worktree pool."""
+
+import shutil
+import subprocess
+import tempfile
+import unittest
+from pathlib import Path
+from core.worktree_pool import WorktreePool
+
+
+def git(repo, *args):
+    """Run git in repo and return stdout."""
+    return subprocess.run(
+        ["git", "-c", "user.name=test", "-c", "user.email=test@example.com"] + list(args),
+        cwd=repo, check=True, capture_output=True, text=True
+    ).stdout.strip()
+
+
+class TestWorktreePool(unittest.TestCase):
+    """Test WorktreePool class against a real repository."""
+    
+    def setUp(self):
+        """Create repository with one commit on main."""
+        self.test_dir = Path(tempfile.mkdtemp())
+        self.repo = self.test_dir / "repo"
+        self.repo.mkdir()
+        git(self.repo, "init", "-q", "-b", "main")
+        (self.repo / "app.py").write_text("v1\n")
+        git(self.repo, "add", "-A")
+        git(self.repo, "commit", "-q", "-m", "init")
+        
+        self.pool = WorktreePool(
+            str(self.test_dir / "worktrees" / ".pool"),
+            size=2,
+            repo_dir=str(self.repo)
+        )
+    
+    def tearDown(self):
+        """Clean up test fixtures."""
+        self.pool.stop()
+        shutil.rmtree(self.test_dir)
+    
+    def test_refill(self):
+        """Test pool fills up to size."""
+        self.assertEqual(self.pool.refill(), 2)
+        self.assertEqual(len(self.pool.free_slots()), 2)
+        self.assertEqual(self.pool.refill(), 0)
+    
+    def test_refill_failure_logged(self):
+        """Test a failed checkout is logged with its slot."""
+        self.pool.base_branch = "no-such-branch"
+        
+        with self.assertLogs("core.worktree_pool", "WARNING") as logs:
+            with self.assertRaises(subprocess.CalledProcessError):
+                self.pool.refill()
+        
+        self.assertIn("Pool slot slot-", logs.output[0])
+        self.assertEqual(self.pool._creating, 0)
+        self.assertEqual(self.pool.free_slots(), [])
+    
+    def test_claim_renames_branch_and_resets(self):
+        """Test claimed worktree is on task branch at latest base."""
+        self.pool.refill()
+        
+        # Base moves after the pool was filled
+        (self.repo / "app.py").write_text("v2\n")
+        git(self.repo, "commit", "-q", "-am", "update")
+        
+        dest = self.test_dir / "worktrees" / "task-1"
+        path = self.pool.claim("task-1", dest)
+        
+        self.assertEqual(path, dest)
+        self.assertEqual((dest / "app.py").read_text(), "v2\n")
+        self.assertEqual(git(dest, "rev-parse", "--abbrev-ref", "HEAD"), "task/task-1")
+        self.assertEqual(len(self.pool.free_slots()), 1)
+    
+    def test_claim_empty_pool(self):
+        """Test claim returns None when no worktree is ready."""
+        self.assertIsNone(self.pool.claim("task-1", self.test_dir / "worktrees" / "task-1"))
+    
+    def test_claim_existing_branch_falls_back(self):
+        """Test a slot that can't take the task branch stays free."""
+        self.pool.refill()
+        git(self.repo, "branch", "task/task-1")
+        
+        self.assertIsNone(self.pool.claim("task-1", self.test_dir / "worktrees" / "task-1"))
+        self.assertEqual(len(self.pool.free_slots()), 2)
+    
+    def test_release_cleans_and_keeps_task_branch(self):
+        """Test released worktree returns clean to the pool."""
+        self.pool.size = 1
+        self.pool.refill()
+        dest = self.test_dir / "worktrees" / "task-1"
+        self.pool.claim("task-1", dest)
+        
+        (dest / "scratch.txt").write_text("tmp")
+        (dest / "app.py").write_text("dirty\n")
+        
+        self.assertTrue(self.pool.release(dest))
+        self.assertFalse(dest.exists())
+        
+        slots = self.pool.free_slots()
+        self.assertEqual(len(slots), 1)
+        self.assertFalse((slots[0] / "scratch.txt").exists())
+        self.assertEqual((slots[0] / "app.py").read_text(), "v1\n")
+        self.assertIn("task/task-1", git(self.repo, "branch", "--list", "task/*"))
+    
+    def test_release_when_full(self):
+        """Test release refuses when the pool is already full."""
+        self.pool.size = 1
+        self.pool.refill()
+        dest = self.test_dir / "worktrees" / "task-1"
+        self.pool.claim("task-1", dest)
+        self.pool.refill()
+        
+        self.assertFalse(self.pool.release(dest))
+        self.assertTrue(dest.exists())
+    
+    def test_background_refill(self):
+        """Test refill thread populates the pool."""
+        self.pool.refill_interval = 0.05
+        self.pool.start()
+        
+        for _ in range(100):
+            if len(self.pool.free_slots()) == 2:
+                break
+            self.pool._stop.wait(0.05)
+        
+        self.assertEqual(len(self.pool.free_slots()), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
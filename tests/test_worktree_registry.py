@@ -0,0 +1,126 @@
+"""Tests for worktree registry."""
+
+import shutil
+import subprocess
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+from core.state_store import StateStore
+from core.worktree_manager import parse_worktree_porcelain
+from core.worktree_registry import WorktreeRegistry
+
+
+def git(repo, *args):
+    """Run git in repo and return stdout."""
+    return subprocess.run(
+        ["git"] + list(args),
+        cwd=repo, check=True, capture_output=True, text=True
+    ).stdout.strip()
+
+
+class TestWorktreeRegistry(unittest.TestCase):
+    """Test WorktreeRegistry against a real repository."""
+    
+    def setUp(self):
+        """Create repository with two task worktrees."""
+        self.test_dir = Path(tempfile.mkdtemp())
+        self.repo = self.test_dir / "repo"
+        self.repo.mkdir()
+        git(self.repo, "init", "-q", "-b", "main")
+        git(self.repo, "config", "user.name", "test")
+        git(self.repo, "config", "user.email", "test@example.com")
+        (self.repo / "app.py").write_text("v1\n")
+        git(self.repo, "add", "-A")
+        git(self.repo, "commit", "-q", "-m", "init")
+        
+        self.worktrees = self.test_dir / "worktrees"
+        for task_id in ("t1", "t2"):
+            git(self.repo, "worktree", "add", "-q", "-b", f"task/{task_id}",
+                str(self.worktrees / task_id), "main")
+        
+        self.store = StateStore(str(self.test_dir / "tasks"))
+        self.store.save("t1", {"phase": "impl", "status": "in_progress"})
+        self.store.save("t2", {"phase": "done", "status": "completed"})
+        
+        self.registry = self._registry()
+    
+    def _registry(self):
+        """Create a fresh registry (as a new CLI process would)."""
+        return WorktreeRegistry(
+            repo_dir=str(self.repo),
+            state_store=self.store,
+            cache_file=str(self.test_dir / "registry.json")
+        )
+    
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.test_dir)
+    
+    def test_list_joins_task_state(self):
+        """Test entries carry git fields and task metadata."""
+        entries = {e["task_id"]: e for e in self.registry.list(with_disk_usage=True)}
+        
+        self.assertEqual(entries["t1"]["branch"], "refs/heads/task/t1")
+        self.assertEqual(entries["t1"]["phase"], "impl")
+        self.assertEqual(entries["t2"]["status"], "completed")
+        self.assertEqual(len(entries["t1"]["head"]), 40)
+        self.assertFalse(entries["t1"]["locked"])
+        self.assertIsNotNone(entries["t1"]["last_activity"])
+        self.assertGreater(entries["t1"]["disk_usage"], 0)
+    
+    def test_cache_avoids_git(self):
+        """Test unchanged metadata is served from the persisted cache."""
+        self.registry.list()
+        
+        with patch("subprocess.run") as mock_run:
+            entries = self._registry().list()
+            mock_run.assert_not_called()
+        
+        self.assertEqual(len(entries), 3)
+    
+    def test_cache_invalidation(self):
+        """Test cache refreshes on lock and new commits."""
+        self.registry.list()
+        
+        git(self.repo, "worktree", "lock", "--reason", "busy", str(self.worktrees / "t1"))
+        (self.worktrees / "t1" / "app.py").write_text("v2\n")
+        git(self.worktrees / "t1", "commit", "-q", "-am", "change")
+        
+        entries = {e["task_id"]: e for e in self._registry().list()}
+        self.assertEqual(entries["t1"]["locked"], "busy")
+        self.assertEqual(entries["t1"]["head"], git(self.repo, "rev-parse", "task/t1"))
+    
+    def test_prune(self):
+        """Test stale metadata and finished task worktrees are removed."""
+        shutil.rmtree(self.worktrees / "t1")
+        
+        dry = self._registry().prune(dry_run=True, finished=True)
+        self.assertEqual(dry["finished"], ["t2"])
+        self.assertEqual(len(dry["prunable"]), 1)
+        self.assertTrue((self.worktrees / "t2").exists())
+        
+        self._registry().prune(finished=True)
+        
+        self.assertFalse((self.worktrees / "t2").exists())
+        self.assertEqual(len(self._registry().list()), 1)
+    
+    def test_parse_porcelain(self):
+        """Test parsing of all porcelain fields."""
+        output = (
+            "worktree /repo\nHEAD abc\nbranch refs/heads/main\n\n"
+            "worktree /wt/a\nHEAD def\ndetached\nlocked\n\n"
+            "worktree /wt/b\nHEAD 123\nbranch refs/heads/task/b\nprunable gitdir file points to non-existent location\n"
+        )
+        
+        entries = parse_worktree_porcelain(output)
+        
+        self.assertEqual(len(entries), 3)
+        self.assertTrue(entries[1]["detached"])
+        self.assertTrue(entries[1]["locked"])
+        self.assertIsNone(entries[1]["branch"])
+        self.assertEqual(entries[2]["prunable"], "gitdir file points to non-existent location")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,38 +1,663 @@
-﻿import os
+﻿import difflib
+import itertools
+import mmap
+import os
+import re
+import threading
+import uuid
+import weakref
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+from core.workspace_index import WorkspaceIndex
+
 BASE_DIR = Path(__file__).parent.parent.resolve()
 WORKSPACE_ROOT = BASE_DIR / 'workspace'
 WORKSPACE_ROOT.mkdir(parents=True, exist_ok=True)
 
-def _clean_path(path: str) -> Path:
-    # РЈР±РёСЂР°РµРј С‚РёРїРёС‡РЅС‹Рµ Р°СЂС‚РµС„Р°РєС‚С‹ РїСѓС‚РµР№ AI-Р°РіРµРЅС‚РѕРІ
-    p = path.replace('\\', '/').replace('/tmp/workspace/', '').lstrip('/')
-    return (WORKSPACE_ROOT / p).resolve()
+# Maximum entries returned by one list_files call
+LIST_LIMIT = 200
 
-def write_file(filepath: str, content: str) -> str:
-    """Writes content to a file. filepath is relative to workspace root."""
-    try:
-        full_path = _clean_path(filepath)
-        full_path.parent.mkdir(parents=True, exist_ok=True)
-        full_path.write_text(content, encoding='utf-8')
-        return f'File {filepath} written successfully to workspace.'
-    except Exception as e:
-        return f'Error: {str(e)}'
-
-def read_file(filepath: str) -> str:
-    """Reads content from a file."""
-    try:
-        full_path = _clean_path(filepath)
-        return full_path.read_text(encoding='utf-8')
-    except Exception as e:
-        return f'Error: {str(e)}'
+# Files larger than this are summarized unless a range is requested,
+# and ranged reads are truncated to it
+READ_LIMIT = 256 * 1024
+
+# Lines shown from each end of a summarized file
+SUMMARY_LINES = 20
+
+# search_code skips files larger than this
+SEARCH_FILE_LIMIT = 2 * 1024 * 1024
+
+# Threads scanning files in search_code
+SEARCH_WORKERS = 8
 
-def list_files(directory: str = '.') -> str:
-    """Lists files recursively."""
+# Longest line echoed back by search_code
+SEARCH_LINE_WIDTH = 300
+
+# Total bytes of file content cached per workspace root
+CACHE_BYTES = 64 * 1024 * 1024
+
+def _atomic_write(full_path: Path, content: str):
+    """Writes a temp file next to full_path and renames it over, so readers never see partial files."""
+    full_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = full_path.with_name(f'.{full_path.name}.{uuid.uuid4().hex[:8]}.tmp')
     try:
-        target_dir = _clean_path(directory)
-        files = [str(p.relative_to(WORKSPACE_ROOT)) for p in target_dir.rglob('*') if p.is_file()]
-        return '\n'.join(files) if files else 'Directory is empty.'
-    except Exception as e:
-        return f'Error: {str(e)}'
+        # os.open applies the umask to new files; existing files keep their mode
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(content)
+        if full_path.exists():
+            os.chmod(tmp_path, full_path.stat().st_mode & 0o7777)
+        os.replace(tmp_path, full_path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+def _head_bytes(data, lines: int, start: int = 0) -> bytes:
+    """Returns the first `lines` lines of a bytes-like buffer from offset start, at most READ_LIMIT + 1 bytes."""
+    end = min(len(data), start + READ_LIMIT + 1)
+    pos = start
+    for _ in range(lines):
+        pos = data.find(b'\n', pos, end) + 1
+        if pos == 0:
+            return data[start:end]
+    return data[start:pos]
+
+def _tail_bytes(data, lines: int) -> bytes:
+    """Returns the last `lines` lines of a bytes-like buffer, at most READ_LIMIT + 1 bytes."""
+    begin = max(len(data) - READ_LIMIT - 1, 0)
+    pos = len(data)
+    if data[pos - 1:pos] == b'\n':
+        pos -= 1
+    for _ in range(lines):
+        pos = data.rfind(b'\n', begin, pos)
+        if pos == -1:
+            return data[begin:]
+    return data[pos + 1:]
+
+def _line_range(data, start: int, end: int = None) -> bytes:
+    """Returns 1-based inclusive lines start..end (end None = to EOF)."""
+    pos = 0
+    for _ in range(start - 1):
+        pos = data.find(b'\n', pos) + 1
+        if pos == 0:
+            return b''
+    if end is None:
+        return data[pos:pos + READ_LIMIT + 1]
+    return _head_bytes(data, max(end - start + 1, 0), pos)
+
+def _count_lines(data) -> int:
+    """Counts lines without copying the whole buffer at once."""
+    count = 0
+    for offset in range(0, len(data), 1 << 20):
+        count += data[offset:offset + (1 << 20)].count(b'\n')
+    if data and data[-1:] != b'\n':
+        count += 1
+    return count
+
+def _decode(data: bytes) -> str:
+    """Decodes file bytes, capped at READ_LIMIT."""
+    text = data[:READ_LIMIT].decode('utf-8', errors='replace')
+    if len(data) > READ_LIMIT:
+        text += f'\n... [truncated at {READ_LIMIT} bytes, request a smaller range]'
+    return text
+
+def _summary(filepath: str, data) -> str:
+    """Describes a file too large to return whole."""
+    head = _head_bytes(data, SUMMARY_LINES)[:READ_LIMIT // 2].decode('utf-8', errors='replace')
+    tail = _tail_bytes(data, SUMMARY_LINES)[-(READ_LIMIT // 2):].decode('utf-8', errors='replace')
+    return (f'{filepath} is too large to read whole ({len(data)} bytes, {_count_lines(data)} lines).\n'
+            f'Use start_line/end_line, head, tail or byte_offset/byte_count to read part of it.\n'
+            f'--- first {SUMMARY_LINES} lines ---\n{head.rstrip()}\n'
+            f'--- last {SUMMARY_LINES} lines ---\n{tail.rstrip()}')
+
+def _read_range(filepath: str, data, start_line, end_line, head, tail, byte_offset, byte_count) -> str:
+    """Returns the requested part of a file's bytes (see Workspace.read_file)."""
+    size = len(data)
+    if byte_offset is not None or byte_count is not None:
+        start = max(byte_offset or 0, 0)
+        stop = size if byte_count is None else start + byte_count
+        return _decode(data[start:min(stop, start + READ_LIMIT + 1)])
+    if head is not None:
+        return _decode(_head_bytes(data, head))
+    if tail is not None:
+        return _decode(_tail_bytes(data, tail))
+    if start_line is not None or end_line is not None:
+        return _decode(_line_range(data, max(start_line or 1, 1), end_line))
+    if size > READ_LIMIT:
+        return _summary(filepath, data)
+    return data[:].decode('utf-8')
+
+def _match_lines(rel_path: str, data: bytes, pattern, context: int) -> list:
+    """Returns output lines for matches in one file's bytes (grep -n style)."""
+    if b'\0' in data[:8192]:
+        return []
+    text = data.decode('utf-8', errors='replace')
+    if not pattern.search(text):
+        return []
+
+    lines = text.splitlines()
+    hits = [i for i, line in enumerate(lines) if pattern.search(line)]
+    hit_set = set(hits)
+    output, shown = [], -1
+    for i in hits:
+        start = max(i - context, shown + 1)
+        if output and start > shown + 1:
+            output.append((None, '--'))
+        for j in range(start, min(i + context, len(lines) - 1) + 1):
+            sep = ':' if j in hit_set else '-'
+            output.append((j == i, f'{rel_path}{sep}{j + 1}{sep} {lines[j][:SEARCH_LINE_WIDTH]}'))
+        shown = max(shown, min(i + context, len(lines) - 1))
+    return output
+
+def _indent(line: str) -> str:
+    """Returns leading whitespace of a line."""
+    return line[:len(line) - len(line.lstrip())]
+
+def _closest_match(lines: list, old_lines: list) -> str:
+    """Describes the region of the file most similar to old_lines."""
+    n = max(len(old_lines), 1)
+    stripped = [l.strip() for l in lines]
+    first = next((l.strip() for l in old_lines if l.strip()), None)
+    # old_lines is the cached second sequence; only the window changes
+    matcher = difflib.SequenceMatcher(None, '', '\n'.join(l.strip() for l in old_lines))
+    starts = range(max(len(lines) - n + 1, 1))
+    # Windows starting with the same first line go first, so the bound prunes the rest early
+    anchored = [i for i in starts if i < len(stripped) and stripped[i] == first]
+    tried = set(anchored)
+    rest = (i for i in starts if i not in tried)
+    best, best_ratio = None, 0.5
+    for i in itertools.chain(anchored, rest):
+        matcher.set_seq1('\n'.join(stripped[i:i + n]))
+        # Cheap upper bounds first; ratio() only where the window could win
+        if matcher.real_quick_ratio() < best_ratio or matcher.quick_ratio() < best_ratio:
+            continue
+        ratio = matcher.ratio()
+        if ratio > best_ratio or (best is None and ratio == best_ratio):
+            best, best_ratio = i, ratio
+    if best is None:
+        return ''
+    snippet = ''.join(f'{best + k + 1}: {line}' for k, line in enumerate(lines[best:best + n]))
+    return f' Closest match ({best_ratio:.0%} similar) at lines {best + 1}-{best + n}:\n{snippet.rstrip()}'
+
+def _replace(content: str, old_text: str, new_text: str, replace_all: bool = False) -> str:
+    """Applies one search/replace to content.
+
+    Tries an exact match first, then a line-wise match ignoring trailing and then
+    leading whitespace; a whitespace-insensitive match re-indents new_text to the
+    indentation found in the file. Raises ValueError with a usable message.
+    """
+    if not old_text:
+        raise ValueError('old_text is empty; use write_file to create or overwrite a file')
+
+    count = content.count(old_text)
+    if count == 1 or (count > 1 and replace_all):
+        return content.replace(old_text, new_text)
+    if count > 1:
+        raise ValueError(f'old_text matches {count} places; add surrounding lines to make it unique '
+                         f'or set replace_all')
+
+    lines = content.splitlines(keepends=True)
+    old_lines = old_text.strip('\n').splitlines()
+    n = len(old_lines)
+    for normalize in (str.rstrip, str.strip):
+        normalized = [normalize(l) for l in lines]
+        target = [normalize(l) for l in old_lines]
+        hits = [i for i in range(len(lines) - n + 1) if normalized[i:i + n] == target]
+        if not hits:
+            continue
+        if len(hits) > 1 and not replace_all:
+            raise ValueError(f'old_text matches {len(hits)} places (ignoring whitespace); '
+                             f'add surrounding lines to make it unique or set replace_all')
+
+        for i in reversed(hits):
+            # Shift new_text by however the file's indentation differs from old_text's
+            k = next((k for k, l in enumerate(old_lines) if l.strip()), 0)
+            old_indent, file_indent = _indent(old_lines[k]), _indent(lines[i + k])
+            block = []
+            for line in new_text.strip('\n').splitlines():
+                if line.startswith(old_indent) and line.strip():
+                    line = file_indent + line[len(old_indent):]
+                block.append(line + '\n')
+            if block and not lines[i + n - 1].endswith('\n'):
+                block[-1] = block[-1][:-1]
+            lines[i:i + n] = block
+        return ''.join(lines)
+
+    raise ValueError('old_text not found.' + _closest_match(lines, old_lines))
+
+class _ContentCache:
+    """LRU of file contents keyed by path and validated by (mtime_ns, size)."""
+
+    def __init__(self, max_bytes: int = CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.total = 0
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def get(self, rel_path: str, key: tuple):
+        """Returns cached bytes if the file still has this (mtime_ns, size), else None."""
+        with self.lock:
+            entry = self.entries.get(rel_path)
+            if entry is None or entry[0] != key:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(rel_path)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, rel_path: str, key: tuple, data: bytes):
+        """Caches data, evicting least recently used files over max_bytes."""
+        with self.lock:
+            self._drop(rel_path)
+            self.entries[rel_path] = (key, data)
+            self.total += len(data)
+            while self.total > self.max_bytes and self.entries:
+                self._drop(next(iter(self.entries)))
+
+    def invalidate(self, rel_path: str):
+        """Forgets a file (called on every write through the tools)."""
+        with self.lock:
+            self._drop(rel_path)
+
+    def _drop(self, rel_path: str):
+        entry = self.entries.pop(rel_path, None)
+        if entry is not None:
+            self.total -= len(entry[1])
+
+class _SharedState:
+    """State shared by every Workspace on one root: file index, content cache, written paths."""
+
+    def __init__(self, root: Path, index_file: str = None):
+        self.root = root
+        self.index_file = index_file
+        self.cache = _ContentCache()
+        # Paths written since the last checkpoint (see consume_written_paths)
+        self.written_paths = set()
+        self._index = None
+
+    @property
+    def index(self) -> WorkspaceIndex:
+        """Returns the workspace index, created on first use."""
+        if self._index is None:
+            self._index = WorkspaceIndex(str(self.root), cache_file=self.index_file)
+        return self._index
+
+class Workspace:
+    """File tools bound to one workspace root, typically a task worktree.
+
+    Every path is resolved (following symlinks) and must stay under root. Instances
+    hold no open resources and share the file index, content cache and written paths
+    of their root, so creating one per agent is cheap; tools() returns the bound
+    methods to hand to agents.
+    """
+
+    __slots__ = ('root', 'remember_reads', '_shared', '_overlay', '_seen')
+
+    # One shared state per (root, index_file), alive while any instance uses it
+    _states = weakref.WeakValueDictionary()
+    _states_lock = threading.Lock()
+
+    def __init__(self, root, index_file=None, remember_reads: bool = False):
+        """Binds the tools to root, e.g. the path returned by WorktreeManager.create_worktree().
+
+        index_file is where the file index is persisted (default: kept in memory). With
+        remember_reads, a whole-file read of a file this instance already returned and
+        that has not changed since answers "unchanged since your last read" instead of
+        the content; use one instance per agent for that.
+        """
+        self.root = Path(root).resolve()
+        self.remember_reads = remember_reads
+        key = (str(self.root), str(index_file) if index_file else None)
+        with self._states_lock:
+            shared = self._states.get(key)
+            if shared is None:
+                shared = self._states[key] = _SharedState(self.root, key[1])
+        self._shared = shared
+        # Buffered writes {relative path: content} while an overlay is active (see begin_overlay)
+        self._overlay = None
+        # {relative path: (mtime_ns, size)} of files this instance returned whole
+        self._seen = {}
+
+    def tools(self) -> list:
+        """Returns the agent-facing tools bound to this workspace."""
+        return [self.write_file, self.write_files, self.read_file, self.list_files,
+                self.apply_edit, self.multi_edit, self.search_code]
+
+    @property
+    def index(self) -> WorkspaceIndex:
+        """Returns the file index shared by all instances on this root."""
+        return self._shared.index
+
+    @property
+    def cache(self) -> _ContentCache:
+        """Returns the content cache shared by all instances on this root."""
+        return self._shared.cache
+
+    def forget_reads(self, paths: list = None):
+        """Makes the next read of paths (default: every file) return full content again.
+
+        Call it when earlier read output is no longer in the agent's context, e.g. with
+        the paths ContextCompactor reports as elided.
+        """
+        if paths is None:
+            self._seen.clear()
+            return
+        for filepath in paths:
+            try:
+                self._seen.pop(self._relative(filepath), None)
+            except Exception:
+                continue
+
+    def _clean_path(self, path: str) -> Path:
+        # РЈР±РёСЂР°РµРј С‚РёРїРёС‡РЅС‹Рµ Р°СЂС‚РµС„Р°РєС‚С‹ РїСѓС‚РµР№ AI-Р°РіРµРЅС‚РѕРІ
+        p = path.replace('\\', '/').replace('/tmp/workspace/', '').lstrip('/')
+        return (self.root / p).resolve()
+
+    def _relative(self, filepath: str) -> str:
+        """Returns the workspace-relative path, refusing paths outside the workspace."""
+        return self._clean_path(filepath).relative_to(self.root).as_posix()
+
+    def _store(self, rel_path: str, content: str):
+        """Writes a file, or buffers it while an overlay is active."""
+        if self._overlay is not None:
+            self._overlay[rel_path] = content
+            return
+        _atomic_write(self.root / rel_path, content)
+        self._shared.cache.invalidate(rel_path)
+        self._shared.written_paths.add(rel_path)
+
+    def _read_bytes(self, rel_path: str) -> bytes:
+        """Reads a whole file through the content cache."""
+        with open(self.root / rel_path, 'rb') as f:
+            st = os.fstat(f.fileno())
+            key = (st.st_mtime_ns, st.st_size)
+            data = self._shared.cache.get(rel_path, key)
+            if data is None:
+                data = f.read()
+                # Big files would only evict the sources agents keep re-reading
+                if st.st_size <= READ_LIMIT:
+                    self._shared.cache.put(rel_path, key, data)
+            return data
+
+    def _load(self, rel_path: str) -> str:
+        """Reads a file as the agent sees it (buffered content first)."""
+        if self._overlay is not None and rel_path in self._overlay:
+            return self._overlay[rel_path]
+        return self._read_bytes(rel_path).decode('utf-8')
+
+    def write_file(self, filepath: str, content: str) -> str:
+        """Writes content to a file. filepath is relative to workspace root."""
+        try:
+            self._store(self._relative(filepath), content)
+            return f'File {filepath} written successfully to workspace.'
+        except Exception as e:
+            return f'Error: {str(e)}'
+
+    def write_files(self, files: dict) -> str:
+        """Writes several files in one call: files maps relative path to content.
+
+        All paths are checked before anything is written.
+        """
+        try:
+            resolved = {self._relative(filepath): content for filepath, content in files.items()}
+        except Exception as e:
+            return f'Error: {str(e)} No files were written.'
+        written = []
+        try:
+            for rel_path, content in resolved.items():
+                self._store(rel_path, content)
+                written.append(rel_path)
+        except Exception as e:
+            return f'Error: {str(e)} Written before the error: {", ".join(written) or "none"}.'
+        return f'Wrote {len(written)} files to workspace.'
+
+    def begin_overlay(self):
+        """Buffers writes in memory until flush_overlay(), e.g. for one agent turn.
+
+        Tools read their own buffered writes, while the worktree only ever sees the
+        state at the last flush.
+        """
+        if self._overlay is None:
+            self._overlay = {}
+
+    def flush_overlay(self) -> list:
+        """Writes buffered files atomically and ends the overlay.
+
+        Each file leaves the overlay only once it is written. If a write fails, the
+        overlay stays active with that file and the ones not yet written, so a later
+        flush_overlay() or discard_overlay() can deal with them.
+
+        Returns:
+            Relative paths whose content changed, for WorktreeManager.commit_checkpoint(paths=...)
+
+        Raises:
+            OSError: A write failed; the message lists the unwritten paths
+        """
+        buffered = self._overlay or {}
+        changed = []
+        for rel_path in sorted(buffered):
+            content = buffered[rel_path]
+            full_path = self.root / rel_path
+            try:
+                unchanged = full_path.read_text(encoding='utf-8') == content
+            except (OSError, UnicodeDecodeError):
+                unchanged = False
+            if not unchanged:
+                try:
+                    _atomic_write(full_path, content)
+                except OSError as e:
+                    unwritten = ', '.join(sorted(buffered))
+                    raise OSError(f'flush_overlay failed at {rel_path}: {e}; unwritten: {unwritten}') from e
+                self._shared.cache.invalidate(rel_path)
+                self._shared.written_paths.add(rel_path)
+                changed.append(rel_path)
+            del buffered[rel_path]
+        self._overlay = None
+        return changed
+
+    def discard_overlay(self):
+        """Drops buffered writes and ends the overlay."""
+        self._overlay = None
+
+    def read_file(self, filepath: str, start_line: int = None, end_line: int = None,
+                  head: int = None, tail: int = None,
+                  byte_offset: int = None, byte_count: int = None) -> str:
+        """Reads content from a file, or part of it.
+
+        start_line/end_line are 1-based and inclusive, head/tail return the first/last N
+        lines, byte_offset/byte_count read a byte range. Without a range, files over
+        256 KB return a summary (size, line count, first and last lines) instead.
+        """
+        try:
+            rel_path = self._relative(filepath)
+            ranges = (start_line, end_line, head, tail, byte_offset, byte_count)
+            whole = all(r is None for r in ranges)
+            if self._overlay is not None and rel_path in self._overlay:
+                return _read_range(filepath, self._overlay[rel_path].encode('utf-8'), *ranges)
+            with open(self.root / rel_path, 'rb') as f:
+                st = os.fstat(f.fileno())
+                key = (st.st_mtime_ns, st.st_size)
+                if whole and self.remember_reads and self._seen.get(rel_path) == key:
+                    return f'{filepath} is unchanged since your last read.'
+                if st.st_size <= READ_LIMIT:
+                    data = self._shared.cache.get(rel_path, key)
+                    if data is None:
+                        data = f.read()
+                        self._shared.cache.put(rel_path, key, data)
+                    result = _read_range(filepath, data, *ranges)
+                else:
+                    # Memory-mapped so ranges deep in huge files don't load them whole
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                        result = _read_range(filepath, data, *ranges)
+            if whole and self.remember_reads:
+                self._seen[rel_path] = key
+            return result
+        except Exception as e:
+            return f'Error: {str(e)}'
+
+    def list_files(self, directory: str = '.', max_depth: int = None, pattern: str = None,
+                   offset: int = 0, limit: int = LIST_LIMIT) -> str:
+        """Lists files recursively, skipping .gitignore'd and dependency/build directories.
+
+        max_depth limits recursion (1 = only files directly in directory), pattern is a
+        glob such as '*.py' or 'src/*.ts', and offset/limit page through long listings.
+        """
+        try:
+            rel_dir = self._relative(directory)
+            self.index.refresh()
+            files = self.index.paths(rel_dir, max_depth=max_depth, pattern=pattern,
+                                     extra=self._overlay or ())
+            if not files:
+                return 'Directory is empty.' if not pattern else f'No files match {pattern}.'
+            limit = max(1, min(limit, LIST_LIMIT))
+            page = files[offset:offset + limit]
+            result = '\n'.join(page)
+            if offset + limit < len(files):
+                result += (f'\n... {len(files) - offset - limit} more files '
+                           f'(call again with offset={offset + limit})')
+            return result
+        except Exception as e:
+            return f'Error: {str(e)}'
+
+    def _search_file(self, rel_path: str, pattern, context: int) -> list:
+        """Returns output lines for matches in one file (grep -n style)."""
+        try:
+            if self._overlay is not None and rel_path in self._overlay:
+                data = self._overlay[rel_path].encode('utf-8')
+            else:
+                data = self._read_bytes(rel_path)
+        except OSError:
+            return []
+        return _match_lines(rel_path, data, pattern, context)
+
+    def search_code(self, query: str, regex: bool = False, glob: str = None, directory: str = '.',
+                    context: int = 0, ignore_case: bool = False, max_results: int = 100) -> str:
+        """Searches file contents in the workspace, like grep -rn.
+
+        query is a literal string unless regex is set. glob filters files (e.g. '*.py'),
+        context adds lines around each match, max_results caps the number of matches.
+        Ignored files (.gitignore, dependencies, build output) are not searched.
+        """
+        try:
+            flags = re.IGNORECASE if ignore_case else 0
+            pattern = re.compile(query if regex else re.escape(query), flags)
+            rel_dir = self._relative(directory)
+            index = self.index
+            index.refresh()
+            candidates = [p for p in index.paths(rel_dir, pattern=glob, extra=self._overlay or ())
+                          if p not in index.files or index.files[p]['size'] <= SEARCH_FILE_LIMIT]
+
+            results, matches, capped = [], 0, False
+            with ThreadPoolExecutor(max_workers=SEARCH_WORKERS) as pool:
+                # Only a few files are scanned ahead of the one being reported, so
+                # reaching max_results stops the search instead of finishing every file
+                paths = iter(candidates)
+                pending = deque(pool.submit(self._search_file, p, pattern, context)
+                                for p in itertools.islice(paths, SEARCH_WORKERS * 2))
+                while pending:
+                    output = pending.popleft().result()
+                    if output and results and context:
+                        results.append('--')
+                    for is_match, line in output or ():
+                        if is_match:
+                            if matches == max_results:
+                                capped = True
+                                break
+                            matches += 1
+                        results.append(line)
+                    if capped:
+                        results.append(f'... stopped at {max_results} matches; narrow the search with glob or directory')
+                        for future in pending:
+                            future.cancel()
+                        break
+                    # Refill only after the cap check, so a capped search submits nothing more
+                    p = next(paths, None)
+                    if p is not None:
+                        pending.append(pool.submit(self._search_file, p, pattern, context))
+
+            return '\n'.join(results) if results else f'No matches for {query}.'
+        except re.error as e:
+            return f'Error: invalid regex: {str(e)}'
+        except Exception as e:
+            return f'Error: {str(e)}'
+
+    def _apply_edits(self, edits: list) -> str:
+        """Applies edits all-or-nothing: nothing is written unless every edit applies."""
+        contents = {}
+        for number, edit in enumerate(edits, 1):
+            filepath = edit.get('filepath')
+            try:
+                rel_path = self._relative(filepath)
+                if rel_path not in contents:
+                    contents[rel_path] = self._load(rel_path)
+                contents[rel_path] = _replace(contents[rel_path], edit.get('old_text', ''),
+                                              edit.get('new_text', ''), edit.get('replace_all', False))
+            except Exception as e:
+                prefix = f'edit {number} ({filepath})' if len(edits) > 1 else filepath
+                return f'Error: {prefix}: {str(e)} No files were changed.'
+
+        for rel_path, content in contents.items():
+            self._store(rel_path, content)
+        return None
+
+    def apply_edit(self, filepath: str, old_text: str, new_text: str, replace_all: bool = False) -> str:
+        """Replaces old_text with new_text in a file instead of rewriting the whole file.
+
+        old_text must identify one place in the file (include a few surrounding lines);
+        set replace_all to change every occurrence. Whitespace differences are tolerated.
+        """
+        error = self._apply_edits([{'filepath': filepath, 'old_text': old_text,
+                                    'new_text': new_text, 'replace_all': replace_all}])
+        return error or f'File {filepath} edited successfully.'
+
+    def multi_edit(self, edits: list) -> str:
+        """Applies several edits, possibly across files, in one call.
+
+        edits is a list of {"filepath", "old_text", "new_text", "replace_all"(optional)}
+        applied in order; if any edit fails, no file is changed.
+        """
+        error = self._apply_edits(edits)
+        return error or f'Applied {len(edits)} edits to {len({e.get("filepath") for e in edits})} files.'
+
+    def consume_written_paths(self) -> list:
+        """Returns workspace-relative paths written since the last call and resets the list.
+
+        Covers writes through every Workspace instance on this root.
+
+        Feed these to WorktreeManager.commit_checkpoint(paths=...) to checkpoint
+        without scanning the whole worktree.
+        """
+        paths = sorted(self._shared.written_paths)
+        self._shared.written_paths.clear()
+        return paths
+
+# Shared workspace behind the module-level tools (single-task runs)
+default_workspace = Workspace(WORKSPACE_ROOT, index_file=BASE_DIR / '.multiagent' / 'workspace_index.json')
+
+def agent_workspace() -> Workspace:
+    """Returns a Workspace for one agent on the default root.
+
+    Shares default_workspace's index and cache but remembers its own reads, so
+    bind each agent's tools and forget_reads to its own instance.
+    """
+    return Workspace(WORKSPACE_ROOT, index_file=BASE_DIR / '.multiagent' / 'workspace_index.json',
+                     remember_reads=True)
+
+write_file = default_workspace.write_file
+write_files = default_workspace.write_files
+read_file = default_workspace.read_file
+list_files = default_workspace.list_files
+search_code = default_workspace.search_code
+apply_edit = default_workspace.apply_edit
+multi_edit = default_workspace.multi_edit
+begin_overlay = default_workspace.begin_overlay
+flush_overlay = default_workspace.flush_overlay
+discard_overlay = default_workspace.discard_overlay
+consume_written_paths = default_workspace.consume_written_paths